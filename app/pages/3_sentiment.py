@@ -8,7 +8,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from utils.load_data import load_processed_data, filter_data, get_brand_list
+from utils.load_data import load_processed_data, filter_data, get_brand_list, get_cluster_terms, load_price_model
 from utils.plots import plot_sentiment_distribution, plot_sentiment_vs_price
 
 # Charger le CSS
@@ -250,6 +250,11 @@ with tab1:
             'brand': 'Marque Dominante'
         })
         
+        # Mots-clés des clusters (modèle TF-IDF + KMeans sauvegardé)
+        cluster_terms = get_cluster_terms()
+        if cluster_terms:
+            cluster_analysis['Mots-clés'] = cluster_analysis.index.map(cluster_terms)
+        
         st.dataframe(cluster_analysis, width='stretch')
         
         # Interprétation
@@ -339,6 +344,35 @@ with tab3:
                 st.info("⚠️ **Prédiction neutre:** Perception client moyenne attendue")
             else:
                 st.warning("❌ **Prédiction négative:** Risque de mauvaise perception")
+    
+    st.markdown("---")
+    st.subheader("💰 Prix prédit")
+    
+    # Modèle mis en cache par load_price_model (chargé une fois, pas à chaque rerun)
+    price_model = load_price_model()
+    if price_model is None:
+        st.info("Modèle de prix non entraîné (python src/analysis/model.py --price).")
+    else:
+        st.markdown(f"**Prix estimé à partir du titre, de la marque et de la source** "
+                    f"(erreur moyenne sur les produits de test : {price_model.mae:.0f} €)")
+        col1, col2 = st.columns(2)
+        with col1:
+            titre_input = st.text_input("Titre du produit:", value="Samsung Galaxy S23 Ultra 512GB")
+        with col2:
+            marque_prix_input = st.selectbox("Marque :", options=all_brands)
+            source_input = st.selectbox("Source:", options=sorted(df['source'].unique()))
+        
+        if st.button("💰 Estimer le prix", width='stretch'):
+            produit = pd.DataFrame({'titre': [titre_input], 'brand': [marque_prix_input], 'source': [source_input]})
+            st.success(f"**Prix prédit:** {price_model.predict(produit)[0]:.2f} €")
+        
+        # Écart prix réel / prix prédit sur les produits filtrés (une seule prédiction vectorisée)
+        if not filtered_df.empty:
+            ecarts = filtered_df[['titre', 'brand', 'source', 'prix']].copy()
+            ecarts['prix_predit'] = price_model.predict(ecarts).round(2)
+            ecarts['ecart_%'] = ((ecarts['prix'] / ecarts['prix_predit'] - 1) * 100).round(1)
+            st.markdown("**Produits les plus chers par rapport au prix prédit:**")
+            st.dataframe(ecarts.sort_values('ecart_%', ascending=False).head(10), width='stretch')
 
 # Section 5: Recommandations basées sur le NLP
 st.header("💡 Recommandations Stratégiques")
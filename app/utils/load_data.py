@@ -1,4 +1,5 @@
 import pandas as pd
+import streamlit as st
 from pathlib import Path
 import sys
 
@@ -7,15 +8,62 @@ import sys
 CURRENT_DIR = Path(__file__).resolve()
 PROJECT_ROOT = CURRENT_DIR.parent.parent.parent 
 DATA_PATH = PROJECT_ROOT / "data" / "processed" / "products_cleaned.csv"
+# Dataset typé et partitionné par source, écrit par le cleaner (prioritaire sur le CSV)
+PARQUET_PATH = DATA_PATH.with_suffix('.parquet')
+# Ancien dataset, lisible pendant que le cleaner met le nouveau en place (cf. storage.published_path)
+PARQUET_OLD_PATH = PARQUET_PATH.with_name(PARQUET_PATH.name + '.old')
+# Modèle TF-IDF + KMeans des titres (src/analysis/model.py)
+CLUSTER_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "title_clusters.joblib"
+# Modèle de prix (titre + marque + source, src/analysis/model.py --price)
+PRICE_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "price_model.joblib"
 
-def load_processed_data():
-    """Charge le dataset nettoyé pour l'application"""
+def _read_parquet(columns=None, sources=None):
+    """
+    Lecture Parquet : seules les colonnes demandées sont lues (projection) et
+    les filtres sont évalués à la lecture (partitions source, statistiques des
+    row groups) : les non-smartphones ne sont jamais chargés en mémoire.
+    """
+    filters = [('category', '=', 'smartphone')]
+    if sources:
+        filters.append(('source', 'in', list(sources)))
+    df = pd.read_parquet(_parquet_path(), columns=columns, filters=filters)
+    return _drop_unused_categories(df)
+
+def _drop_unused_categories(df):
+    """Retire les catégories absentes après filtrage (pas de groupes vides dans les graphiques)"""
+    return df.assign(**{col: df[col].cat.remove_unused_categories()
+                        for col in df.select_dtypes('category').columns})
+
+def _parquet_path():
+    """Dataset Parquet publié (ou l'ancien, pendant sa mise en place) ; None s'il n'existe pas"""
+    for path in (PARQUET_PATH, PARQUET_OLD_PATH, PARQUET_PATH):
+        if path.exists():
+            return path
+    return None
+
+def _parquet_is_current():
+    """Parquet utilisable s'il n'est pas plus ancien que le CSV (ex. CSV réécrit par le notebook NLP)"""
+    path = _parquet_path()
+    if path is None:
+        return False
+    return not DATA_PATH.exists() or path.stat().st_mtime >= DATA_PATH.stat().st_mtime
+
+def load_processed_data(columns=None, sources=None):
+    """
+    Charge le dataset nettoyé pour l'application.
+    columns : colonnes à charger (toutes par défaut) ; sources : ex. ['Jumia'].
+    """
     try:
-        if not DATA_PATH.exists():
+        if _parquet_is_current():
+            df = _read_parquet(columns, sources)
+        elif DATA_PATH.exists():
+            df = pd.read_csv(DATA_PATH, usecols=columns)
+            if sources and 'source' in df.columns:
+                df = df[df['source'].isin(sources)]
+        else:
             print(f"❌ Fichier introuvable : {DATA_PATH}")
             return pd.DataFrame()
             
-        df = pd.read_csv(DATA_PATH)
         print(f"✅ Données brutes chargées : {len(df)} lignes")
         
         # --- FORCE LE FILTRE SMARTPHONE ---
@@ -28,7 +76,16 @@ def load_processed_data():
         
         # --- GESTION DES COLONNES MANQUANTES (FALLBACK NLP) ---
         # Si le NLP n'a pas été lancé, on utilise la note client comme substitut
-        if 'sentiment_score' not in df.columns:
+        # (sentiment_score est calculé par le cleaner : python cleaner.py --sentiment)
+        if 'sentiment_score' in df.columns and df['sentiment_score'].isna().all():
+            df = df.drop(columns='sentiment_score')
+        if 'sentiment_score' in df.columns:
+            missing = df['sentiment_score'].isna()
+            if missing.any() and 'note' in df.columns:
+                # Produits sans titre exploitable : note client, comme pour tout le dataset sans NLP
+                df['sentiment_score'] = df['sentiment_score'].fillna(df['note'])
+                print(f"⚠️ {int(missing.sum())} produits sans sentiment_score -> note client utilisée.")
+        else:
             print("⚠️ Colonne 'sentiment_score' absente (NLP non exécuté).")
             if 'note' in df.columns:
                 # On utilise la note client comme substitut du sentiment
@@ -40,8 +97,11 @@ def load_processed_data():
                 print("   -> Valeur neutre (3.0) attribuée par défaut.")
         
         # Idem pour le cluster si nécessaire pour l'affichage
-        if 'cluster' not in df.columns:
+        # (affecté par le modèle src/analysis/model.py ; -1 : produit pas encore affecté)
+        if 'cluster' not in df.columns or df['cluster'].isna().all():
             df['cluster'] = 0
+        elif df['cluster'].isna().any():
+            df['cluster'] = df['cluster'].fillna(-1)
 
         print(f"✅ Données finales pour l'App : {len(df)} lignes (Smartphones uniquement)")
         
@@ -71,8 +131,36 @@ def filter_data(df, brand_filter=None, category_filter=None, sentiment_filter=(1
     # Filtre Sentiment (si la colonne existe)
     if 'sentiment_score' in df.columns:
         df = df[df['sentiment_score'].between(sentiment_filter[0], sentiment_filter[1])]
-        
-    return df
+    
+    # Colonnes catégorielles (Parquet) : pas de groupes vides dans les graphiques
+    return _drop_unused_categories(df)
+
+# Modèles chargés une fois par session serveur (et non à chaque rerun de la page) ;
+# mtime : un modèle réentraîné remplace le fichier, il est alors rechargé
+@st.cache_resource
+def _load_cluster_model(mtime):
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / "analysis"))
+    from model import TitleClusterModel
+    return TitleClusterModel.load(CLUSTER_MODEL_PATH)
+
+@st.cache_resource
+def _load_price_model(mtime):
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / "analysis"))
+    from model import PricePredictor
+    return PricePredictor.load(PRICE_MODEL_PATH)
+
+def get_cluster_terms(n_terms=5):
+    """Mots-clés de chaque cluster du modèle sauvegardé ({} s'il n'a pas encore été entraîné)"""
+    if not CLUSTER_MODEL_PATH.exists():
+        return {}
+    terms = _load_cluster_model(CLUSTER_MODEL_PATH.stat().st_mtime).top_terms(n_terms)
+    return {i: ', '.join(words) for i, words in enumerate(terms)}
+
+def load_price_model():
+    """Modèle de prix sauvegardé (None s'il n'a pas encore été entraîné)"""
+    if not PRICE_MODEL_PATH.exists():
+        return None
+    return _load_price_model(PRICE_MODEL_PATH.stat().st_mtime)
 
 def get_brand_list(df):
     """Retourne la liste des marques uniques triées"""
@@ -0,0 +1,180 @@
+"""
+Vectorisation des titres en streaming (hachage + IDF en ligne).
+
+Le TF-IDF du modèle de clusters (model.py) apprend un vocabulaire : il faut
+tout le corpus en mémoire, et un réentraînement complet dès que le
+vocabulaire change. Ici les mots sont hachés dans un espace de taille fixe
+(HashingVectorizer : aucun vocabulaire à apprendre), et l'IDF est estimé au
+fil des batchs à partir des fréquences de documents par colonne hachée.
+Les matrices restent creuses (CSR) de bout en bout.
+
+La mémoire ne dépend que de n_features et du nombre de clusters, pas de la
+taille du corpus : les fichiers sont lus par batchs (iter_title_batches) et
+alimentent MiniBatchKMeans.partial_fit.
+
+Usage : python src/analysis/features.py [fichiers.csv ...]   # clusters en streaming (dataset nettoyé par défaut)
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from model import N_CLUSTERS, PROJECT_ROOT, TOKEN_PATTERN, _texts, stop_words
+
+STREAMING_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "title_clusters_streaming.joblib"
+# À incrémenter si le format sauvegardé change (les anciens modèles sont refusés)
+FEATURES_VERSION = 1
+
+# 2^18 colonnes : collisions rares pour un vocabulaire de titres, IDF de 2 Mo
+N_FEATURES = 2 ** 18
+# Titres lus et vectorisés à la fois
+BATCH_SIZE = 10_000
+
+
+def iter_title_batches(paths: Sequence[Path], column: str = 'titre',
+                       batch_size: int = BATCH_SIZE) -> Iterator[pd.Series]:
+    """Titres de fichiers CSV, par batchs de batch_size (seule la colonne utile est lue)"""
+    for path in paths:
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=batch_size):
+            yield chunk[column]
+
+
+class HashingTitleFeaturizer:
+    """
+    Titres -> matrice CSR (float32, normalisée L2). Même découpage en mots que
+    model.TitleClusterModel ; use_idf : pondération par l'IDF estimé en ligne
+    (partial_fit), sinon simples fréquences.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES, use_idf: bool = True, hasher: HashingVectorizer = None):
+        self.n_features = n_features
+        self.use_idf = use_idf
+        # hasher : celui d'un modèle sauvegardé (mots vides figés à l'entraînement)
+        self.hasher = hasher or HashingVectorizer(n_features=n_features, token_pattern=TOKEN_PATTERN,
+                                                  stop_words=stop_words(), alternate_sign=False, norm=None,
+                                                  dtype=np.float32)
+        # Nombre de titres contenant chaque colonne hachée, et nombre de titres vus
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def _counts(self, titles: Iterable):
+        # Sortie du HashingVectorizer canonique : une entrée par (titre, colonne)
+        return self.hasher.transform(_texts(titles))
+
+    def partial_fit(self, titles: Iterable) -> 'HashingTitleFeaturizer':
+        """Met à jour les fréquences de documents avec un batch de titres"""
+        counts = self._counts(titles)
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        return self
+
+    def transform(self, titles: Iterable):
+        counts = self._counts(titles)
+        if self.use_idf:
+            # IDF lissé (comme TfidfVectorizer), calculé pour les seules colonnes présentes
+            idf = np.log((1 + self.n_docs) / (1 + self.doc_freq[counts.indices])) + 1
+            counts.data *= idf.astype(np.float32)
+        return normalize(counts, copy=False)
+
+
+class StreamingTitleClusters:
+    """
+    Clusters de titres appris hors mémoire : HashingTitleFeaturizer +
+    MiniBatchKMeans. fit_batches parcourt le corpus deux fois (IDF, puis
+    clusters) ; partial_fit met le modèle à jour avec un nouveau batch.
+    """
+
+    def __init__(self, n_clusters: int = N_CLUSTERS, featurizer: HashingTitleFeaturizer = None,
+                 random_state: int = 42):
+        self.n_clusters = n_clusters
+        self.featurizer = featurizer or HashingTitleFeaturizer()
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+
+    def _partial_fit_kmeans(self, titles: pd.Series):
+        # Le premier batch initialise les centres : il lui faut au moins n_clusters titres
+        if len(titles) >= self.n_clusters or hasattr(self.kmeans, 'cluster_centers_'):
+            self.kmeans.partial_fit(self.featurizer.transform(titles))
+
+    def partial_fit(self, titles: Iterable) -> 'StreamingTitleClusters':
+        titles = _texts(titles)
+        self.featurizer.partial_fit(titles)
+        self._partial_fit_kmeans(titles)
+        return self
+
+    def fit_batches(self, batches: Callable[[], Iterable[Iterable]]) -> 'StreamingTitleClusters':
+        """
+        Entraînement hors mémoire. batches : fonction qui renvoie un nouvel
+        itérateur de batchs de titres à chaque appel (ex. lambda: iter_title_batches(paths)).
+        """
+        for titles in batches():
+            self.featurizer.partial_fit(titles)
+        n_titles = 0
+        for titles in batches():
+            titles = _texts(titles)
+            self._partial_fit_kmeans(titles)
+            n_titles += len(titles)
+        print(f"🧩 Clusters en streaming entraînés sur {n_titles} titres ({self.n_clusters} clusters)")
+        return self
+
+    def assign(self, titles: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cluster, distance au centre et titres sans aucun mot (titres distincts vectorisés une fois)"""
+        codes, uniques = pd.factorize(_texts(titles))
+        if not len(uniques):
+            return np.empty(0, dtype=int), np.empty(0), np.empty(0, dtype=bool)
+        matrix = self.featurizer.transform(uniques)
+        distances = self.kmeans.transform(matrix)
+        labels = distances.argmin(axis=1)
+        distance = distances[np.arange(len(uniques)), labels]
+        empty = matrix.getnnz(axis=1) == 0
+        return labels[codes], distance[codes], empty[codes]
+
+    def predict(self, titles: Iterable) -> np.ndarray:
+        return self.assign(titles)[0]
+
+    def save(self, path: Path = STREAMING_MODEL_PATH) -> Path:
+        """Sauvegarde atomique (objets scikit-learn + état de l'IDF, sans référence à ces classes)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        featurizer = self.featurizer
+        state = {'version': FEATURES_VERSION, 'n_clusters': self.n_clusters, 'n_features': featurizer.n_features,
+                 'use_idf': featurizer.use_idf, 'hasher': featurizer.hasher, 'doc_freq': featurizer.doc_freq,
+                 'n_docs': featurizer.n_docs, 'kmeans': self.kmeans}
+        partial_path = path.with_suffix('.partial')
+        joblib.dump(state, partial_path)
+        os.replace(partial_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = STREAMING_MODEL_PATH) -> 'StreamingTitleClusters':
+        state = joblib.load(path)
+        if state.get('version') != FEATURES_VERSION:
+            raise ValueError(f"Modèle {Path(path).name} au format v{state.get('version')} "
+                             f"(attendu : v{FEATURES_VERSION}) : le réentraîner")
+        featurizer = HashingTitleFeaturizer(state['n_features'], state['use_idf'], hasher=state['hasher'])
+        featurizer.doc_freq = state['doc_freq']
+        featurizer.n_docs = state['n_docs']
+        model = cls(state['n_clusters'], featurizer)
+        model.kmeans = state['kmeans']
+        return model
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / "cleaning"))
+    from cleaner import PROCESSED_DIR
+
+    paths = [Path(arg) for arg in sys.argv[1:]] or [PROCESSED_DIR / "products_cleaned.csv"]
+    model = StreamingTitleClusters().fit_batches(lambda: iter_title_batches(paths))
+    print(f"💾 Modèle sauvegardé : {model.save()}")
+    # Taille des clusters cumulée batch par batch (les labels ne sont jamais concaténés)
+    sizes = np.zeros(model.n_clusters, dtype=np.int64)
+    for titles in iter_title_batches(paths):
+        sizes += np.bincount(model.predict(titles), minlength=model.n_clusters)
+    print(pd.Series(sizes, name='titres'))
@@ -0,0 +1,307 @@
+"""
+Modèles persistants sur les titres : regroupement (TF-IDF + KMeans) et
+prédiction de prix (TF-IDF creux + marque / source, régression Ridge).
+
+Le notebook 2_nlp_analysis réentraînait TfidfVectorizer(max_features=200) +
+KMeans(n_clusters=5) à chaque exécution. Ici le modèle est entraîné une fois,
+sauvegardé (data/models/title_clusters.joblib), puis ne sert qu'à affecter
+les nouveaux titres (transform / predict) : l'affectation quotidienne ne
+coûte que les nouvelles lignes.
+
+Il n'est réentraîné qu'à la demande (--refit) ou quand les nouveaux titres
+s'éloignent de ceux de l'entraînement (dérive) : part de titres sans aucun
+mot du vocabulaire, distance moyenne au centre de leur cluster.
+
+Le modèle de prix ne densifie jamais la matrice TF-IDF (le notebook faisait
+.toarray() avant LinearRegression : mémoire en lignes x vocabulaire) : Ridge
+s'entraîne directement sur la matrice creuse, marque et source en one-hot.
+
+Usage : python src/analysis/model.py [--refit]   # affecte `cluster` au dataset nettoyé
+        python src/analysis/model.py --price     # entraîne le modèle de prix
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from stop_word_lists import ENGLISH_STOP_WORDS, FRENCH_STOP_WORDS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CLUSTER_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "title_clusters.joblib"
+PRICE_MODEL_PATH = PROJECT_ROOT / "data" / "models" / "price_model.joblib"
+# À incrémenter si le format sauvegardé change (les anciens modèles sont refusés)
+MODEL_VERSION = 1
+
+N_CLUSTERS = 5
+MAX_FEATURES = 200
+# Mots de 3 lettres ou plus, chiffres exclus (comme le prétraitement du notebook :
+# "5000mah" -> "mah", "s23" -> rien)
+TOKEN_PATTERN = r"(?u)(?<![^\W\d_])[^\W\d_]{3,}(?![^\W\d_])"
+
+# Dérive : réentraînement si la part de titres hors vocabulaire augmente de plus
+# de DRIFT_OOV_MARGIN, ou si la distance moyenne au centre dépasse DRIFT_DISTANCE_RATIO x la référence
+DRIFT_OOV_MARGIN = 0.10
+DRIFT_DISTANCE_RATIO = 1.20
+
+
+def stop_words() -> List[str]:
+    """
+    Mots vides français + anglais (listes de nltk figées dans stop_word_lists :
+    rien n'est téléchargé), figés dans le modèle à l'entraînement
+    """
+    return sorted(set(FRENCH_STOP_WORDS + ENGLISH_STOP_WORDS))
+
+
+def _texts(titles: Iterable) -> pd.Series:
+    return pd.Series(titles, dtype=object).fillna('').astype(str)
+
+
+class TitleClusterModel:
+    """TF-IDF + KMeans sur les titres, avec sauvegarde et détection de dérive"""
+
+    def __init__(self, n_clusters: int = N_CLUSTERS, max_features: int = MAX_FEATURES, random_state: int = 42):
+        self.n_clusters = n_clusters
+        self.max_features = max_features
+        self.random_state = random_state
+        self.vectorizer = None
+        self.kmeans = None
+        # Statistiques des titres d'entraînement (référence de la dérive)
+        self.baseline: Dict[str, float] = {}
+        self.fitted_at = None
+
+    # --- ENTRAÎNEMENT ---
+
+    def fit(self, titles: Iterable) -> 'TitleClusterModel':
+        texts = _texts(titles)
+        self.vectorizer = TfidfVectorizer(max_features=self.max_features, token_pattern=TOKEN_PATTERN,
+                                          stop_words=stop_words())
+        matrix = self.vectorizer.fit_transform(texts)
+        self.kmeans = KMeans(n_clusters=self.n_clusters, random_state=self.random_state, n_init=10).fit(matrix)
+        _, distance, empty = self.assign(texts)
+        self.baseline = {'n_titles': len(texts), 'oov_rate': float(empty.mean()),
+                         'mean_distance': float(distance.mean())}
+        self.fitted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        print(f"🧩 Modèle de clusters entraîné sur {len(texts)} titres ({self.n_clusters} clusters)")
+        return self
+
+    # --- AFFECTATION ---
+
+    def transform(self, titles: Iterable):
+        """Matrice TF-IDF (creuse) des titres"""
+        return self.vectorizer.transform(_texts(titles))
+
+    def assign(self, titles: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cluster de chaque titre, distance au centre de ce cluster, et titres
+        sans aucun mot du vocabulaire. Chaque titre distinct n'est vectorisé qu'une fois.
+        """
+        codes, uniques = pd.factorize(_texts(titles))
+        if not len(uniques):
+            return np.empty(0, dtype=int), np.empty(0), np.empty(0, dtype=bool)
+        matrix = self.vectorizer.transform(uniques)
+        distances = self.kmeans.transform(matrix)
+        labels = distances.argmin(axis=1)
+        distance = distances[np.arange(len(uniques)), labels]
+        empty = matrix.getnnz(axis=1) == 0
+        return labels[codes], distance[codes], empty[codes]
+
+    def predict(self, titles: Iterable) -> np.ndarray:
+        return self.assign(titles)[0]
+
+    def top_terms(self, n_terms: int = 5) -> List[List[str]]:
+        """Mots les plus représentatifs de chaque cluster"""
+        feature_names = self.vectorizer.get_feature_names_out()
+        return [[feature_names[i] for i in center.argsort()[-n_terms:][::-1]]
+                for center in self.kmeans.cluster_centers_]
+
+    # --- DÉRIVE ---
+
+    def is_drifted(self, oov_rate: float, mean_distance: float) -> bool:
+        return (oov_rate > self.baseline['oov_rate'] + DRIFT_OOV_MARGIN
+                or mean_distance > self.baseline['mean_distance'] * DRIFT_DISTANCE_RATIO)
+
+    def drift(self, titles: Iterable) -> Dict[str, float]:
+        """Statistiques de dérive de `titles` par rapport aux titres d'entraînement"""
+        _, distance, empty = self.assign(titles)
+        oov_rate = float(empty.mean()) if len(empty) else 0.0
+        mean_distance = float(distance.mean()) if len(distance) else 0.0
+        return {'oov_rate': oov_rate, 'mean_distance': mean_distance,
+                'drifted': bool(len(empty)) and self.is_drifted(oov_rate, mean_distance)}
+
+    # --- PERSISTANCE ---
+
+    def save(self, path: Path = CLUSTER_MODEL_PATH) -> Path:
+        """Sauvegarde atomique (objets scikit-learn + paramètres, sans référence à cette classe)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {'version': MODEL_VERSION, 'n_clusters': self.n_clusters, 'max_features': self.max_features,
+                 'random_state': self.random_state, 'vectorizer': self.vectorizer, 'kmeans': self.kmeans,
+                 'baseline': self.baseline, 'fitted_at': self.fitted_at}
+        partial_path = path.with_suffix('.partial')
+        joblib.dump(state, partial_path)
+        os.replace(partial_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = CLUSTER_MODEL_PATH) -> 'TitleClusterModel':
+        state = joblib.load(path)
+        if state.get('version') != MODEL_VERSION:
+            raise ValueError(f"Modèle {Path(path).name} au format v{state.get('version')} "
+                             f"(attendu : v{MODEL_VERSION}) : relancer avec --refit")
+        model = cls(state['n_clusters'], state['max_features'], state['random_state'])
+        model.vectorizer = state['vectorizer']
+        model.kmeans = state['kmeans']
+        model.baseline = state['baseline']
+        model.fitted_at = state['fitted_at']
+        return model
+
+
+def update_clusters(df: pd.DataFrame, path: Path = CLUSTER_MODEL_PATH, refit: bool = False) -> pd.DataFrame:
+    """
+    Affecte `cluster` aux produits qui n'en ont pas (titres nouveaux) avec le
+    modèle sauvegardé. Le modèle est (ré)entraîné sur tout le dataset, et
+    tous les produits réaffectés, s'il n'existe pas, si refit, ou si les
+    nouveaux titres ont dérivé.
+    """
+    df = df.copy()
+    if 'cluster' not in df.columns:
+        df['cluster'] = np.nan
+    new = df['cluster'].isna()
+
+    model = TitleClusterModel.load(path) if Path(path).exists() and not refit else None
+    if model is not None and new.any():
+        drift = model.drift(df.loc[new, 'titre'])
+        print(f"🧭 Dérive des nouveaux titres : {drift['oov_rate']:.1%} hors vocabulaire "
+              f"(réf. {model.baseline['oov_rate']:.1%}), distance moyenne {drift['mean_distance']:.3f} "
+              f"(réf. {model.baseline['mean_distance']:.3f})")
+        if drift['drifted']:
+            print("♻️ Dérive détectée : réentraînement du modèle")
+            model = None
+    if model is None:
+        model = TitleClusterModel().fit(df['titre'])
+        model.save(path)
+        new = pd.Series(True, index=df.index)
+
+    df.loc[new, 'cluster'] = model.predict(df.loc[new, 'titre'])
+    df['cluster'] = df['cluster'].astype('Int32')
+    print(f"✅ {int(new.sum())} produits affectés à un cluster")
+    for i, terms in enumerate(model.top_terms()):
+        print(f"   Cluster {i} : {', '.join(terms)}")
+    return df
+
+
+# Colonnes utilisées par le modèle de prix
+PRICE_FEATURES = ['titre', 'brand', 'source']
+
+
+class PricePredictor:
+    """
+    Prix (EUR) à partir du titre, de la marque et de la source. Le titre
+    passe par un TF-IDF (mots et paires de mots) qui reste creux, marque et
+    source par un one-hot ; la régression porte sur log(1 + prix) (prix très
+    dispersés : l'erreur relative compte plus que l'écart en euros).
+    """
+
+    def __init__(self, alpha: float = 1.0, min_df: int = 2):
+        self.alpha = alpha
+        self.min_df = min_df
+        self.pipeline = None
+        self.mae = None
+        self.fitted_at = None
+
+    @staticmethod
+    def _features(df: pd.DataFrame) -> pd.DataFrame:
+        features = df.reindex(columns=PRICE_FEATURES)
+        return features.assign(titre=_texts(features['titre']).to_numpy(),
+                               brand=features['brand'].astype(str).to_numpy(),
+                               source=features['source'].astype(str).to_numpy())
+
+    def fit(self, df: pd.DataFrame) -> 'PricePredictor':
+        """Entraîne sur les produits avec un prix (colonnes titre, brand, source, prix)"""
+        df = df[df['prix'].notna()]
+        columns = ColumnTransformer([
+            ('titre', TfidfVectorizer(token_pattern=TOKEN_PATTERN, stop_words=stop_words(), ngram_range=(1, 2),
+                                      min_df=self.min_df, sublinear_tf=True, dtype=np.float32), 'titre'),
+            ('categories', OneHotEncoder(handle_unknown='ignore'), ['brand', 'source']),
+        ], sparse_threshold=1.0)        # toujours creux (défaut 0.3 : densifié si peu de vocabulaire)
+        self.pipeline = make_pipeline(columns, Ridge(alpha=self.alpha))
+        self.pipeline.fit(self._features(df), np.log1p(df['prix'].to_numpy(dtype='float64')))
+        self.fitted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """Prix prédit de chaque produit de df (colonnes titre, brand, source)"""
+        return np.expm1(self.pipeline.predict(self._features(df)))
+
+    def evaluate(self, df: pd.DataFrame) -> float:
+        """Erreur absolue moyenne (EUR) sur les produits de df"""
+        df = df[df['prix'].notna()]
+        return float(mean_absolute_error(df['prix'], self.predict(df)))
+
+    def save(self, path: Path = PRICE_MODEL_PATH) -> Path:
+        """Sauvegarde atomique (pipeline scikit-learn + paramètres, sans référence à cette classe)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {'version': MODEL_VERSION, 'alpha': self.alpha, 'min_df': self.min_df, 'pipeline': self.pipeline,
+                 'mae': self.mae, 'fitted_at': self.fitted_at}
+        partial_path = path.with_suffix('.partial')
+        joblib.dump(state, partial_path)
+        os.replace(partial_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = PRICE_MODEL_PATH) -> 'PricePredictor':
+        state = joblib.load(path)
+        if state.get('version') != MODEL_VERSION:
+            raise ValueError(f"Modèle {Path(path).name} au format v{state.get('version')} "
+                             f"(attendu : v{MODEL_VERSION}) : relancer avec --price")
+        model = cls(state['alpha'], state['min_df'])
+        model.pipeline = state['pipeline']
+        model.mae = state['mae']
+        model.fitted_at = state['fitted_at']
+        return model
+
+
+def train_price_model(df: pd.DataFrame, path: Path = PRICE_MODEL_PATH, test_size: float = 0.2) -> PricePredictor:
+    """
+    Mesure l'erreur du modèle de prix sur un échantillon de test, puis
+    l'entraîne sur tout le dataset et le sauvegarde (avec cette erreur).
+    """
+    df = df[df['prix'].notna()]
+    train, test = train_test_split(df, test_size=test_size, random_state=42)
+    mae = PricePredictor().fit(train).evaluate(test)
+    print(f"✅ Modèle de prix : MAE {mae:.2f} € sur {len(test)} produits de test")
+    model = PricePredictor().fit(df)
+    model.mae = mae
+    print(f"💾 Modèle de prix sauvegardé : {model.save(path)} ({len(df)} produits)")
+    return model
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / "cleaning"))
+    from cleaner import ProcessedWriter, PROCESSED_DIR
+
+    output_file = PROCESSED_DIR / "products_cleaned.csv"
+    df = pd.read_csv(output_file, dtype={'id_produit': str})
+    if '--price' in sys.argv:
+        train_price_model(df)
+        sys.exit()
+
+    df = update_clusters(df, refit='--refit' in sys.argv)
+    writer = ProcessedWriter(output_file)
+    writer.write(df)
+    writer.close()
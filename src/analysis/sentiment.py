@@ -0,0 +1,269 @@
+"""
+Score de sentiment des titres (modèle Transformers multilingue, 1 à 5 étoiles).
+
+Étape du nettoyage (DataCleaner(sentiment=SentimentScorer())) : chaque titre
+distinct n'est noté qu'une fois, les titres jamais vus sont passés au modèle
+par batchs triés par longueur (peu de padding), et les scores sont gardés
+dans un cache SQLite (empreinte du titre + version du modèle). D'un run à
+l'autre, seuls les nouveaux titres chargent et sollicitent le modèle.
+
+Sans GPU, le backend 'int8' (quantification dynamique des couches linéaires,
+torch.quantization.quantize_dynamic) divise le temps de calcul CPU ;
+check_parity compare ses labels à ceux du modèle fp32 et benchmark mesure
+le débit en titres par seconde.
+
+Usage : python src/analysis/sentiment.py [--backend int8] [--threads 8]   # ajoute sentiment_score au dataset nettoyé
+        python src/analysis/sentiment.py --benchmark [--threads 8]        # débit fp32 / int8 + parité des labels
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MODEL_NAME = "nlptown/bert-base-multilingual-uncased-sentiment"
+# À incrémenter si la conversion label -> score change (invalide le cache)
+SENTIMENT_VERSION = 1
+# 'fp32' : modèle d'origine (GPU si disponible) ; 'int8' : quantifié pour CPU
+BACKENDS = ('fp32', 'int8')
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SENTIMENT_CACHE_DB = PROJECT_ROOT / "data" / "index" / "sentiment.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiments (
+    model_version  TEXT NOT NULL,
+    title_hash     TEXT NOT NULL,
+    score          REAL NOT NULL,
+    scored_at      TEXT NOT NULL,
+    PRIMARY KEY (model_version, title_hash)
+) WITHOUT ROWID;
+"""
+
+
+def title_hash(title: str) -> str:
+    return hashlib.sha1(title.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """Cache empreinte du titre -> score pour une version du modèle, avec compteurs hits / misses"""
+
+    def __init__(self, db_path: Path, model_version: str):
+        self.model_version = model_version
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        with self._lock:
+            purged = self._conn.execute("DELETE FROM sentiments WHERE model_version != ?",
+                                        (model_version,)).rowcount
+            self._conn.commit()
+        if purged:
+            print(f"♻️ Modèle de sentiment modifié : {purged} scores du cache invalidés")
+        # Copie mémoire, chargée en une seule lecture au premier lookup
+        self._memory: Optional[Dict[str, float]] = None
+        self.reset_stats()
+
+    def _load(self) -> Dict[str, float]:
+        if self._memory is None:
+            with self._lock:
+                rows = self._conn.execute("SELECT title_hash, score FROM sentiments WHERE model_version = ?",
+                                          (self.model_version,)).fetchall()
+            self._memory = dict(rows)
+        return self._memory
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, hashes: Iterable[str]) -> Dict[str, float]:
+        """Scores connus parmi `hashes` (empreintes de titres)"""
+        memory = self._load()
+        found: Dict[str, float] = {}
+        n_hashes = 0
+        for key in hashes:
+            n_hashes += 1
+            known = memory.get(key)
+            if known is not None:
+                found[key] = known
+        self.hits += len(found)
+        self.misses += n_hashes - len(found)
+        return found
+
+    def store(self, scores: Dict[str, float]):
+        """Enregistre les scores des titres nouvellement notés"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO sentiments VALUES (?, ?, ?, ?)",
+                                   [(self.model_version, key, score, now) for key, score in scores.items()])
+            self._conn.commit()
+        self._load().update(scores)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SentimentScorer:
+    """
+    Score de sentiment (1 à 5) d'une Series de titres. Le modèle n'est
+    chargé qu'au premier titre absent du cache (transformers et torch ne
+    sont importés qu'à ce moment-là).
+
+    backend : 'fp32' ou 'int8' (CPU uniquement) ; num_threads : threads
+    torch utilisés pour l'inférence (par défaut, ceux choisis par torch).
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, revision: Optional[str] = None, batch_size: int = 32,
+                 cache_path: Optional[Path] = SENTIMENT_CACHE_DB, backend: str = 'fp32',
+                 num_threads: Optional[int] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend inconnu : {backend} (attendu : {', '.join(BACKENDS)})")
+        self.model_name = model_name
+        self.revision = revision
+        self.batch_size = batch_size
+        self.backend = backend
+        self.num_threads = num_threads
+        # cache_path=None : pas de cache, tous les titres sont notés
+        self.cache = SentimentCache(cache_path, self.model_version) if cache_path is not None else None
+        self._pipeline = None
+
+    @property
+    def model_version(self) -> str:
+        """Version du modèle (backend compris) : toute modification invalide le cache"""
+        version = f"{self.model_name}@{self.revision or 'main'}/v{SENTIMENT_VERSION}"
+        return version if self.backend == 'fp32' else f"{version}/{self.backend}"
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+            if self.num_threads:
+                torch.set_num_threads(self.num_threads)
+            print(f"🤖 Chargement du modèle de sentiment : {self.model_name} ({self.backend}, "
+                  f"{torch.get_num_threads()} threads)")
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=self.revision)
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name, revision=self.revision)
+            if self.backend == 'int8':
+                # Poids des couches linéaires en int8, activations quantifiées à la volée (CPU)
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                device = -1
+            else:
+                device = 0 if torch.cuda.is_available() else -1
+            self._pipeline = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=device)
+        return self._pipeline
+
+    def score_texts(self, texts: List[str]) -> List[float]:
+        """
+        Scores de titres non vides, dans l'ordre reçu. Les titres sont passés
+        au modèle du plus court au plus long : chaque batch réunit des titres
+        de longueurs voisines, le padding (calcul inutile) reste minimal.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        scores = [0.0] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            results = self.pipeline([texts[i] for i in batch], batch_size=len(batch), truncation=True)
+            for i, result in zip(batch, results):
+                scores[i] = float(result['label'][0])      # ex: "4 stars" -> 4
+        return scores
+
+    def score(self, titles: pd.Series) -> pd.Series:
+        """sentiment_score de chaque titre (NaN pour un titre absent ou vide)"""
+        titles = pd.Series(titles)
+        texts = titles.astype('string').str.strip().replace('', pd.NA)
+        codes, uniques = pd.factorize(texts)
+        uniques = [str(text) for text in uniques]
+        hashes = [title_hash(text) for text in uniques]
+
+        known = self.cache.lookup(hashes) if self.cache is not None else {}
+        new = [i for i, key in enumerate(hashes) if key not in known]
+        if new:
+            scored = dict(zip((hashes[i] for i in new), self.score_texts([uniques[i] for i in new])))
+            if self.cache is not None:
+                self.cache.store(scored)
+            known = {**known, **scored}
+
+        # Code -1 (titre manquant) -> dernière case : NaN
+        values = np.append(np.array([known[key] for key in hashes], dtype='float64'), np.nan)
+        return pd.Series(values[codes], index=titles.index, name='sentiment_score')
+
+    @staticmethod
+    def _distinct(titles: Iterable) -> List[str]:
+        texts = pd.Series(list(titles), dtype='string').str.strip().replace('', pd.NA).dropna()
+        return [str(text) for text in texts.unique()]
+
+    def benchmark(self, titles: Iterable) -> float:
+        """
+        Débit du modèle (titres distincts par seconde), sans cache ni
+        chargement du modèle (un premier batch sert d'échauffement).
+        """
+        texts = self._distinct(titles)
+        if not texts:
+            return 0.0
+        self.score_texts(texts[:self.batch_size])
+        start = time.perf_counter()
+        self.score_texts(texts)
+        throughput = len(texts) / (time.perf_counter() - start)
+        print(f"⚡ {self.backend} : {throughput:.0f} titres/s sur {len(texts)} titres")
+        return throughput
+
+    def check_parity(self, titles: Iterable, reference: Optional['SentimentScorer'] = None) -> pd.DataFrame:
+        """
+        Compare les labels de ce backend à ceux du modèle fp32 (reference,
+        créé sans cache si absent). Retourne les titres en désaccord.
+        """
+        reference = reference or SentimentScorer(self.model_name, self.revision, self.batch_size, cache_path=None,
+                                                 num_threads=self.num_threads)
+        texts = self._distinct(titles)
+        expected = pd.Series(reference.score_texts(texts), dtype='float64')
+        obtained = pd.Series(self.score_texts(texts), dtype='float64')
+        mismatches = pd.DataFrame({'titre': texts, 'attendu': expected, 'obtenu': obtained})[expected != obtained]
+        agreement = 1 - len(mismatches) / len(texts) if texts else 1.0
+        if mismatches.empty:
+            print(f"✅ Parité des labels {self.backend} / fp32 OK sur {len(texts)} titres")
+        else:
+            print(f"❌ Labels {self.backend} : {len(mismatches)} titres en désaccord sur {len(texts)} "
+                  f"({agreement:.1%} d'accord, écart moyen {(obtained - expected).abs().mean():.3f} étoile)")
+        return mismatches
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / "cleaning"))
+    from cleaner import ProcessedWriter, PROCESSED_DIR
+
+    option = lambda name, default=None: sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+    num_threads = int(option('--threads', 0)) or None
+    output_file = PROCESSED_DIR / "products_cleaned.csv"
+    df = pd.read_csv(output_file, dtype={'id_produit': str})
+
+    if '--benchmark' in sys.argv:
+        # Débit fp32 puis int8 sur les titres du dataset, et parité des labels int8
+        fp32 = SentimentScorer(cache_path=None, num_threads=num_threads)
+        int8 = SentimentScorer(cache_path=None, backend='int8', num_threads=num_threads)
+        fp32.benchmark(df['titre'])
+        int8.benchmark(df['titre'])
+        int8.check_parity(df['titre'], reference=fp32)
+        sys.exit()
+
+    # Ajoute (ou met à jour) sentiment_score dans le dataset nettoyé existant
+    scorer = SentimentScorer(backend=option('--backend', 'fp32'), num_threads=num_threads)
+    df['sentiment_score'] = scorer.score(df['titre'])
+    writer = ProcessedWriter(output_file)
+    writer.write(df)
+    writer.close()
+    print(f"✅ sentiment_score ajouté à {output_file} ({len(df)} produits, "
+          f"{scorer.cache.misses} titres notés par le modèle)")
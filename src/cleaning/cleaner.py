@@ -2,9 +2,19 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import glob
+import hashlib
+import json
 import os
 import sys
-import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from taggers import BrandTagger, CategoryMatcher, TitleClassifier, CLASSIFICATION_COLUMNS, UNKNOWN_BRAND
+from title_cache import TitleCache
+from storage import ParquetDatasetWriter
+from price_history import PriceHistory
+from currency import to_eur
 
 # --- CONFIGURATION DES CHEMINS ---
 current_path = Path(__file__).resolve()
@@ -20,105 +30,90 @@ if not found_root: project_root = Path.cwd()
 RAW_DIR = project_root / "data" / "raw"
 PROCESSED_DIR = project_root / "data" / "processed"
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+# Cache des titres déjà classés, partagé d'un run à l'autre
+TITLE_CACHE_DB = project_root / "data" / "index" / "titles.sqlite"
+# Historique des prix (points de changement) à travers les runs
+PRICE_HISTORY_DIR = PROCESSED_DIR / "price_history"
+# Fichiers bruts déjà intégrés au dataset nettoyé (mode incrémental)
+RAW_MANIFEST = PROCESSED_DIR / "raw_manifest.json"
+# Types imposés à la lecture des fichiers bruts : identiques quel que soit le
+# découpage en chunks (et les identifiants gardent leurs zéros de tête)
+RAW_DTYPES = {'asin': str, 'id_produit': str}
+# Préfixe des fichiers bruts -> source
+RAW_SOURCES = {'amazon': 'Amazon', 'jumia': 'Jumia'}
+# Lignes brutes par lot confié à un processus (mode parallèle sans chunksize)
+SHARD_ROWS = 20_000
+
+# Colonnes du dataset nettoyé (ordre figé pour l'écriture incrémentale)
+OUTPUT_COLUMNS = ['id_produit', 'titre', 'prix', 'note', 'nb_avis', 'lien', 'source', 'date', 'brand', 'category',
+                  'prix_origine', 'devise_origine', 'sentiment_score', 'cluster']
+# On supprime les produits < 40€ qui sont probablement des accessoires mal classés
+PRICE_THRESHOLD = 40.0
 
 class DataCleaner:
-    def __init__(self):
+    def __init__(self, cache_path=TITLE_CACHE_DB, history_dir=PRICE_HISTORY_DIR, sentiment=None,
+                 clusters=None):
         print("🧹 Initialisation du Data Cleaner...")
+        self.cache_path = cache_path
+        # Taggers vectorisés (une analyse par titre distinct, sans .apply ligne par ligne)
+        self.brand_tagger = BrandTagger()
+        self.category_matcher = CategoryMatcher()
+        self.classifier = TitleClassifier(self.brand_tagger, self.category_matcher)
+        # cache_path=None : pas de cache, tous les titres sont reclassés
+        if cache_path is not None:
+            self.classifier.cache = TitleCache(cache_path, self.classifier.rules_hash)
+        # history_dir=None : pas d'historique des prix
+        self.history = PriceHistory(history_dir) if history_dir is not None else None
+        # sentiment : SentimentScorer (src/analysis/sentiment.py) ; None : sentiment_score laissé vide
+        self.sentiment = sentiment
+        # clusters : TitleClusterModel entraîné (src/analysis/model.py) ; None : cluster laissé vide
+        self.clusters = clusters
+        self.reset_report()
 
-    def extract_brand(self, text):
-        """Extraction des marques avec gestion des alias"""
-        if pd.isna(text):
-            return 'Unknown'
-        
-        text_lower = str(text).lower()
-        
-        # Gestion des alias (iPhone, Galaxy, Redmi, etc.)
-        if 'iphone' in text_lower or 'ipad' in text_lower:
-            return 'Apple'
-        if 'galaxy' in text_lower:
-            return 'Samsung'
-        if 'redmi' in text_lower or 'pocophone' in text_lower or 'poco' in text_lower:
-            return 'Xiaomi'
-        if 'pixel' in text_lower:
-            return 'Google'
-        
-        # Liste standard
-        brands = [
-            'samsung', 'apple', 'huawei', 'xiaomi', 'oppo', 'vivo', 'realme',
-            'oneplus', 'google', 'motorola', 'nokia', 'sony', 'lg', 'asus',
-            'lenovo', 'tecno', 'infinix', 'wiko', 'honor', 'blackberry'
-        ]
-        
-        for brand in brands:
-            if brand in text_lower:
-                return brand.capitalize()
-        
-        return 'Unknown'
+    def reset_report(self):
+        """Compteurs cumulés sur tous les batchs nettoyés (affichés par print_report)"""
+        self.report = {
+            'raw_rows': Counter(),
+            'without_price': 0,
+            'categories': Counter(),
+            'accessory_keywords': Counter(),
+            'smartphone_bonus': 0,
+            'below_threshold': 0,
+            'unknown_brand': 0,
+            # Produits affectés à un cluster, dont sans mot connu du modèle, et somme des distances au centre
+            'clustered': 0,
+            'cluster_oov': 0,
+            'cluster_distance': 0.0,
+            # Secondes par étape (lecture, standardisation, classification, filtrage, écriture, historique)
+            'timings': Counter()
+        }
+
+    def _merge_report(self, report):
+        """Ajoute les compteurs d'un autre rapport (celui d'un processus de nettoyage)"""
+        for key, value in report.items():
+            self.report[key] += value
+
+    def _timed(self, iterable, stage):
+        """Itère sur `iterable` en comptant le temps passé à produire chaque élément"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.report['timings'][stage] += time.perf_counter() - start
+            yield item
 
     def extract_category(self, text):
-        """Classification ULTRA PRÉCISE - VERSION FINALE"""
+        """
+        Catégorie d'UN titre (mêmes règles que self.category_matcher, qui traite
+        les DataFrames). La parité avec les règles d'origine est vérifiée par
+        tests/test_taggers.py.
+        """
         if pd.isna(text):
             return 'unknown'
-
-        text_lower = str(text).lower()
-
-        # ===== LISTE NOIRE ULTRA RENFORCÉE =====
-        accessory_keywords = [
-            # Protection & Coques
-            'coque', 'housse', 'étui', 'case', 'cover', 'shell', 'bumper',
-            'protection', 'silicone', 'rigid', 'transparent', 'pochette',
-            
-            # Écran & Film
-            'film', 'verre trempé', 'protecteur', 'screen protector', 
-            'tempered glass', 'hydrogel', 'pellicule',
-            
-            # Chargement & Batteries (Capture "Apple Batterie MagSafe")
-            'chargeur', 'câble', 'cable', 'adaptateur', 'adapter', 
-            'power bank', 'batterie externe', 'batterie', 'wireless charger',
-            'charging', 'fast charge', 'plug', 'magsafe', 'powerbank',
-            
-            # Audio (Capture "DJI Mic")
-            'écouteur', 'casque', 'headphone', 'earphone', 'earbud',
-            'airpod', 'galaxy buds', 'buds', 'pods', 'speakers', 'enceinte',
-            'microphone', 'mic', 'micro', 'cravate', 'sans fil',
-            
-            # Supports & Stabilisation (Capture "Stabilisateur", "Cardan")
-            'trépied', 'tripod', 'gorillapod', 'selfie stick', 'perche',
-            'support', 'holder', 'stand', 'mount', 'grip',
-            'stabilisateur', 'cardan', 'gimbal', 'steadicam',
-            
-            # Montres & Bracelets
-            'smart watch', 'smartwatch', 'montre connectée', 'watch',
-            'bracelet', 'band', 'strap', 'mi band',
-            
-            # Stockage & Cartes
-            'carte mémoire', 'microsd', 'sd card', 'usb', 'clé usb',
-            
-            # Divers
-            'stylet', 's pen', 'apple pencil', 'moniteur', 'kit', 'pack',
-            'sim card', 'outil', 'remplacement', 'pièce', 'stick', 'dock'
-        ]
-        
-        # ===== VÉRIFICATION STRICTE =====
-        # Si UN SEUL mot d'accessoire est présent -> C'est un accessoire
-        if any(acc in text_lower for acc in accessory_keywords):
-            return 'accessoire'
-        
-        # ===== DÉTECTION SMARTPHONE =====
-        smartphone_keywords = [
-            'smartphone', 'iphone', 'android phone', 'mobile phone',
-            'galaxy s', 'galaxy a', 'galaxy z', 'galaxy note',
-            'redmi note', 'redmi a', 'poco f', 'poco x',
-            'mi 1', 'mi 2', 'mi 3', 'mi 4', 'mi 5', 'mi 6', 'mi 7', 'mi 8', 'mi 9', 'mi 10', 'mi 11', 'mi 12',
-            'pixel', 'oneplus', 'oppo find', 'vivo v',
-            'huawei p', 'huawei mate',
-            'xperia', 'nokia', 'motorola moto'
-        ]
-        
-        if any(kw in text_lower for kw in smartphone_keywords):
-            return 'smartphone'
-        
-        return 'other'
+        return self.category_matcher.match_lower(str(text).lower())[0]
 
     def _is_real_smartphone_with_bonus(self, text_lower):
         """
@@ -126,62 +121,17 @@ class DataCleaner:
         Exemple : "Samsung Galaxy S21 + Coque offerte" → True
         Contre-exemple : "Coque de protection iPhone 13" → False
         """
-        # Patterns d'accessoires qui commencent le titre
-        # Si le titre COMMENCE par un accessoire, ce n'est PAS un smartphone
-        accessory_start_patterns = [
-            r'^(coque|étui|housse|film|protection|chargeur|câble|support|adaptateur)',
-            r'^(casque|écouteur|batterie|kit)',
-        ]
-        
-        for pattern in accessory_start_patterns:
-            if re.search(pattern, text_lower):
-                return False
-        
-        # Patterns de vrais smartphones (titre qui commence par une marque/modèle)
-        real_smartphone_patterns = [
-            r'^(samsung|iphone|xiaomi|google|huawei|oppo|vivo|realme|oneplus)',
-            r'^(galaxy|redmi|poco|pixel)',
-            r'^smartphone\s+(samsung|apple|xiaomi)',  # "Smartphone Samsung Galaxy..."
-        ]
-        
-        for pattern in real_smartphone_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        return self.category_matcher.match_lower(text_lower)[2]
 
     def extract_brand(self, text):
+        """
+        Marque d'UN titre (mêmes règles que self.brand_tagger, qui traite les
+        DataFrames). La parité avec les règles d'origine est vérifiée par
+        tests/test_taggers.py.
+        """
         if pd.isna(text):
-            return 'Unknown'
-        
-        text_lower = str(text).lower()
-        
-        # ===== FILTRE ANTI-ACCESSOIRES =====
-        # Si c'est déjà classé comme accessoire, on met "Accessory Brand"
-        # (à appliquer APRÈS avoir extrait la catégorie)
-        
-        # --- ALIAS (Crucial) ---
-        if 'iphone' in text_lower or 'ipad' in text_lower:
-            return 'Apple'
-        if 'galaxy' in text_lower and 'watch' not in text_lower:  # ⚠️ Évite "Galaxy Watch"
-            return 'Samsung'
-        if 'redmi' in text_lower or 'pocophone' in text_lower or 'poco' in text_lower:
-            return 'Xiaomi'
-        if 'pixel' in text_lower and 'buds' not in text_lower:  # ⚠️ Évite "Pixel Buds"
-            return 'Google'
-        
-        # --- MARQUES STANDARD ---
-        brands = [
-            'samsung', 'apple', 'huawei', 'xiaomi', 'oppo', 'vivo', 'realme',
-            'oneplus', 'google', 'motorola', 'nokia', 'sony', 'lg', 'asus',
-            'lenovo', 'tecno', 'infinix', 'wiko', 'honor', 'zte', 'alcatel'
-        ]
-        
-        for brand in brands:
-            if brand in text_lower:
-                return brand.capitalize()
-        
-        return 'Unknown'
+            return UNKNOWN_BRAND
+        return self.brand_tagger.tag_lower(str(text).lower())
 
     def get_latest_file(self, keyword):
         """Trouve le fichier le plus récent (priorité aux fichiers globaux)"""
@@ -208,6 +158,11 @@ class DataCleaner:
         if pd.isna(text): return ""
         return str(text).lower().replace('\n', ' ').strip()
 
+    def _classify(self, df):
+        start = time.perf_counter()
+        df[CLASSIFICATION_COLUMNS] = self.classifier.classify(df['titre'])
+        self.report['timings']['classification'] += time.perf_counter() - start
+
     def standardize_amazon(self, df):
         df = df.copy()
         if 'asin' not in df.columns: df['asin'] = np.nan
@@ -215,12 +170,13 @@ class DataCleaner:
         
         df = df.rename(columns={'asin': 'id_produit', 'date_scraping': 'date'})
         df['prix'] = pd.to_numeric(df['prix'], errors='coerce')
+        df = to_eur(df, 'EUR')
         
         # Extraction MARQUE et CATÉGORIE
-        df['brand'] = df['titre'].apply(self.extract_brand)
-        df['category'] = df['titre'].apply(self.extract_category)
+        self._classify(df)
         
-        cols = ['id_produit', 'titre', 'prix', 'note', 'nb_avis', 'lien', 'source', 'date', 'brand', 'category']
+        cols = ['id_produit', 'titre', 'prix', 'note', 'nb_avis', 'lien', 'source', 'date'] + CLASSIFICATION_COLUMNS
+        cols += ['prix_origine', 'devise_origine']
         return df[[c for c in cols if c in df.columns]]
 
     def standardize_jumia(self, df):
@@ -228,18 +184,227 @@ class DataCleaner:
         if 'nb_avis' not in df.columns: df['nb_avis'] = 0
         df = df.rename(columns={'date_scraping': 'date'})
         
-        # Normalisation des prix (Jumia -> Euro)
+        # Normalisation des prix (Jumia -> Euro) au taux MAD de la date de scraping
         df['prix'] = pd.to_numeric(df['prix'], errors='coerce')
-        df['prix'] = df['prix'] / 11  # Conversion MAD vers Euro
+        df = to_eur(df, 'MAD')
         
         # Extraction MARQUE et CATÉGORIE
-        df['brand'] = df['titre'].apply(self.extract_brand)
-        df['category'] = df['titre'].apply(self.extract_category)
+        self._classify(df)
         
-        cols = ['id_produit', 'titre', 'prix', 'note', 'nb_avis', 'lien', 'source', 'date', 'brand', 'category']
+        cols = ['id_produit', 'titre', 'prix', 'note', 'nb_avis', 'lien', 'source', 'date'] + CLASSIFICATION_COLUMNS
+        cols += ['prix_origine', 'devise_origine']
         return df[[c for c in cols if c in df.columns]]
 
-    def run(self):
+    def standardize(self, df, source):
+        """Standardisation selon la source ('Amazon' ou 'Jumia')"""
+        if source == 'Amazon':
+            return self.standardize_amazon(df)
+        if source == 'Jumia':
+            return self.standardize_jumia(df)
+        raise ValueError(f"Source inconnue : {source}")
+
+    def clean_batch(self, df, source):
+        """
+        Standardise, classe et filtre un lot de produits bruts d'une même source.
+        Utilisable sur un fichier complet (run) comme sur les pages qui arrivent
+        au fil du scraping (pipeline streaming) : les compteurs sont cumulés dans self.report.
+        """
+        self.report['raw_rows'][source] += len(df)
+        if df.empty:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+        timings = self.report['timings']
+        start = time.perf_counter()
+        classified = timings['classification']
+        df = self.standardize(df, source)
+        # Standardisation hors classification (comptée à part)
+        timings['standardisation'] += time.perf_counter() - start - (timings['classification'] - classified)
+
+        start = time.perf_counter()
+        initial_len = len(df)
+        df = df.dropna(subset=['prix'])
+        self.report['without_price'] += initial_len - len(df)
+        self.report['categories'].update(df['category'].value_counts().to_dict())
+        accessories = df[df['category'] == 'accessoire']
+        self.report['accessory_keywords'].update(accessories['category_keyword'].value_counts().to_dict())
+        self.report['smartphone_bonus'] += int(accessories['smartphone_bonus'].sum())
+
+        # Filtrage strict : uniquement smartphones
+        df = df[df['category'] == 'smartphone']
+
+        # Filtre de sécurité prix
+        count_before_price_filter = len(df)
+        df = df[df['prix'] >= PRICE_THRESHOLD]
+        self.report['below_threshold'] += count_before_price_filter - len(df)
+
+        count_before_brand_filter = len(df)
+        df = df[df['brand'] != 'Unknown'].reset_index(drop=True)
+        self.report['unknown_brand'] += count_before_brand_filter - len(df)
+
+        # Remplir les NaN (en float : même type quel que soit le lot)
+        df['note'] = pd.to_numeric(df['note'], errors='coerce').astype('float64').fillna(-1)
+        df['nb_avis'] = pd.to_numeric(df['nb_avis'], errors='coerce').astype('float64').fillna(0)
+        df = df.reindex(columns=OUTPUT_COLUMNS)
+        timings['filtrage'] += time.perf_counter() - start
+        return self.add_clusters(self.add_sentiment(df))
+
+    def add_sentiment(self, df, missing_only=False):
+        """
+        Score de sentiment des produits conservés (étape optionnelle, cf.
+        self.sentiment). missing_only : ne note que les produits qui n'en ont pas.
+        """
+        if self.sentiment is None or df.empty:
+            return df
+        start = time.perf_counter()
+        rows = df['sentiment_score'].isna() if missing_only else slice(None)
+        df.loc[rows, 'sentiment_score'] = self.sentiment.score(df.loc[rows, 'titre']).to_numpy()
+        self.report['timings']['sentiment'] += time.perf_counter() - start
+        return df
+
+    def add_clusters(self, df, missing_only=False):
+        """
+        Cluster des produits conservés (étape optionnelle, cf. self.clusters :
+        affectation seule, sans réentraînement). missing_only : ne traite que
+        les produits qui n'en ont pas.
+        """
+        if self.clusters is None or df.empty:
+            return df
+        start = time.perf_counter()
+        rows = df['cluster'].isna() if missing_only else slice(None)
+        labels, distance, empty = self.clusters.assign(df.loc[rows, 'titre'])
+        df.loc[rows, 'cluster'] = labels
+        df['cluster'] = df['cluster'].astype('Int32')
+        self.report['clustered'] += len(labels)
+        self.report['cluster_oov'] += int(empty.sum())
+        self.report['cluster_distance'] += float(distance.sum())
+        self.report['timings']['clusters'] += time.perf_counter() - start
+        return df
+
+    def clean_shards(self, shards, workers=None):
+        """
+        Nettoie une suite de lots bruts (df, source) et produit les lots
+        nettoyés DANS L'ORDRE des lots reçus (même dataset qu'en séquentiel).
+
+        workers > 1 : les lots sont répartis sur un pool de processus, chacun
+        avec son propre DataCleaner (et sa connexion au cache des titres) ;
+        au plus 2 lots par processus sont en cours, la mémoire reste bornée.
+        Les compteurs et temps des processus sont cumulés dans self.report.
+        Le sentiment et les clusters (modèles chargés une seule fois) sont
+        calculés dans le processus principal, à la réception de chaque lot.
+        """
+        if not workers or workers <= 1:
+            for df, source in shards:
+                yield self.clean_batch(df, source)
+            return
+
+        cache = self.classifier.cache
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.cache_path,)) as executor:
+            in_flight = deque()
+            for df, source in shards:
+                in_flight.append(executor.submit(_clean_shard, df, source))
+                if len(in_flight) >= 2 * workers:
+                    yield self._collect(in_flight.popleft())
+            while in_flight:
+                yield self._collect(in_flight.popleft())
+        if cache is not None:
+            # Titres classés (et mis en cache) par les processus
+            cache.reload()
+
+    def _collect(self, future):
+        cleaned, report, (hits, misses) = future.result()
+        self._merge_report(report)
+        cache = self.classifier.cache
+        if cache is not None:
+            cache.hits += hits
+            cache.misses += misses
+        return self.add_clusters(self.add_sentiment(cleaned))
+
+    def print_report(self):
+        raw = self.report['raw_rows']
+        print(f"📊 Lignes brutes -> Amazon: {raw['Amazon']}, Jumia: {raw['Jumia']}")
+        print(f"🗑️ {self.report['without_price']} produits sans prix supprimés.")
+
+        # Répartition AVANT filtrage
+        print(f"\n📊 Répartition par catégorie AVANT filtrage :")
+        print(pd.Series(self.report['categories'], name='count').sort_values(ascending=False))
+        top_keywords = ', '.join(f"{kw} ({n})" for kw, n in self.report['accessory_keywords'].most_common(10))
+        print(f"🔎 Mots-clés accessoires les plus fréquents : {top_keywords or '-'}")
+        print(f"🎁 {self.report['smartphone_bonus']} accessoires dont le titre commence par un smartphone (bonus offert ?)")
+        cache = self.classifier.cache
+        if cache is not None:
+            print(f"🗃️ Cache des titres : {cache.hits} déjà classés, {cache.misses} nouveaux ({len(cache)} en cache)")
+        if self.sentiment is not None and self.sentiment.cache is not None:
+            sentiment_cache = self.sentiment.cache
+            print(f"💬 Sentiment : {sentiment_cache.hits} titres déjà notés, "
+                  f"{sentiment_cache.misses} notés par le modèle")
+        if self.clusters is not None and self.report['clustered']:
+            n_clustered = self.report['clustered']
+            oov_rate = self.report['cluster_oov'] / n_clustered
+            mean_distance = self.report['cluster_distance'] / n_clustered
+            baseline = self.clusters.baseline
+            print(f"🧩 Clusters : {n_clustered} produits affectés, {oov_rate:.1%} sans mot connu "
+                  f"(réf. {baseline['oov_rate']:.1%}), distance moyenne {mean_distance:.3f} "
+                  f"(réf. {baseline['mean_distance']:.3f})")
+            if self.clusters.is_drifted(oov_rate, mean_distance):
+                print("⚠️ Dérive des titres : réentraîner le modèle (python src/analysis/model.py --refit)")
+        print(f"💸 {self.report['below_threshold']} produits retirés (prix < {PRICE_THRESHOLD}€).")
+        timings = self.report['timings']
+        if timings:
+            # En parallèle, les étapes de nettoyage sont cumulées sur tous les processus
+            print("⏱️ Temps par étape : " + ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+
+    def record_history(self, df_final, verbose=True):
+        """
+        Verse les produits nettoyés dans l'historique des prix (seuls les
+        changements sont stockés) ; retourne le nombre de changements.
+        """
+        if self.history is None:
+            return 0
+        n_changes = self.history.append(df_final)
+        if verbose:
+            print(f"📈 Historique des prix : {n_changes} changement(s) enregistré(s) sur {len(df_final)} produits")
+        return n_changes
+
+    def print_summary(self, writer):
+        """Résumé du dataset publié (compteurs du ProcessedWriter : rien n'est rechargé)"""
+        print("\n" + "="*60)
+        print(f"✅ SUCCÈS ! Dataset fusionné sauvegardé :")
+        print(f"📁 {writer.path}")
+        print(f"📊 Total produits (SMARTPHONES UNIQUEMENT) : {writer.rows}")
+        print(f"   - Amazon : {writer.by_source['Amazon']}")
+        print(f"   - Jumia  : {writer.by_source['Jumia']}")
+        print(f"🏷️ Marques uniques : {len(writer.brands)}")
+        print(f"📱 Liste des marques : {sorted(writer.brands)}")
+        print("="*60)
+
+        # Échantillon de validation
+        print("\n📋 Échantillon des produits conservés :")
+        print(writer.sample[['titre', 'brand', 'category', 'prix']])
+
+    def _read_chunks(self, path, chunksize=None):
+        """Lecture d'un fichier brut, d'un bloc (chunksize=None) ou par chunks"""
+        if chunksize is None:
+            yield pd.read_csv(path, dtype=RAW_DTYPES)
+        else:
+            yield from pd.read_csv(path, dtype=RAW_DTYPES, chunksize=chunksize)
+
+    def run(self, chunksize=None, workers=None):
+        """
+        Nettoyage "hors-ligne" des derniers fichiers bruts de data/raw
+        (pour intégrer tout l'historique au fil de l'eau : run_incremental).
+        Pour enchaîner scraping et nettoyage sans passer par ces fichiers,
+        voir src/pipeline.py.
+
+        chunksize : nombre de lignes brutes lues à la fois. Chaque chunk est
+        standardisé, classé, filtré puis écrit avant de lire le suivant : la
+        mémoire est bornée par la taille du chunk, et le dataset produit est
+        identique à celui du mode tout-en-mémoire (chunksize=None).
+
+        workers : nombre de processus de nettoyage (cf. clean_shards). Les
+        lots (chunksize lignes, SHARD_ROWS par défaut) sont nettoyés en
+        parallèle puis écrits dans l'ordre : le dataset ne dépend pas de workers.
+        """
         # 1. Chargement
         file_amazon = self.get_latest_file("amazon")
         file_jumia = self.get_latest_file("jumia")
@@ -248,63 +413,252 @@ class DataCleaner:
             print("❌ Impossible de fusionner : il manque un des fichiers sources.")
             return
 
-        df_amazon = pd.read_csv(file_amazon)
-        df_jumia = pd.read_csv(file_jumia)
+        # 2. Standardisation + Extraction Marques + Filtrage, lot par lot
+        started = time.perf_counter()
+        self.reset_report()
+        if workers and workers > 1 and chunksize is None:
+            chunksize = SHARD_ROWS
+        shards = ((chunk, source)
+                  for file, source in ((file_amazon, 'Amazon'), (file_jumia, 'Jumia'))
+                  for chunk in self._timed(self._read_chunks(file, chunksize), 'lecture'))
+        writer = ProcessedWriter(PROCESSED_DIR / "products_cleaned.csv")
+        timings = self.report['timings']
+        n_changes = 0
+        for cleaned in self.clean_shards(shards, workers):
+            start = time.perf_counter()
+            writer.write(cleaned)
+            timings['écriture'] += time.perf_counter() - start
+            start = time.perf_counter()
+            n_changes += self.record_history(cleaned, verbose=False)
+            timings['historique'] += time.perf_counter() - start
 
-        print(f"📊 Lignes brutes -> Amazon: {len(df_amazon)}, Jumia: {len(df_jumia)}")
+        # 3. Publication atomique (CSV + copie Parquet typée, lue par l'application)
+        start = time.perf_counter()
+        output_file = writer.close()
+        timings['écriture'] += time.perf_counter() - start
+        self.print_report()
+        print(f"⏱️ Durée totale : {time.perf_counter() - started:.2f}s ({workers or 1} processus)")
+        if self.history is not None:
+            print(f"📈 Historique des prix : {n_changes} changement(s) enregistré(s) sur {writer.rows} produits")
+        self.print_summary(writer)
+        return output_file
 
-        # 2. Standardisation + Extraction Marques
-        df_amazon_clean = self.standardize_amazon(df_amazon)
-        df_jumia_clean = self.standardize_jumia(df_jumia)
+    def _read_raw(self, path):
+        """Lecture d'un fichier brut (None si illisible : il sera retenté au prochain run)"""
+        try:
+            return pd.read_csv(path, dtype=RAW_DTYPES)
+        except Exception as e:
+            print(f"❌ Lecture impossible de {Path(path).name} : {str(e)}")
+            return None
 
-        # 3. Fusion
-        df_final = pd.concat([df_amazon_clean, df_jumia_clean], ignore_index=True)
+    def run_incremental(self, output_file=PROCESSED_DIR / "products_cleaned.csv", manifest_path=RAW_MANIFEST,
+                        max_workers=4, workers=None):
+        """
+        Nettoyage incrémental de TOUS les fichiers bruts de data/raw : seuls les
+        fichiers absents du manifeste (ou modifiés depuis) sont lus, en parallèle,
+        nettoyés puis fusionnés dans le dataset existant (upsert sur
+        id_produit + source, la version la plus récente l'emporte).
+        workers > 1 : un fichier par processus de nettoyage (cf. clean_shards).
+        """
+        manifest = RawManifest(manifest_path)
 
-        # 4. Nettoyage global
-                # 4. Nettoyage global
-        initial_len = len(df_final)
-        df_final = df_final.dropna(subset=['prix'])
-        print(f"🗑️ {initial_len - len(df_final)} produits sans prix supprimés.")
+        # 1. Fichiers nouveaux ou modifiés, du plus ancien au plus récent
+        files = []
+        for path in sorted(RAW_DIR.glob("*.csv"), key=os.path.getmtime):
+            source = RAW_SOURCES.get(path.name.split('_')[0].lower())
+            if source is None:
+                print(f"⚠️ Source inconnue, fichier ignoré : {path.name}")
+                continue
+            files.append((path, source))
+        pending = []
+        for path, source in files:
+            fingerprint = manifest.pending(path)
+            if fingerprint is not None:
+                pending.append((path, source, fingerprint))
+        print(f"📥 {len(pending)} nouveau(x) fichier(s) brut(s) sur {len(files)}")
+        if not pending:
+            manifest.save()
+            print("✅ Dataset nettoyé déjà à jour.")
+            return Path(output_file)
 
-        # Afficher la répartition AVANT filtrage
-        print(f"\n📊 Répartition par catégorie AVANT filtrage :")
-        print(df_final['category'].value_counts())
-        
-        # Filtrage strict : uniquement smartphones
-        df_final = df_final[df_final['category'] == 'smartphone']
-        
-        # === NOUVEAU FILTRE DE SÉCURITÉ PRIX ===
-        # On supprime les produits < 40€ qui sont probablement des accessoires mal classés
-        price_threshold = 40.0 
-        count_before_price_filter = len(df_final)
-        df_final = df_final[df_final['prix'] >= price_threshold]
-        print(f"💸 {count_before_price_filter - len(df_final)} produits retirés (prix < {price_threshold}€).")
-        # ========================================
-
-        df_final = df_final[df_final['brand'] != 'Unknown'].reset_index(drop=True)
-
-        # Remplir les NaN
-        df_final['note'] = df_final['note'].fillna(-1)
-        df_final['nb_avis'] = df_final['nb_avis'].fillna(0)
-
-        # 5. Sauvegarde
-        output_file = PROCESSED_DIR / "products_cleaned.csv"
-        df_final.to_csv(output_file, index=False, encoding='utf-8')
-        
-        print("\n" + "="*60)
-        print(f"✅ SUCCÈS ! Dataset fusionné sauvegardé :")
-        print(f"📁 {output_file}")
-        print(f"📊 Total produits (SMARTPHONES UNIQUEMENT) : {len(df_final)}")
-        print(f"   - Amazon : {len(df_final[df_final['source'] == 'Amazon'])}")
-        print(f"   - Jumia  : {len(df_final[df_final['source'] == 'Jumia'])}")
-        print(f"🏷️ Marques uniques : {df_final['brand'].nunique()}")
-        print(f"📱 Liste des marques : {sorted(df_final['brand'].unique())}")
-        print("="*60)
+        # 2. Lecture parallèle, puis nettoyage dans l'ordre chronologique
+        self.reset_report()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            raws = list(executor.map(self._read_raw, [path for path, _, _ in pending]))
+        self.report['timings']['lecture'] += time.perf_counter() - start
 
-        # Échantillon de validation
-        print("\n📋 Échantillon des produits conservés :")
-        print(df_final[['titre', 'brand', 'category', 'prix']].head(10))
+        readable = [(item, df) for item, df in zip(pending, raws) if df is not None]
+        ingested = [(path, fingerprint, len(df)) for (path, _, fingerprint), df in readable]
+        cleaned = list(self.clean_shards(((df, source) for (_, source, _), df in readable), workers))
+        self.print_report()
+
+        # 3. Upsert dans le dataset existant
+        parts = []
+        if Path(output_file).exists():
+            parts.append(pd.read_csv(output_file, dtype={'id_produit': str}))
+        df_final = pd.concat(parts + cleaned, ignore_index=True).reindex(columns=OUTPUT_COLUMNS)
+        # Les lignes sans identifiant ne peuvent pas être rapprochées : elles sont toutes gardées
+        replaced = df_final.duplicated(subset=['id_produit', 'source'], keep='last') & df_final['id_produit'].notna()
+        df_final = df_final[~replaced].reset_index(drop=True)
+        # Produits d'un dataset antérieur aux étapes de sentiment / clusters
+        df_final = self.add_sentiment(df_final, missing_only=True)
+        df_final = self.add_clusters(df_final, missing_only=True)
+
+        # 4. Publication atomique du dataset, PUIS mise à jour du manifeste
+        # (un run interrompu ré-intègre simplement les mêmes fichiers au suivant)
+        writer = ProcessedWriter(output_file)
+        writer.write(df_final)
+        output_file = writer.close()
+        for path, fingerprint, rows in ingested:
+            manifest.mark(path, fingerprint, rows)
+        manifest.save()
+        # Historique : les observations des nouveaux fichiers, pas le dataset fusionné
+        if cleaned:
+            self.record_history(pd.concat(cleaned, ignore_index=True))
+
+        print(f"🔁 {sum(len(df) for df in cleaned)} produits nettoyés intégrés ({int(replaced.sum())} mises à jour)")
+        self.print_summary(writer)
+        return output_file
+
+
+# --- NETTOYAGE PARALLÈLE : un DataCleaner par processus du pool ---
+_worker_cleaner = None
+
+
+def _init_worker(cache_path):
+    # Pas d'historique, de sentiment ni de clusters dans les processus : ils sont traités par le processus principal
+    global _worker_cleaner
+    _worker_cleaner = DataCleaner(cache_path=cache_path, history_dir=None)
+
+
+def _clean_shard(df, source):
+    """Nettoie un lot ; retourne le lot nettoyé, les compteurs du lot et les stats du cache"""
+    cleaner = _worker_cleaner
+    cleaner.reset_report()
+    cache = cleaner.classifier.cache
+    if cache is not None:
+        cache.reset_stats()
+    cleaned = cleaner.clean_batch(df, source)
+    stats = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    return cleaned, cleaner.report, stats
+
+
+class RawManifest:
+    """
+    Manifeste des fichiers bruts déjà intégrés : nom -> taille, date de
+    modification, empreinte SHA-1 et nombre de lignes. Un fichier dont la
+    taille et la date n'ont pas bougé n'est pas relu ; sinon son empreinte
+    tranche (un simple "touch" ne provoque pas de ré-intégration).
+    """
+
+    def __init__(self, path=RAW_MANIFEST):
+        self.path = Path(path)
+        self.entries = json.loads(self.path.read_text(encoding='utf-8')) if self.path.exists() else {}
+
+    @staticmethod
+    def _sha1(path):
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def pending(self, path):
+        """Empreinte du fichier s'il est à intégrer, None s'il l'est déjà"""
+        stat = Path(path).stat()
+        fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        entry = self.entries.get(Path(path).name)
+        if entry and all(entry[k] == v for k, v in fingerprint.items()):
+            return None
+        fingerprint['sha1'] = self._sha1(path)
+        if entry and entry['sha1'] == fingerprint['sha1']:
+            entry.update(fingerprint)           # contenu identique : on met juste à jour la date
+            return None
+        return fingerprint
+
+    def mark(self, path, fingerprint, rows):
+        self.entries[Path(path).name] = {**fingerprint, 'rows': rows,
+                                         'ingested_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+    def save(self):
+        partial_path = self.path.with_suffix('.partial.json')
+        partial_path.write_text(json.dumps(self.entries, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(partial_path, self.path)
+
+
+class ProcessedWriter:
+    """
+    Écriture incrémentale du dataset nettoyé : chaque batch est ajouté à un
+    fichier partiel, publié d'un coup (remplacement atomique) à la fermeture.
+    Un run interrompu n'écrase donc pas le dernier dataset complet.
+    La copie Parquet typée (même nom, extension .parquet) est écrite au fil
+    des batchs et publiée avec le CSV.
+    """
+
+    # Nombre de produits gardés pour l'échantillon du résumé
+    SAMPLE_SIZE = 10
+
+    def __init__(self, path=PROCESSED_DIR / "products_cleaned.csv"):
+        self.path = Path(path)
+        self.partial_path = self.path.with_suffix('.partial.csv')
+        self.partial_path.unlink(missing_ok=True)
+        self.parquet = ParquetDatasetWriter(self.path.with_suffix('.parquet'))
+        self.rows = 0
+        self.by_source = Counter()
+        self.brands = set()
+        self.sample = pd.DataFrame(columns=OUTPUT_COLUMNS)     # premiers produits écrits
+
+    def write(self, df):
+        """Ajoute un batch nettoyé (colonnes OUTPUT_COLUMNS)"""
+        if df.empty:
+            return
+        df = df.reindex(columns=OUTPUT_COLUMNS)
+        df.to_csv(self.partial_path, mode='a', header=self.rows == 0, index=False, encoding='utf-8')
+        self.parquet.write(df)
+        if self.sample.empty:
+            self.sample = df.head(self.SAMPLE_SIZE).reset_index(drop=True)
+        elif len(self.sample) < self.SAMPLE_SIZE:
+            self.sample = pd.concat([self.sample, df.head(self.SAMPLE_SIZE - len(self.sample))], ignore_index=True)
+        self.rows += len(df)
+        self.by_source.update(df['source'].value_counts().to_dict())
+        self.brands.update(df['brand'].dropna().unique())
+
+    def close(self):
+        """Publie le dataset (même vide, pour ne pas laisser un ancien fichier passer pour le nouveau)"""
+        if self.rows == 0:
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(self.partial_path, index=False, encoding='utf-8')
+        os.replace(self.partial_path, self.path)
+        self.parquet.close()
+        return self.path
+
+def _int_option(name):
+    """Valeur de l'option `name N` de la ligne de commande (None si absente)"""
+    return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else None
 
 if __name__ == "__main__":
-    cleaner = DataCleaner()
-    cleaner.run()
\ No newline at end of file
+    # python cleaner.py --sentiment : calcule aussi sentiment_score (src/analysis/sentiment.py)
+    # python cleaner.py --sentiment int8 : modèle quantifié (CPU sans GPU)
+    # python cleaner.py --clusters : affecte aussi `cluster` (modèle de src/analysis/model.py)
+    sys.path.insert(0, str(current_path.parent.parent / "analysis"))
+    scorer = None
+    if '--sentiment' in sys.argv:
+        from sentiment import SentimentScorer, BACKENDS
+        backend = sys.argv[sys.argv.index('--sentiment') + 1:][:1]
+        scorer = SentimentScorer(backend=backend[0] if backend and backend[0] in BACKENDS else 'fp32')
+    clusters = None
+    if '--clusters' in sys.argv:
+        from model import TitleClusterModel, CLUSTER_MODEL_PATH
+        if CLUSTER_MODEL_PATH.exists():
+            clusters = TitleClusterModel.load(CLUSTER_MODEL_PATH)
+        else:
+            print("⚠️ Aucun modèle de clusters : l'entraîner avec python src/analysis/model.py")
+    cleaner = DataCleaner(sentiment=scorer, clusters=clusters)
+    # python cleaner.py --incremental : intègre tous les fichiers bruts pas encore traités
+    # python cleaner.py --chunksize 100000 : nettoyage par chunks (mémoire bornée)
+    # python cleaner.py --workers 16 : nettoyage réparti sur 16 processus
+    workers = _int_option('--workers')
+    if '--incremental' in sys.argv:
+        cleaner.run_incremental(workers=workers)
+    else:
+        cleaner.run(chunksize=_int_option('--chunksize'), workers=workers)
@@ -0,0 +1,76 @@
+"""
+Conversion des prix en euros à partir d'une table de taux datée.
+
+La table (exchange_rates.csv : date, devise, unites_par_eur = nombre
+d'unités de la devise pour 1 €, en vigueur à partir de cette date) est lue
+une seule fois puis gardée en cache ; chaque ligne est convertie au taux en
+vigueur à sa date de scraping, pour tout l'historique en un seul merge_asof.
+
+⚠️ La table livrée est un PLACEHOLDER : une seule ligne (MAD à 11 depuis
+2000-01-01, l'ancien taux codé en dur), donc un taux unique pour toutes les
+dates. Pour une conversion réellement datée, y ajouter les taux de référence
+(ex. cours EUR/MAD de Bank Al-Maghrib), une ligne par date de changement ;
+le choix du taux en vigueur est couvert par tests/test_currency.py.
+
+La conversion est idempotente : le montant et la devise d'origine sont
+conservés (prix_origine, devise_origine) et le prix en euros est toujours
+recalculé à partir d'eux, jamais à partir d'un prix déjà converti.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RATES_FILE = Path(__file__).resolve().parent / "exchange_rates.csv"
+BASE_CURRENCY = 'EUR'
+
+
+@lru_cache(maxsize=None)
+def _load_rates(path: str, mtime_ns: int) -> pd.DataFrame:
+    rates = pd.read_csv(path, parse_dates=['date'])
+    rates['devise'] = rates['devise'].str.upper()
+    return rates.sort_values('date').reset_index(drop=True)
+
+
+def load_rates(path=RATES_FILE) -> pd.DataFrame:
+    """Table des taux (mise en cache ; relue uniquement si le fichier a été modifié)"""
+    path = Path(path)
+    return _load_rates(str(path), path.stat().st_mtime_ns)
+
+
+def to_eur(df: pd.DataFrame, currency: str, rates_path=RATES_FILE) -> pd.DataFrame:
+    """
+    Convertit la colonne 'prix' en euros au taux de la date de scraping ('date').
+    `currency` est la devise des prix bruts, utilisée si devise_origine est absente.
+    Ajoute / conserve prix_origine et devise_origine.
+    """
+    df = df.copy()
+    if 'prix_origine' not in df.columns:
+        df['prix_origine'] = df['prix']
+    df['prix_origine'] = pd.to_numeric(df['prix_origine'], errors='coerce').astype('float64')
+    if 'devise_origine' not in df.columns:
+        df['devise_origine'] = currency
+    df['devise_origine'] = df['devise_origine'].fillna(currency).str.upper()
+
+    dates = pd.to_datetime(df['date'], format='ISO8601', errors='coerce')
+    # Sans date exploitable : taux le plus récent
+    left = pd.DataFrame({'date': dates.fillna(pd.Timestamp.max.floor('D')).astype('datetime64[ns]'),
+                         'devise': df['devise_origine'].to_numpy(), 'ligne': np.arange(len(df))})
+    left = left.sort_values('date', kind='stable')
+
+    rates = load_rates(rates_path)
+    rates = rates.assign(date=rates['date'].astype('datetime64[ns]'))
+    merged = pd.merge_asof(left, rates, on='date', by='devise', direction='backward')
+    # Date antérieure au premier taux connu : premier taux de la devise
+    first_rate = rates.groupby('devise')['unites_par_eur'].first()
+    taux = merged['unites_par_eur'].fillna(merged['devise'].map(first_rate))
+    taux = taux.where(merged['devise'] != BASE_CURRENCY, 1.0)
+    taux = pd.Series(taux.to_numpy(), index=merged['ligne'].to_numpy()).sort_index().to_numpy()
+
+    missing = sorted(set(df['devise_origine'][np.isnan(taux)]))
+    if missing:
+        print(f"⚠️ Aucun taux de change pour : {', '.join(missing)} (prix laissés vides)")
+    df['prix'] = df['prix_origine'] / taux
+    return df
@@ -0,0 +1,192 @@
+"""
+Historique des prix (append-only, Parquet) à travers les runs de scraping.
+
+products_cleaned.csv ne garde qu'une photo ; ici chaque observation
+(source, id_produit, date de scraping, prix) est versée dans un historique
+encodé par points de changement : une ligne n'est écrite que lorsque le prix
+d'un produit CHANGE (ou à sa première apparition). Un produit revu au même
+prix ne coûte qu'une mise à jour de sa date de dernière observation dans
+l'état courant (latest.parquet, une ligne par produit).
+
+    price_history/
+        changes/part-<horodatage>.parquet   # points de changement, triés par (source, id_produit)
+        latest.parquet                      # dernier prix, première / dernière observation
+
+Reconstruction : le prix d'un produit est constant d'un point de changement
+au suivant, et au-delà du dernier jusqu'à sa dernière observation (un
+produit absent d'un run garde son dernier prix connu).
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+KEY = ['source', 'id_produit']
+
+CHANGES_SCHEMA = pa.schema([
+    ('source', pa.dictionary(pa.int32(), pa.string())),
+    ('id_produit', pa.string()),
+    ('date', pa.timestamp('s')),
+    ('prix', pa.float32()),
+    ('brand', pa.dictionary(pa.int32(), pa.string())),
+])
+
+
+class PriceHistory:
+    """Historique des prix encodé par points de changement, avec requêtes de trajectoire et de médiane"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.changes_dir = self.root / "changes"
+        self.latest_path = self.root / "latest.parquet"
+        self.changes_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- ÉCRITURE ---
+
+    def latest(self) -> pd.DataFrame:
+        """État courant : une ligne par produit (dernier prix, first_seen, last_seen, brand)"""
+        if not self.latest_path.exists():
+            return pd.DataFrame({'source': pd.Series(dtype=str), 'id_produit': pd.Series(dtype=str),
+                                 'prix': pd.Series(dtype='float32'), 'brand': pd.Series(dtype=str),
+                                 'first_seen': pd.Series(dtype='datetime64[s]'),
+                                 'last_seen': pd.Series(dtype='datetime64[s]')})
+        df = pd.read_parquet(self.latest_path)
+        return df.astype({'source': str, 'brand': str})
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Verse un lot de produits nettoyés (colonnes source, id_produit, date,
+        prix, brand) dans l'historique ; retourne le nombre de points de
+        changement écrits. Les observations déjà couvertes par l'état courant
+        (date <= last_seen) sont ignorées : re-verser un fichier ne duplique rien.
+        """
+        obs = df.dropna(subset=['id_produit', 'prix'])[KEY + ['date', 'prix', 'brand']].copy()
+        if obs.empty:
+            return 0
+        obs['id_produit'] = obs['id_produit'].astype(str)
+        obs['source'] = obs['source'].astype(str)
+        obs['brand'] = obs['brand'].astype(str)
+        # date_scraping des scrapers : '%Y-%m-%d %H:%M:%S' (ISO 8601)
+        obs['date'] = pd.to_datetime(obs['date'], format='ISO8601', errors='coerce')
+        obs['date'] = obs['date'].fillna(pd.Timestamp.now()).astype('datetime64[s]')
+        # Comparaison à la précision stockée (float32) : pas de faux changements d'arrondi
+        obs['prix'] = obs['prix'].astype('float32')
+
+        latest = self.latest()
+        state = latest[KEY + ['prix', 'last_seen']].rename(columns={'prix': 'prix_precedent'})
+        obs = obs.merge(state, on=KEY, how='left')
+        obs = obs[obs['last_seen'].isna() | (obs['date'] > obs['last_seen'])]
+        if obs.empty:
+            return 0
+
+        # Prix précédent de chaque observation : celle d'avant dans le lot, sinon l'état courant
+        obs = obs.sort_values(KEY + ['date'], kind='stable').reset_index(drop=True)
+        previous = obs.groupby(KEY, sort=False)['prix'].shift()
+        previous = previous.fillna(obs['prix_precedent'])
+        changes = obs[previous.isna() | (obs['prix'] != previous)][KEY + ['date', 'prix', 'brand']]
+
+        if not changes.empty:
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            table = pa.Table.from_pandas(changes.astype({'source': 'category', 'brand': 'category'}),
+                                         schema=CHANGES_SCHEMA, preserve_index=False)
+            partial_path = self.changes_dir / f".part-{stamp}.parquet"
+            pq.write_table(table, partial_path)
+            os.replace(partial_path, self.changes_dir / f"part-{stamp}.parquet")
+
+        self._update_latest(latest, obs)
+        return len(changes)
+
+    def _update_latest(self, latest: pd.DataFrame, obs: pd.DataFrame):
+        last = obs.groupby(KEY, sort=False).agg(prix=('prix', 'last'), brand=('brand', 'last'),
+                                                first_seen=('date', 'first'), last_seen=('date', 'last'))
+        latest = latest.set_index(KEY)
+        last['first_seen'] = latest['first_seen'].reindex(last.index).fillna(last['first_seen'])
+        latest = pd.concat([latest[~latest.index.isin(last.index)], last]).reset_index()
+        latest = latest.sort_values(KEY).astype({'source': 'category', 'brand': 'category',
+                                                 'first_seen': 'datetime64[s]', 'last_seen': 'datetime64[s]'})
+        partial_path = self.latest_path.with_suffix('.partial.parquet')
+        latest.to_parquet(partial_path, index=False)
+        os.replace(partial_path, self.latest_path)
+
+    def compact(self):
+        """Fusionne les fichiers de changements en un seul, trié (maintenance ponctuelle)"""
+        parts = sorted(self.changes_dir.glob("part-*.parquet"))
+        if len(parts) < 2:
+            return
+        changes = self.changes().sort_values(KEY + ['date'], kind='stable')
+        table = pa.Table.from_pandas(changes, schema=CHANGES_SCHEMA, preserve_index=False)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        partial_path = self.changes_dir / f".part-{stamp}.parquet"
+        pq.write_table(table, partial_path)
+        os.replace(partial_path, self.changes_dir / f"part-{stamp}.parquet")
+        for part in parts:
+            part.unlink()
+
+    # --- LECTURE ---
+
+    def changes(self, filter=None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Points de changement (filtre pyarrow évalué à la lecture, fichier par fichier)"""
+        parts = sorted(self.changes_dir.glob("part-*.parquet"))
+        if not parts:
+            return CHANGES_SCHEMA.empty_table().to_pandas()
+        table = ds.dataset(parts, schema=CHANGES_SCHEMA).to_table(columns=columns, filter=filter)
+        return table.to_pandas()
+
+    def trajectory(self, source: str, id_produit: str) -> pd.DataFrame:
+        """
+        Trajectoire de prix d'un produit : un point par changement, plus un
+        point final à la dernière observation (prix inchangé depuis le dernier changement).
+        """
+        points = self.changes((ds.field('source') == source) & (ds.field('id_produit') == str(id_produit)),
+                              columns=['date', 'prix']).sort_values('date').reset_index(drop=True)
+        latest = self.latest()
+        last = latest[(latest['source'] == source) & (latest['id_produit'] == str(id_produit))]
+        if not points.empty and not last.empty and last['last_seen'].iloc[0] > points['date'].iloc[-1]:
+            points.loc[len(points)] = [last['last_seen'].iloc[0], points['prix'].iloc[-1]]
+        return points
+
+    def brand_median(self, freq: str = 'D', brands: Optional[Sequence[str]] = None,
+                     source: Optional[str] = None) -> pd.DataFrame:
+        """
+        Prix médian par marque et par période (freq pandas : 'D', 'W', 'M'...).
+        Chaque produit compte dans toutes les périodes entre sa première et sa
+        dernière observation, au prix en vigueur à la fin de la période.
+        """
+        filter = None
+        if brands:
+            filter = ds.field('brand').isin(list(brands))
+        if source:
+            by_source = ds.field('source') == source
+            filter = by_source if filter is None else filter & by_source
+        points = self.changes(filter)
+        if points.empty:
+            return pd.DataFrame()
+        points = points.astype({'source': str, 'brand': str})
+        points = points.merge(self.latest()[KEY + ['last_seen']], on=KEY, how='left')
+        points = points.sort_values(KEY + ['date'], kind='stable').reset_index(drop=True)
+
+        # Intervalle de validité de chaque point, en numéros de période [début, fin[
+        ordinal = lambda dates: pd.PeriodIndex(dates, freq=freq).asi8
+        next_change = points.groupby(KEY, sort=False)['date'].shift(-1)
+        start_idx = ordinal(points['date'])
+        # Un point remplacé dans la même période ne compte pas (le dernier prix de la période l'emporte)
+        end_idx = np.where(next_change.notna(), ordinal(next_change.fillna(points['date'])),
+                           ordinal(points['last_seen'].fillna(points['date'])) + 1)
+        lengths = np.clip(end_idx - start_idx, 0, None)
+
+        # Déroulage des intervalles : une ligne par (point, période couverte)
+        rows = np.repeat(np.arange(len(points)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        panel = pd.DataFrame({'periode': start_idx[rows] + offsets,
+                              'brand': points['brand'].to_numpy()[rows],
+                              'prix': points['prix'].to_numpy()[rows]})
+        median = panel.groupby(['periode', 'brand'])['prix'].median().unstack('brand')
+        median.index = pd.PeriodIndex.from_ordinals(median.index, freq=freq).rename('periode')
+        return median
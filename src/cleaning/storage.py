@@ -0,0 +1,167 @@
+"""
+Stockage colonnaire (Parquet) du dataset nettoyé.
+
+Le CSV products_cleaned.csv reste écrit pour les notebooks, mais l'application
+lit products_cleaned.parquet : schéma explicite (catégories dictionnaire pour
+brand / category / source, float32 pour les prix et notes, int32 pour le
+nombre d'avis), partitionné par source (et optionnellement par jour de
+scraping) pour que le chargement ne lise que les colonnes et les partitions
+utiles (cf. app/utils/load_data.py).
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+PARQUET_SCHEMA = pa.schema([
+    ('id_produit', pa.string()),
+    ('titre', pa.string()),
+    ('prix', pa.float32()),
+    ('note', pa.float32()),
+    ('nb_avis', pa.int32()),
+    ('lien', pa.string()),
+    ('source', CATEGORY),
+    ('date', pa.string()),
+    ('brand', CATEGORY),
+    ('category', CATEGORY),
+    ('prix_origine', pa.float32()),
+    ('devise_origine', CATEGORY),
+    ('sentiment_score', pa.float32()),
+    ('cluster', pa.int32()),
+])
+
+# Partitionnement par défaut ; ('source', 'jour') pour découper aussi par jour de scraping
+PARTITION_COLS = ('source',)
+
+
+def to_arrow(df: pd.DataFrame, partition_cols: Sequence[str] = ()) -> pa.Table:
+    """Convertit le dataset nettoyé (colonnes OUTPUT_COLUMNS) en table Arrow typée"""
+    df = df.reindex(columns=PARQUET_SCHEMA.names)
+    df = df.astype({'id_produit': 'string', 'titre': 'string', 'lien': 'string', 'date': 'string',
+                    'source': 'category', 'brand': 'category', 'category': 'category',
+                    'devise_origine': 'category'})
+    df['nb_avis'] = pd.to_numeric(df['nb_avis'], errors='coerce').fillna(0).astype('int32')
+    # Cluster absent (étape désactivée) : null, pas 0
+    df['cluster'] = pd.to_numeric(df['cluster'], errors='coerce').astype('Int32')
+    numeric = ['prix', 'note', 'prix_origine', 'sentiment_score']
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors='coerce').astype('float32')
+    table = pa.Table.from_pandas(df, schema=PARQUET_SCHEMA, preserve_index=False)
+    if 'jour' in partition_cols:
+        # Jour de scraping (AAAA-MM-JJ) déduit de la colonne date
+        table = table.append_column('jour', pa.array(df['date'].str.slice(0, 10).fillna('inconnu'), pa.string()))
+    return table
+
+
+# Lignes accumulées avant d'écrire un fichier (évite une multitude de petits fichiers en streaming)
+BUFFER_ROWS = 100_000
+
+
+class ParquetDatasetWriter:
+    """
+    Écriture incrémentale du dataset Parquet (un répertoire de partitions
+    Hive, ou un seul fichier si partition_cols est vide). Les lots sont
+    écrits à côté (.partial), publiés à la fermeture : un lecteur ne voit
+    jamais un dataset à moitié écrit. Un fichier est remplacé d'un bloc ; un
+    répertoire ne pouvant pas l'être, l'ancien est d'abord renommé (.old) et
+    reste lisible jusqu'à ce que le nouveau soit en place (cf. published_path).
+    La mémoire est bornée par buffer_rows, pas par la taille du dataset.
+    """
+
+    def __init__(self, path: Path, partition_cols: Sequence[str] = PARTITION_COLS, buffer_rows: int = BUFFER_ROWS):
+        self.path = Path(path)
+        self.partition_cols = list(partition_cols)
+        self.buffer_rows = buffer_rows
+        self.partial_path = self.path.with_name(self.path.name + '.partial')
+        self.old_path = self.path.with_name(self.path.name + '.old')
+        if self.old_path.exists() and not self.path.exists():
+            # Échange interrompu entre les deux renommages : l'ancien dataset est remis en place
+            os.replace(self.old_path, self.path)
+        for leftover in (self.partial_path, self.old_path):
+            _remove(leftover)
+        self.rows = 0
+        self._buffer = []
+        self._buffered = 0
+        self._flushes = 0
+        self._file_writer = None
+
+    def write(self, df: pd.DataFrame):
+        """Ajoute un lot (colonnes OUTPUT_COLUMNS)"""
+        if df.empty:
+            return
+        self._buffer.append(df)
+        self._buffered += len(df)
+        if self._buffered >= self.buffer_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        table = to_arrow(pd.concat(self._buffer, ignore_index=True), self.partition_cols)
+        if self.partition_cols:
+            pq.write_to_dataset(table, self.partial_path, partition_cols=self.partition_cols,
+                                basename_template=f"part-{self._flushes}-{{i}}.parquet")
+        else:
+            if self._file_writer is None:
+                self._file_writer = pq.ParquetWriter(self.partial_path, table.schema)
+            self._file_writer.write_table(table)
+        self.rows += table.num_rows
+        self._flushes += 1
+        self._buffer, self._buffered = [], 0
+
+    def close(self) -> Path:
+        """Publie le dataset (même vide, pour garder le schéma lisible)"""
+        self._flush()
+        if self._file_writer is not None:
+            self._file_writer.close()
+        elif self.rows == 0:
+            empty = to_arrow(pd.DataFrame(columns=PARQUET_SCHEMA.names), self.partition_cols)
+            if self.partition_cols:
+                # Dataset vide : un fichier sans partition
+                self.partial_path.mkdir(parents=True)
+                pq.write_table(empty, self.partial_path / 'part-0.parquet')
+            else:
+                pq.write_table(empty, self.partial_path)
+
+        if self.partial_path.is_dir() or self.path.is_dir():
+            # Répertoire : ancien mis de côté (toujours lisible, cf. published_path) puis remplacé
+            if self.path.exists():
+                os.replace(self.path, self.old_path)
+            os.replace(self.partial_path, self.path)
+            _remove(self.old_path)
+        else:
+            os.replace(self.partial_path, self.path)
+        return self.path
+
+
+def published_path(path: Path) -> Optional[Path]:
+    """
+    Dataset publié à lire : path, ou l'ancien (path.old) pendant l'échange des
+    répertoires à la fermeture d'un ParquetDatasetWriter ; None s'il n'y en a pas.
+    """
+    path = Path(path)
+    # path revérifié en dernier : le nouveau peut avoir été mis en place (et .old supprimé) entre-temps
+    for candidate in (path, path.with_name(path.name + '.old'), path):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _remove(path: Path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def write_parquet(df: pd.DataFrame, path: Path, partition_cols: Sequence[str] = PARTITION_COLS) -> Path:
+    """Écrit d'un bloc le dataset Parquet d'un DataFrame complet"""
+    writer = ParquetDatasetWriter(path, partition_cols)
+    writer.write(df)
+    return writer.close()
@@ -0,0 +1,264 @@
+"""
+Classification vectorisée des titres produits.
+
+Une Series de titres est d'abord factorisée : chaque titre DISTINCT n'est
+analysé qu'une fois (les titres se répètent beaucoup d'un mot-clé et d'un
+jour à l'autre), puis le résultat est redistribué sur toutes les lignes en
+une seule indexation numpy, sans .apply ligne par ligne.
+
+Pour un titre, les règles ordonnées sont évaluées par recherches de
+sous-chaînes (`in`, implémenté en C) avec sortie dès la première règle
+satisfaite : sous CPython c'est plus rapide qu'une alternance regex unique
+ou qu'un automate Aho-Corasick, qui doivent relever toutes les occurrences.
+
+Pour les catégories, seule compte la PRÉSENCE d'un mot-clé (plus de 100
+mots d'accessoires) : chaque liste est compilée en une regex unique dont
+l'alternance est factorisée en arbre de préfixes (trie), ce qui évite de
+re-parcourir le titre pour chaque mot-clé comme le faisait any(...).
+
+Les résultats sont identiques aux règles ligne par ligne d'origine, recopiées
+telles quelles (listes comprises) dans tests/test_taggers.py.
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# --- RÈGLES DE MARQUE (par ordre de priorité) ---
+# (motifs, marque, motif qui annule la règle)
+BRAND_ALIASES: List[Tuple[Tuple[str, ...], str, Optional[str]]] = [
+    (('iphone', 'ipad'), 'Apple', None),
+    (('galaxy',), 'Samsung', 'watch'),            # ⚠️ Évite "Galaxy Watch"
+    (('redmi', 'pocophone', 'poco'), 'Xiaomi', None),
+    (('pixel',), 'Google', 'buds'),               # ⚠️ Évite "Pixel Buds"
+]
+BRANDS = [
+    'samsung', 'apple', 'huawei', 'xiaomi', 'oppo', 'vivo', 'realme',
+    'oneplus', 'google', 'motorola', 'nokia', 'sony', 'lg', 'asus',
+    'lenovo', 'tecno', 'infinix', 'wiko', 'honor', 'zte', 'alcatel'
+]
+UNKNOWN_BRAND = 'Unknown'
+# À incrémenter si la LOGIQUE de classification change (les listes sont hachées à part)
+CLASSIFIER_VERSION = 1
+
+# --- RÈGLES DE CATÉGORIE ---
+# --- LISTE NOIRE ULTRA RENFORCÉE (un seul mot présent -> accessoire) ---
+ACCESSORY_KEYWORDS = [
+    # Protection & Coques
+    'coque', 'housse', 'étui', 'case', 'cover', 'shell', 'bumper',
+    'protection', 'silicone', 'rigid', 'transparent', 'pochette',
+
+    # Écran & Film
+    'film', 'verre trempé', 'protecteur', 'screen protector', 
+    'tempered glass', 'hydrogel', 'pellicule',
+
+    # Chargement & Batteries (Capture "Apple Batterie MagSafe")
+    'chargeur', 'câble', 'cable', 'adaptateur', 'adapter', 
+    'power bank', 'batterie externe', 'batterie', 'wireless charger',
+    'charging', 'fast charge', 'plug', 'magsafe', 'powerbank',
+
+    # Audio (Capture "DJI Mic")
+    'écouteur', 'casque', 'headphone', 'earphone', 'earbud',
+    'airpod', 'galaxy buds', 'buds', 'pods', 'speakers', 'enceinte',
+    'microphone', 'mic', 'micro', 'cravate', 'sans fil',
+
+    # Supports & Stabilisation (Capture "Stabilisateur", "Cardan")
+    'trépied', 'tripod', 'gorillapod', 'selfie stick', 'perche',
+    'support', 'holder', 'stand', 'mount', 'grip',
+    'stabilisateur', 'cardan', 'gimbal', 'steadicam',
+
+    # Montres & Bracelets
+    'smart watch', 'smartwatch', 'montre connectée', 'watch',
+    'bracelet', 'band', 'strap', 'mi band',
+
+    # Stockage & Cartes
+    'carte mémoire', 'microsd', 'sd card', 'usb', 'clé usb',
+
+    # Divers
+    'stylet', 's pen', 'apple pencil', 'moniteur', 'kit', 'pack',
+    'sim card', 'outil', 'remplacement', 'pièce', 'stick', 'dock'
+]
+
+# --- DÉTECTION SMARTPHONE ---
+SMARTPHONE_KEYWORDS = [
+    'smartphone', 'iphone', 'android phone', 'mobile phone',
+    'galaxy s', 'galaxy a', 'galaxy z', 'galaxy note',
+    'redmi note', 'redmi a', 'poco f', 'poco x',
+    'mi 1', 'mi 2', 'mi 3', 'mi 4', 'mi 5', 'mi 6', 'mi 7', 'mi 8', 'mi 9', 'mi 10', 'mi 11', 'mi 12',
+    'pixel', 'oneplus', 'oppo find', 'vivo v',
+    'huawei p', 'huawei mate',
+    'xperia', 'nokia', 'motorola moto'
+]
+
+# Titres qui COMMENCENT par un accessoire (ce n'est PAS un smartphone)...
+ACCESSORY_START_PATTERNS = [
+    r'^(coque|étui|housse|film|protection|chargeur|câble|support|adaptateur)',
+    r'^(casque|écouteur|batterie|kit)',
+]
+# ... ou par une marque/modèle (vrai smartphone, éventuellement avec bonus)
+SMARTPHONE_START_PATTERNS = [
+    r'^(samsung|iphone|xiaomi|google|huawei|oppo|vivo|realme|oneplus)',
+    r'^(galaxy|redmi|poco|pixel)',
+    r'^smartphone\s+(samsung|apple|xiaomi)',  # "Smartphone Samsung Galaxy..."
+]
+
+
+def lower_titles(titles: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """
+    Factorise les titres : retourne (codes, titres distincts en minuscules).
+    Les titres manquants ont le code -1.
+    """
+    codes, uniques = pd.factorize(titles)
+    return codes, [str(title).lower() for title in uniques]
+
+
+def broadcast(codes: np.ndarray, values: List, missing) -> np.ndarray:
+    """Redistribue les valeurs calculées par titre distinct sur toutes les lignes (code -1 -> missing)"""
+    # Le code -1 pointe sur le dernier élément : la valeur des titres manquants
+    return np.array(list(values) + [missing], dtype=object)[codes]
+
+
+class BrandTagger:
+    """Marque d'une Series de titres, calculée une fois par titre distinct"""
+
+    def __init__(self, aliases=BRAND_ALIASES, brands=BRANDS):
+        # Règles à plat, dans l'ordre de priorité : (motifs, motif excluant, marque)
+        self.rules = [(patterns, exclude, brand) for patterns, brand, exclude in aliases]
+        self.rules += [((brand,), None, brand.capitalize()) for brand in brands]
+
+    def tag_lower(self, text_lower: str) -> str:
+        """Première règle satisfaite par un titre déjà en minuscules"""
+        for patterns, exclude, brand in self.rules:
+            for pattern in patterns:
+                if pattern in text_lower:
+                    if exclude is None or exclude not in text_lower:
+                        return brand
+                    break
+        return UNKNOWN_BRAND
+
+    def tag(self, titles: pd.Series) -> pd.Series:
+        """Marque de chaque titre (UNKNOWN_BRAND si aucune règle ne s'applique)"""
+        codes, uniques = lower_titles(titles)
+        tag_lower = self.tag_lower
+        return pd.Series(broadcast(codes, [tag_lower(text) for text in uniques], UNKNOWN_BRAND),
+                         index=titles.index)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Alternance regex équivalente à '|'.join(words), factorisée par préfixes
+    communs : ['case', 'cable', 'câble'] -> 'c(?:a(?:ble|se)|âble)'.
+    À une position donnée, le moteur ne suit qu'une branche par caractère.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}                       # fin de mot
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:                      # le préfixe est lui-même un mot : suite optionnelle
+            return (body if len(branches) > 1 else '(?:' + body + ')') + '?'
+        return body
+
+    return build(trie)
+
+
+class CategoryMatcher:
+    """
+    Catégorie d'une Series de titres ('accessoire', 'smartphone', 'other',
+    'unknown' si titre manquant), avec le mot-clé déclencheur et le drapeau
+    "vrai smartphone vendu avec un accessoire en bonus", calculés en un seul
+    passage par titre distinct.
+    """
+
+    def __init__(self, accessory_keywords=ACCESSORY_KEYWORDS, smartphone_keywords=SMARTPHONE_KEYWORDS,
+                 accessory_start=ACCESSORY_START_PATTERNS, smartphone_start=SMARTPHONE_START_PATTERNS):
+        self.rules = [list(accessory_keywords), list(smartphone_keywords), list(accessory_start), list(smartphone_start)]
+        self.accessory = re.compile(trie_pattern(accessory_keywords))
+        self.smartphone = re.compile(trie_pattern(smartphone_keywords))
+        # Début de titre : la branche accessoire est essayée en premier (elle l'emporte)
+        self.start = re.compile('(?P<accessory>{})|(?P<smartphone>{})'.format(
+            '|'.join(p.lstrip('^') for p in accessory_start),
+            '|'.join(p.lstrip('^') for p in smartphone_start)))
+
+    def match_lower(self, text_lower: str) -> Tuple[str, Optional[str], bool]:
+        """(catégorie, mot-clé déclencheur, smartphone avec bonus) d'un titre en minuscules"""
+        start = self.start.match(text_lower)
+        bonus = start is not None and start.group('smartphone') is not None
+        found = self.accessory.search(text_lower)
+        if found:
+            return 'accessoire', found.group(), bonus
+        found = self.smartphone.search(text_lower)
+        if found:
+            return 'smartphone', found.group(), bonus
+        return 'other', None, bonus
+
+    def tag(self, titles: pd.Series) -> pd.DataFrame:
+        """
+        DataFrame aligné sur titles : category, category_keyword (mot-clé qui a
+        décidé de la catégorie) et smartphone_bonus (titre qui commence par une
+        marque/un modèle, ex. "Samsung Galaxy S21 + Coque offerte").
+        """
+        codes, uniques = lower_titles(titles)
+        match_lower = self.match_lower
+        categories, keywords, bonus = zip(*[match_lower(text) for text in uniques]) if uniques else ((), (), ())
+        return pd.DataFrame({
+            'category': broadcast(codes, categories, 'unknown'),
+            'category_keyword': broadcast(codes, keywords, None),
+            'smartphone_bonus': broadcast(codes, bonus, False).astype(bool),
+        }, index=titles.index)
+
+
+# Colonnes produites par TitleClassifier
+CLASSIFICATION_COLUMNS = ['brand', 'category', 'category_keyword', 'smartphone_bonus']
+
+
+class TitleClassifier:
+    """
+    Marque + catégorie d'une Series de titres. Les titres sont factorisés et
+    mis en minuscules une seule fois pour les deux taggers ; avec un cache
+    (cf. title_cache.TitleCache), seuls les titres jamais vus sont classés.
+    """
+
+    def __init__(self, brand_tagger: Optional[BrandTagger] = None,
+                 category_matcher: Optional[CategoryMatcher] = None, cache=None):
+        self.brand_tagger = brand_tagger or BrandTagger()
+        self.category_matcher = category_matcher or CategoryMatcher()
+        self.cache = cache
+
+    @property
+    def rules_hash(self) -> str:
+        """Empreinte des règles : toute modification des listes invalide le cache"""
+        rules = [CLASSIFIER_VERSION, self.brand_tagger.rules, self.category_matcher.rules]
+        return hashlib.sha1(json.dumps(rules, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    def classify_lower(self, text_lower: str) -> Tuple[str, str, Optional[str], bool]:
+        """(marque, catégorie, mot-clé déclencheur, smartphone avec bonus) d'un titre en minuscules"""
+        return (self.brand_tagger.tag_lower(text_lower),) + self.category_matcher.match_lower(text_lower)
+
+    def classify(self, titles: pd.Series) -> pd.DataFrame:
+        """DataFrame aligné sur titles, colonnes CLASSIFICATION_COLUMNS"""
+        codes, uniques = lower_titles(titles)
+        known = self.cache.lookup(uniques) if self.cache is not None else {}
+        new = {text: self.classify_lower(text) for text in uniques if text not in known}
+        if new and self.cache is not None:
+            self.cache.store(new)
+        known.update(new)
+        rows = [known[text] for text in uniques]
+        columns = list(zip(*rows)) if rows else [(), (), (), ()]
+        missing = (UNKNOWN_BRAND, 'unknown', None, False)
+        df = pd.DataFrame({name: broadcast(codes, values, default)
+                           for name, values, default in zip(CLASSIFICATION_COLUMNS, columns, missing)},
+                          index=titles.index)
+        df['smartphone_bonus'] = df['smartphone_bonus'].astype(bool)
+        return df
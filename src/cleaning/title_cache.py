@@ -0,0 +1,107 @@
+"""
+Cache persistant (SQLite) de la classification des titres.
+
+D'un scraping quotidien à l'autre, la plupart des titres reviennent à
+l'identique : le cache mémorise titre en minuscules -> (marque, catégorie,
+mot-clé déclencheur, drapeau bonus), pour que le nettoyage ne classe que
+les titres réellement nouveaux.
+
+Chaque entrée est associée à l'empreinte des règles de classification
+(TitleClassifier.rules_hash) : dès qu'une liste de mots-clés change, les
+entrées calculées avec l'ancienne version sont purgées à l'ouverture.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    rules_hash        TEXT NOT NULL,
+    title             TEXT NOT NULL,
+    brand             TEXT NOT NULL,
+    category          TEXT NOT NULL,
+    category_keyword  TEXT,
+    smartphone_bonus  INTEGER NOT NULL,
+    classified_at     TEXT NOT NULL,
+    PRIMARY KEY (rules_hash, title)
+) WITHOUT ROWID;
+"""
+
+Classification = Tuple[str, str, Optional[str], bool]
+
+
+class TitleCache:
+    """Cache titre -> classification pour une version des règles, avec compteurs hits / misses"""
+
+    def __init__(self, db_path: Path, rules_hash: str):
+        self.rules_hash = rules_hash
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Plusieurs processus de nettoyage peuvent écrire en même temps : on attend le verrou
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        with self._lock:
+            purged = self._conn.execute("DELETE FROM titles WHERE rules_hash != ?", (rules_hash,)).rowcount
+            self._conn.commit()
+        if purged:
+            print(f"♻️ Règles de classification modifiées : {purged} titres du cache invalidés")
+        # Copie mémoire des entrées, chargée en une seule lecture au premier lookup
+        # (bien plus rapide que des requêtes titre par titre)
+        self._memory: Optional[Dict[str, Classification]] = None
+        self.reset_stats()
+
+    def _load(self) -> Dict[str, Classification]:
+        if self._memory is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT title, brand, category, category_keyword, smartphone_bonus FROM titles "
+                    "WHERE rules_hash = ?", (self.rules_hash,)).fetchall()
+            self._memory = {title: (brand, category, keyword, bool(bonus))
+                            for title, brand, category, keyword, bonus in rows}
+        return self._memory
+
+    def reload(self):
+        """Oublie la copie mémoire (entrées ajoutées par d'autres processus relues au prochain lookup)"""
+        self._memory = None
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, titles: Iterable[str]) -> Dict[str, Classification]:
+        """Classifications connues parmi `titles` (titres en minuscules)"""
+        memory = self._load()
+        found: Dict[str, Classification] = {}
+        n_titles = 0
+        for title in titles:
+            n_titles += 1
+            known = memory.get(title)
+            if known is not None:
+                found[title] = known
+        self.hits += len(found)
+        self.misses += n_titles - len(found)
+        return found
+
+    def store(self, classifications: Dict[str, Classification]):
+        """Enregistre les classifications des titres nouvellement classés"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(self.rules_hash, title, brand, category, keyword, int(bonus), now)
+                 for title, (brand, category, keyword, bonus) in classifications.items()])
+            self._conn.commit()
+        self._load().update(classifications)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
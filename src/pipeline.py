@@ -0,0 +1,144 @@
+"""
+Pipeline streaming scraping -> nettoyage, sans aller-retour par les CSV bruts.
+
+Les scrapers publient les produits de chaque page dès leur extraction
+(BaseScraper.add_listener) ; le DataCleaner standardise, classe et filtre
+ces produits par batchs au fil de l'eau, et le dataset nettoyé est écrit
+incrémentalement (ProcessedWriter). Il est donc prêt quelques secondes après
+la dernière page, sans recherche du "dernier fichier" dans data/raw.
+
+Usage : python src/pipeline.py
+"""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+SRC_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SRC_DIR / "scraping"))
+sys.path.insert(0, str(SRC_DIR / "cleaning"))
+sys.path.insert(0, str(SRC_DIR / "analysis"))
+
+from base_scraper import CrawlScheduler, setup_logging
+from cleaner import DataCleaner, ProcessedWriter
+
+logger = setup_logging("pipeline")
+
+
+class StreamingPipeline:
+    """
+    Branche un CrawlScheduler sur le DataCleaner : le crawl tourne dans un
+    thread, les pages arrivent dans une file et sont nettoyées par batchs
+    (batch_size produits ou flush_interval secondes, au premier atteint).
+    """
+
+    def __init__(self, scheduler: CrawlScheduler, cleaner: Optional[DataCleaner] = None,
+                 writer: Optional[ProcessedWriter] = None, batch_size: int = 200, flush_interval: float = 5.0):
+        self.scheduler = scheduler
+        self.cleaner = cleaner or DataCleaner()
+        self.writer = writer or ProcessedWriter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.results: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.history_changes = 0
+        self._pages = queue.Queue()
+
+    def _on_page(self, source: str, keyword: str, products: List[Dict]):
+        if products:
+            self._pages.put((source, products))
+
+    def _crawl(self):
+        try:
+            self.results = self.scheduler.run()
+        except Exception as e:
+            logger.error(f"❌ Crawl interrompu : {str(e)}")
+        finally:
+            self._pages.put(None)
+
+    def records(self) -> Iterator[Optional[Tuple[str, List[Dict]]]]:
+        """
+        Générateur des pages extraites (source, produits) jusqu'à la fin du crawl.
+        Produit None quand aucune page n'est arrivée depuis flush_interval secondes.
+        """
+        while True:
+            try:
+                item = self._pages.get(timeout=self.flush_interval)
+            except queue.Empty:
+                yield None
+                continue
+            if item is None:
+                return
+            yield item
+
+    def _flush(self, pending: Dict[str, List[Dict]]):
+        for source, products in pending.items():
+            if products:
+                cleaned = self.cleaner.clean_batch(pd.DataFrame(products), source)
+                self.writer.write(cleaned)
+                # Historique des prix versé batch par batch : le dataset publié n'est jamais relu
+                start = time.perf_counter()
+                self.history_changes += self.cleaner.record_history(cleaned, verbose=False)
+                self.cleaner.report['timings']['historique'] += time.perf_counter() - start
+                logger.info(f"🧹 Batch {source} : {len(products)} produits bruts -> {len(cleaned)} conservés "
+                            f"({self.writer.rows} au total)")
+        pending.clear()
+
+    def run(self) -> Path:
+        """Scrape, nettoie et écrit le dataset ; retourne le chemin du fichier nettoyé"""
+        for scraper in {id(task.scraper): task.scraper for task in self.scheduler.tasks}.values():
+            scraper.add_listener(self._on_page)
+        self.cleaner.reset_report()
+        self.history_changes = 0
+
+        crawler = threading.Thread(target=self._crawl, name="crawl", daemon=True)
+        crawler.start()
+
+        pending: Dict[str, List[Dict]] = {}
+        last_flush = time.monotonic()
+        for item in self.records():
+            if item is not None:
+                source, products = item
+                pending.setdefault(source, []).extend(products)
+            n_pending = sum(len(products) for products in pending.values())
+            if n_pending >= self.batch_size or (n_pending and time.monotonic() - last_flush >= self.flush_interval):
+                self._flush(pending)
+                last_flush = time.monotonic()
+        self._flush(pending)
+        crawler.join()
+
+        output_file = self.writer.close()
+        self.cleaner.print_report()
+        if self.cleaner.history is not None:
+            print(f"📈 Historique des prix : {self.history_changes} changement(s) enregistré(s) "
+                  f"sur {self.writer.rows} produits")
+        print(f"\n✅ Dataset nettoyé publié : {output_file} ({self.writer.rows} produits)")
+        print(f"   - Amazon : {self.writer.by_source['Amazon']}")
+        print(f"   - Jumia  : {self.writer.by_source['Jumia']}")
+        return output_file
+
+
+def main():
+    from scraper_amazon import AmazonScraper
+    from scraper_jumia import JumiaScraper
+    from scrape_all import AMAZON_KEYWORDS, JUMIA_KEYWORDS
+    from sentiment import SentimentScorer
+    from model import TitleClusterModel, CLUSTER_MODEL_PATH
+
+    scheduler = CrawlScheduler(max_concurrency=3)
+    scheduler.add(AmazonScraper(headless=False, slow_mo=100), AMAZON_KEYWORDS, max_pages=5, pagination='url')
+    scheduler.add(JumiaScraper(headless=False, slow_mo=100), JUMIA_KEYWORDS, max_pages=5, pagination='url')
+    # sentiment_score calculé au fil des batchs (seuls les titres jamais vus passent par le
+    # modèle, quantifié int8 : la machine de scraping n'a pas de GPU) ; cluster affecté par
+    # le modèle sauvegardé s'il existe (python src/analysis/model.py pour l'entraîner)
+    clusters = TitleClusterModel.load(CLUSTER_MODEL_PATH) if CLUSTER_MODEL_PATH.exists() else None
+    cleaner = DataCleaner(sentiment=SentimentScorer(backend='int8'), clusters=clusters)
+    StreamingPipeline(scheduler, cleaner=cleaner).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,802 @@
+"""
+Socle commun des scrapers e-commerce.
+
+- Chemins du projet et configuration du logging (une seule fois par process).
+- BrowserPool : navigateurs Chromium "chauds" partagés par tous les sites.
+- SiteAdapter : tout ce qui est propre à un site (URLs, sélecteurs, parsing
+  des cartes, nettoyage des prix / notes, pagination).
+- BaseScraper : logique de crawl commune (cadence, blocage des ressources,
+  snapshots, checkpoints, déduplication, sauvegarde, statistiques).
+- CrawlScheduler : une seule file de jobs qui entrelace les mots-clés de
+  plusieurs sites sur un pool borné de workers.
+
+Ajouter une marketplace = écrire un SiteAdapter (et une petite sous-classe de
+BaseScraper pour ses réglages), pas recopier un scraper complet.
+"""
+
+import itertools
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import pandas as pd
+from playwright.sync_api import sync_playwright
+
+from snapshots import SnapshotStore
+from router import ResourceBlocker
+from pacing import AdaptivePacer
+from checkpoint import CrawlCheckpoint
+from dedup import DedupIndex
+
+
+# --- CONFIGURATION AUTOMATIQUE DES CHEMINS ---
+def find_project_root() -> Path:
+    """Remonte les dossiers jusqu'à trouver 'requirements.txt' (dossier courant sinon)"""
+    project_root = Path(__file__).resolve().parent
+    for _ in range(5):
+        if (project_root / "requirements.txt").exists():
+            return project_root
+        project_root = project_root.parent
+    print("⚠️ Racine du projet non détectée via le fichier, utilisation du dossier courant.")
+    return Path.cwd()
+
+
+PROJECT_ROOT = find_project_root()
+DATA_DIR = PROJECT_ROOT / "data" / "raw"
+SNAPSHOT_DIR = PROJECT_ROOT / "data" / "snapshots"
+CHECKPOINT_DIR = PROJECT_ROOT / "data" / "checkpoints"
+DEDUP_DB = PROJECT_ROOT / "data" / "index" / "dedup.sqlite"
+LOGS_DIR = PROJECT_ROOT / "logs"
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+logger = logging.getLogger(__name__)
+
+
+def setup_logging(name: str) -> logging.Logger:
+    """Logging console + fichier logs/<name>_<horodatage>.log (configuré une seule fois par process)"""
+    sys.stdout.reconfigure(encoding='utf-8')
+    if not logging.getLogger().handlers:
+        log_file = LOGS_DIR / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler(log_file, encoding='utf-8'),
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+    return logging.getLogger(name)
+
+
+# --- CONFIGURATION ANTI-DÉTECTION ---
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15"
+]
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled', '--disable-dev-shm-usage']
+
+
+class BrowserPool:
+    """
+    Pool de navigateurs partagé par tous les scrapers du process.
+    L'API sync de Playwright est liée à son thread : chaque worker possède
+    UN Chromium (par réglage headless/slow_mo), lancé à la première demande
+    puis réutilisé pour tous ses jobs, quel que soit le site.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.launches = 0
+
+    def browser(self, headless: bool = False, slow_mo: int = 100):
+        """Navigateur du thread courant (lancé au premier appel)"""
+        local = self._local
+        if getattr(local, 'browsers', None) is None:
+            local.playwright = sync_playwright().start()
+            local.browsers = {}
+        key = (headless, slow_mo)
+        if key not in local.browsers:
+            local.browsers[key] = local.playwright.chromium.launch(headless=headless, slow_mo=slow_mo,
+                                                                   args=LAUNCH_ARGS)
+            with self._lock:
+                self.launches += 1
+        return local.browsers[key]
+
+    def release(self):
+        """Ferme les navigateurs du thread courant (à appeler depuis ce même thread)"""
+        local = self._local
+        if getattr(local, 'browsers', None) is None:
+            return
+        for browser in local.browsers.values():
+            try:
+                browser.close()
+            except Exception:
+                pass
+        local.playwright.stop()
+        local.browsers = None
+        logger.info("🔒 Navigateur du worker fermé")
+
+
+BROWSER_POOL = BrowserPool()
+
+
+class SiteAdapter:
+    """
+    Interface d'une marketplace : identifiants, sélecteurs, parsing et pagination.
+    parse_cards() renvoie les champs bruts des cartes (avec `id_field`) ;
+    extract_product() les nettoie et valide un produit.
+    """
+    name = ''                  # préfixe des fichiers et dossiers ('amazon')
+    source = ''                # valeur de la colonne 'source'
+    id_field = ''              # identifiant produit (déduplication)
+    domain = ''                # domaine cadencé par le pacer
+    base_url = ''
+    allowed_domains: List[str] = []
+    card_selector = ''
+    next_selector = ''         # lien "page suivante"
+    wait_until = 'load'        # événement attendu par page.goto
+    parse_on_timeout = False   # extraire quand même si les cartes ne se stabilisent pas
+    locale = 'fr-FR'
+    timezone_id = 'Europe/Paris'
+    column_order: Optional[List[str]] = None
+
+    def build_page_url(self, keyword: str, page_number: int) -> str:
+        """URL directe d'une page de résultats"""
+        raise NotImplementedError
+
+    def parse_cards(self, html: str) -> List[Dict]:
+        """Champs bruts de chaque carte produit du HTML (parsing local, sans navigateur)"""
+        raise NotImplementedError
+
+    def extract_product(self, raw: Dict, date_scraping: str) -> Optional[Dict]:
+        """Produit nettoyé, ou None si la carte est inexploitable"""
+        raise NotImplementedError
+
+    def handle_popups(self, page):
+        """Ferme les bannières cookies / newsletters"""
+
+    def is_captcha(self, page) -> bool:
+        return False
+
+    def total_pages(self, page) -> Optional[int]:
+        """Nombre de pages annoncé par la pagination (None si illisible)"""
+        return None
+
+    def next_page_url(self, page) -> Optional[str]:
+        """URL absolue de la page suivante (pour la reprise d'un run interrompu)"""
+        try:
+            href = page.locator(self.next_selector).first.get_attribute("href", timeout=2000)
+            return urljoin(self.base_url, href) if href else None
+        except Exception:
+            return None
+
+    def has_next(self, page) -> bool:
+        next_btn = page.locator(self.next_selector)
+        return next_btn.is_visible() and next_btn.is_enabled()
+
+    def click_next(self, page):
+        page.locator(self.next_selector).click()
+
+
+class CrawlTask:
+    """Un mot-clé d'un site à scraper, avec son checkpoint"""
+
+    def __init__(self, scraper: 'BaseScraper', keyword: str, max_pages: int, pagination: str,
+                 checkpoint: CrawlCheckpoint, max_concurrency: int, save_json: bool = False,
+                 resume: bool = False):
+        self.scraper = scraper
+        self.keyword = keyword
+        self.max_pages = max_pages
+        self.pagination = pagination
+        self.checkpoint = checkpoint
+        self.max_concurrency = max_concurrency
+        self.save_json = save_json
+        self.resume = resume
+        # Run du checkpoint (le run interrompu en cas de reprise) : snapshots et déduplication
+        self.run_id = checkpoint.run_id or scraper.run_id
+
+
+class WorkerSlot:
+    """Ressources d'un worker : navigateur du pool + un contexte par scraper (jobs par URL)"""
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+        self._contexts = {}
+
+    def browser(self, scraper: 'BaseScraper'):
+        return self.pool.browser(scraper.headless, scraper.slow_mo)
+
+    def context(self, scraper: 'BaseScraper'):
+        if id(scraper) not in self._contexts:
+            self._contexts[id(scraper)] = scraper._new_context(self.browser(scraper))
+        return self._contexts[id(scraper)]
+
+    def close(self):
+        for context, _ in self._contexts.values():
+            try:
+                context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        self.pool.release()
+
+
+class CrawlScheduler:
+    """
+    File de jobs unique pour un ou plusieurs scrapers. Les jobs des différents
+    sites sont entrelacés : pendant qu'un worker attend le pacer d'Amazon, un
+    autre charge une page Jumia, et chaque worker réutilise son navigateur pour
+    tous les sites.
+    """
+
+    def __init__(self, max_concurrency: int = 3, pool: Optional[BrowserPool] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.pool = pool or BROWSER_POOL
+        self.tasks: List[CrawlTask] = []
+
+    def add(self, scraper: 'BaseScraper', keywords: List[str], max_pages: int = 1, pagination: str = 'click',
+            resume: bool = False, save_json: bool = False):
+        for keyword, checkpoint in scraper._open_checkpoints(keywords, resume).items():
+            self.tasks.append(CrawlTask(scraper, keyword, max_pages, pagination, checkpoint,
+                                        self.max_concurrency, save_json, resume))
+        return self
+
+    def run(self) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Exécute tous les jobs et retourne un DataFrame par (site, mot-clé)"""
+        jobs = queue.Queue()
+
+        # Round-robin entre les sites pour ne pas épuiser un site avant l'autre
+        per_site: Dict[int, List] = {}
+        for task in self.tasks:
+            if task.resume:
+                task.scraper._publish_resumed(task)
+            per_site.setdefault(id(task.scraper), []).extend((task, spec) for spec in task.scraper.plan_jobs(task))
+        for group in itertools.zip_longest(*per_site.values()):
+            for job in group:
+                if job is not None:
+                    jobs.put(job)
+
+        # Des jobs peuvent en créer d'autres (pages 2..N) : en mode URL on garde tous les workers
+        spawns_jobs = any(task.pagination == 'url' or task.scraper.spawns_jobs for task in self.tasks)
+        n_workers = self.max_concurrency if spawns_jobs else max(1, min(self.max_concurrency, jobs.qsize()))
+        sites = sorted({task.scraper.adapter.source for task in self.tasks})
+        logger.info(f"🚀 Scraping concurrent {'/'.join(sites)} : {len(self.tasks)} mots-clés, {n_workers} workers")
+
+        def worker():
+            slot = WorkerSlot(self.pool)
+            try:
+                while True:
+                    job = jobs.get()
+                    if job is None:
+                        jobs.task_done()
+                        break
+                    task, spec = job
+                    try:
+                        task.scraper.run_job(slot, task, spec, lambda s, t=task: jobs.put((t, s)))
+                    except Exception as e:
+                        # Les pages déjà checkpointées sont conservées (reprise possible)
+                        logger.error(f"❌ Erreur critique [{task.keyword}] : {str(e)}")
+                    finally:
+                        jobs.task_done()
+            finally:
+                slot.close()
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(worker) for _ in range(n_workers)]
+            # On attend que la file soit vraiment vide (ou que tous les workers soient tombés)
+            while jobs.unfinished_tasks and not all(f.done() for f in futures):
+                time.sleep(0.5)
+            for _ in range(n_workers):
+                jobs.put(None)
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"❌ Worker arrêté : {str(e)}")
+
+        return {(task.scraper.adapter.name, task.keyword):
+                task.scraper._save_data(task.checkpoint.load(), task.keyword, task.save_json)
+                for task in self.tasks}
+
+
+class BaseScraper:
+    """Crawl commun à toutes les marketplaces ; le spécifique est dans self.adapter"""
+    # True si plan_jobs/run_job peuvent ajouter des jobs même en pagination par clic
+    spawns_jobs = False
+
+    def __init__(self, adapter: SiteAdapter, headless: bool = False, slow_mo: int = 100,
+                 save_snapshots: bool = False, block_resources: bool = True,
+                 pacer: Optional[AdaptivePacer] = None, dedup: bool = True, pool: Optional[BrowserPool] = None):
+        self.adapter = adapter
+        self.headless = headless
+        self.slow_mo = slow_mo
+        # Navigateurs partagés avec les autres scrapers du process
+        self.pool = pool or BROWSER_POOL
+        # Blocage des images, médias, polices et requêtes tierces (cf. router.py)
+        self.block_resources = block_resources
+        # Sauvegarde du HTML brut de chaque page pour rejouer l'extraction hors-ligne
+        self.save_snapshots = save_snapshots
+        self.snapshots = SnapshotStore(SNAPSHOT_DIR)
+        # Identifiant du run, mémorisé dans les checkpoints (repris avec resume=True)
+        self.run_id = self.snapshots.new_run_id()
+        # Index de déduplication : un produit déjà vu dans ce run (autre mot-clé)
+        # n'est pas ré-extrait, seul le mot-clé est mémorisé (cf. dedup.py)
+        self.dedup = DedupIndex(DEDUP_DB, self.run_id) if dedup else None
+        self.stats = {
+            'total_products': 0,
+            'successful_extractions': 0,
+            'failed_extractions': 0,
+            'pages_scraped': 0,
+            'requests_blocked': 0,
+            'bytes_saved_est': 0,
+            'duplicates_skipped': 0
+        }
+        self._stats_lock = threading.Lock()
+        # Cadencement adaptatif partagé par tous les workers (décisions dans self.stats)
+        self.pacer = pacer or AdaptivePacer()
+        self.pacer.bind_stats(self.stats)
+        # Abonnés notifiés à chaque page extraite (pipeline streaming, cf. src/pipeline.py)
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, callback: Callable):
+        """
+        callback(source, keyword, products) est appelé avec les nouveaux produits
+        de chaque page dès leur checkpoint, depuis le thread du worker.
+        """
+        self._listeners.append(callback)
+
+    def _publish_resumed(self, task: CrawlTask):
+        """
+        Reprise : les pages déjà checkpointées sont publiées aux abonnés comme si
+        elles venaient d'être extraites (le dataset du pipeline streaming garde
+        ainsi les pages scrapées avant l'interruption).
+        """
+        checkpoint = task.checkpoint
+        checkpoint.prepare_resume()
+        if not self._listeners or not checkpoint.rows:
+            return
+        df = checkpoint.load()
+        products = df.astype(object).where(df.notna(), None).to_dict('records')
+        logger.info(f"⏩ [{task.keyword}] {len(products)} produits déjà checkpointés republiés")
+        for callback in self._listeners:
+            callback(self.adapter.source, task.keyword, products)
+
+    def _bump_stat(self, key: str, value: int = 1):
+        """Incrémente une statistique (thread-safe pour le mode concurrent)"""
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def _smart_scroll(self, page):
+        """
+        Scroll sécurisé : vérifie que la page est chargée avant de scroller.
+        L'attente réelle se fait sur les signaux de chargement
+        (AdaptivePacer.wait_until_ready), pas sur des pauses fixes.
+        """
+        try:
+            page.wait_for_selector("body", timeout=5000)
+            if page.evaluate("() => document.body"):
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2);")
+                self.pacer.pause()
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+                self.pacer.pause()
+                page.evaluate("window.scrollBy(0, -300);")
+            else:
+                logger.warning("⚠️ Corps de page introuvable (probablement un CAPTCHA). Scroll ignoré.")
+        except Exception as e:
+            logger.warning(f"Erreur lors du scroll : {e}")
+
+    def _new_context(self, browser):
+        """Contexte isolé (UA aléatoire, anti-détection, blocage des ressources)"""
+        context = browser.new_context(
+            user_agent=random.choice(USER_AGENTS),
+            viewport={'width': 1920, 'height': 1080},
+            locale=self.adapter.locale,
+            timezone_id=self.adapter.timezone_id
+        )
+        blocker = None
+        if self.block_resources:
+            blocker = ResourceBlocker(self.adapter.allowed_domains)
+            blocker.attach(context)
+        context.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
+        return context, blocker
+
+    def _goto(self, page, url: str):
+        """Chargement cadencé d'une URL puis fermeture des pop-ups"""
+        logger.info(f"🌍 Connexion à {url}")
+        self.pacer.acquire(self.adapter.domain)
+        page.goto(url, timeout=60000, wait_until=self.adapter.wait_until)
+        self.adapter.handle_popups(page)
+
+    def _extract(self, raw: Dict, date_scraping: str) -> Optional[Dict]:
+        """Nettoyage d'une carte par l'adaptateur, avec comptage des succès / échecs"""
+        try:
+            product = self.adapter.extract_product(raw, date_scraping)
+        except Exception as e:
+            logger.error(f"Erreur extraction {raw.get(self.adapter.id_field)}: {str(e)}")
+            self._bump_stat('failed_extractions')
+            return None
+        if product:
+            self._bump_stat('successful_extractions')
+        return product
+
+    def _wait_for_cards(self, page, keyword: str, page_number: int) -> bool:
+        """
+        Scroll puis attente des cartes de la page courante (signaux de chargement
+        du pacer). Retourne False si la page est inexploitable (CAPTCHA, ou
+        timeout sans parse_on_timeout).
+        """
+        self._bump_stat('pages_scraped')
+        self._smart_scroll(page)
+
+        domain = self.adapter.domain
+        if self.pacer.wait_until_ready(page, self.adapter.card_selector):
+            self.pacer.report_success(domain)
+        elif self.adapter.is_captcha(page):
+            logger.error(f"[{keyword}] 🤖 CAPTCHA détecté (page {page_number})")
+            self.pacer.report_captcha(domain)
+            return False
+        else:
+            logger.warning(f"[{keyword}] ⏳ Produits non chargés (timeout, page {page_number})")
+            self.pacer.report_timeout(domain)
+            if not self.adapter.parse_on_timeout:
+                return False
+        return True
+
+    def _process_page(self, page, keyword: str, page_number: int, run_id: str,
+                      checkpoint: CrawlCheckpoint, blocker: Optional[ResourceBlocker],
+                      next_url: Optional[str] = None, ready: bool = False) -> Optional[int]:
+        """
+        Attend (sauf si ready : _wait_for_cards déjà appelé), extrait et checkpointe
+        la page courante. Retourne le nombre de cartes trouvées, ou None si la
+        page n'a pas chargé (CAPTCHA / timeout).
+        """
+        if not ready and not self._wait_for_cards(page, keyword, page_number):
+            return None
+
+        if blocker:
+            report = blocker.log_page_report()
+            self._bump_stat('requests_blocked', report['blocked_requests'])
+            self._bump_stat('bytes_saved_est', report['bytes_saved_est'])
+
+        return self._process_html(page.content(), keyword, page_number, run_id, checkpoint, next_url)
+
+    def _process_html(self, html: str, keyword: str, page_number: int, run_id: str,
+                      checkpoint: CrawlCheckpoint, next_url: Optional[str] = None, keep_empty: bool = True) -> int:
+        """
+        Snapshot, extraction en bloc et checkpoint d'une page, quel que soit le backend.
+        keep_empty=False : une page sans carte n'est pas enregistrée (elle
+        pourra être reprise par un autre backend).
+        Retourne le nombre de cartes trouvées sur la page (doublons compris).
+        """
+        extract_start = time.perf_counter()
+        raw_cards = self.adapter.parse_cards(html)
+        logger.info(f"   📦 [{keyword}] p{page_number} : {len(raw_cards)} cartes produits détectées")
+        if not raw_cards and not keep_empty:
+            return 0
+
+        if self.save_snapshots:
+            self.snapshots.save(self.adapter.name, keyword, run_id, page_number, html)
+
+        date_scraping = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        page_products, duplicates = [], 0
+        # Apparitions de toute la page enregistrées en une transaction
+        is_new = (self.dedup.record_page(self.adapter.source, [raw[self.adapter.id_field] for raw in raw_cards], keyword)
+                  if self.dedup is not None else [True] * len(raw_cards))
+        try:
+            for raw, new in zip(raw_cards, is_new):
+                if not new:
+                    duplicates += 1
+                    continue
+                product = self._extract(raw, date_scraping)
+                if product:
+                    page_products.append(product)
+
+            if duplicates:
+                self._bump_stat('duplicates_skipped', duplicates)
+                logger.info(f"   ♻️ [{keyword}] p{page_number} : {duplicates} doublons déjà vus dans ce run")
+            logger.info(f"   ⏱️ Extraction de la page : {(time.perf_counter() - extract_start) * 1000:.0f} ms")
+
+            checkpoint.append_page(page_number, page_products, next_url)
+        except Exception:
+            # Page non enregistrée : ses produits ne doivent pas devenir des doublons à la reprise
+            if self.dedup is not None:
+                self.dedup.forget(self.adapter.source,
+                                  [raw[self.adapter.id_field] for raw, new in zip(raw_cards, is_new) if new])
+            raise
+        self._bump_stat('total_products', len(page_products))
+        logger.info(f"   💾 [{keyword}] Total accumulé : {checkpoint.rows} produits")
+        for callback in self._listeners:
+            callback(self.adapter.source, keyword, page_products)
+        return len(raw_cards)
+
+    def _crawl_by_click(self, page, keyword: str, start_page: int, max_pages: int, run_id: str,
+                        checkpoint: CrawlCheckpoint, blocker: Optional[ResourceBlocker], ready: bool = False) -> bool:
+        """
+        Pagination séquentielle par clic sur 'Suivant', à partir de la page
+        déjà chargée (start_page ; ready : ses cartes sont déjà attendues).
+        Retourne True si le mot-clé est terminé.
+        """
+        for current_page in range(start_page, max_pages + 1):
+            logger.info(f"📄 [{keyword}] Page {current_page}/{max_pages}")
+            # Pagination lue une fois la page prête (sur une page lente, 'Suivant' n'est pas encore rendu)
+            if not (ready and current_page == start_page) and not self._wait_for_cards(page, keyword, current_page):
+                return False
+            # L'URL suivante est mémorisée pour la reprise
+            next_url = self.adapter.next_page_url(page) if current_page < max_pages else None
+            self._process_page(page, keyword, current_page, run_id, checkpoint, blocker, next_url, ready=True)
+
+            if current_page == max_pages:
+                return True
+            try:
+                if self.adapter.has_next(page):
+                    logger.info(f"➡️  Page {current_page + 1}...")
+                    self.pacer.acquire(self.adapter.domain)
+                    self.adapter.click_next(page)
+                else:
+                    # Fin des résultats : le mot-clé est terminé
+                    logger.info("🛑 Fin de pagination")
+                    return True
+            except Exception as e:
+                logger.error(f"Erreur pagination : {e}")
+                return False
+        return True
+
+    def _scrape_keyword(self, browser, task: CrawlTask):
+        """
+        Scrape un mot-clé (pagination par clic) dans un contexte isolé du navigateur fourni.
+        Le navigateur n'est pas fermé ici : il sert aux autres jobs du worker.
+        Un run interrompu reprend à la page suivant la dernière page enregistrée.
+        """
+        keyword, max_pages, checkpoint = task.keyword, task.max_pages, task.checkpoint
+        last_page, resume_url = checkpoint.prepare_resume()
+        if last_page and not resume_url:
+            logger.warning(f"[{keyword}] URL de reprise inconnue : redémarrage en page 1")
+            checkpoint.reset()
+            last_page = 0
+        if last_page >= max_pages:
+            checkpoint.mark_done()
+            return
+        if last_page:
+            logger.info(f"⏩ [{keyword}] Reprise après la page {last_page} ({checkpoint.rows} produits déjà enregistrés)")
+
+        context, blocker = self._new_context(browser)
+        try:
+            page = context.new_page()
+            self._goto(page, resume_url or self.adapter.build_page_url(keyword, 1))
+            if self._crawl_by_click(page, keyword, last_page + 1, max_pages, task.run_id, checkpoint, blocker):
+                checkpoint.mark_done()
+        finally:
+            context.close()
+
+    def _plan_url_pages(self, max_pages: int, checkpoint: CrawlCheckpoint) -> List[int]:
+        """Pages restant à charger en pagination par URL (bornées par le total connu)"""
+        last_page = min(max_pages, checkpoint.state.get('total_pages') or max_pages)
+        return checkpoint.missing_pages(last_page)
+
+    def _run_url_job(self, context, blocker, task: CrawlTask, page_number: int, enqueue: Callable):
+        """
+        Charge une page par son URL directe. La page 1 sert de sonde : si la
+        pagination n'expose pas d'URL &page=N exploitable, on repasse en
+        pagination par clic depuis cette page ; sinon les pages suivantes sont
+        ajoutées à la file pour être chargées en parallèle.
+        """
+        keyword, max_pages, checkpoint = task.keyword, task.max_pages, task.checkpoint
+        page = context.new_page()
+        try:
+            logger.info(f"📄 [{keyword}] Page {page_number} (URL directe)")
+            self._goto(page, self.adapter.build_page_url(keyword, page_number))
+
+            if page_number == 1:
+                # La pagination n'est sondée qu'une fois les cartes chargées : sur une
+                # page lente, elle n'est pas encore rendue et le mot-clé s'arrêterait à 1 page
+                if not self._wait_for_cards(page, keyword, 1):
+                    return
+                next_url = self.adapter.next_page_url(page) if max_pages > 1 else None
+                if max_pages > 1 and (not next_url or 'page=2' not in next_url):
+                    logger.warning(f"[{keyword}] URLs de pagination non exploitables : repli sur le clic")
+                    if self._crawl_by_click(page, keyword, 1, max_pages, task.run_id, checkpoint, blocker, ready=True):
+                        checkpoint.mark_done()
+                    return
+                total_pages = self.adapter.total_pages(page)
+                if total_pages:
+                    checkpoint.set_total_pages(total_pages)
+                self._process_page(page, keyword, 1, task.run_id, checkpoint, blocker, next_url, ready=True)
+                for n in self._plan_url_pages(max_pages, checkpoint):
+                    enqueue(n)
+            else:
+                self._process_page(page, keyword, page_number, task.run_id, checkpoint, blocker)
+
+            if not self._plan_url_pages(max_pages, checkpoint):
+                checkpoint.mark_done()
+        finally:
+            page.close()
+
+    def plan_jobs(self, task: CrawlTask) -> List:
+        """
+        Jobs initiaux d'un mot-clé :
+        - pagination='click' : un job = le mot-clé complet (None).
+        - pagination='url'   : un job = une page ; sans la page 1, on ne sait
+          pas encore si les URLs directes fonctionnent, elle passe donc seule.
+        """
+        checkpoint = task.checkpoint
+        if checkpoint.state['done']:
+            return []
+        if task.pagination == 'url':
+            checkpoint.prepare_resume()
+            missing = self._plan_url_pages(task.max_pages, checkpoint)
+            return [1] if 1 in missing else missing
+        return [None]
+
+    def run_job(self, slot: WorkerSlot, task: CrawlTask, spec, enqueue: Callable):
+        """Exécute un job planifié par plan_jobs() dans le worker courant"""
+        if spec is None:
+            self._scrape_keyword(slot.browser(self), task)
+        else:
+            context, blocker = slot.context(self)
+            self._run_url_job(context, blocker, task, spec, enqueue)
+
+    def resume_run(self, run_id: str, checkpoints: Iterable[CrawlCheckpoint] = ()):
+        """
+        Continue un run interrompu (snapshots et index de déduplication). Les
+        doublons du run sont les produits déjà enregistrés dans ses checkpoints.
+        """
+        logger.info(f"⏩ Reprise du run {run_id} ({self.adapter.source})")
+        self.run_id = run_id
+        if self.dedup is not None:
+            saved = [(self.adapter.source, product_id) for checkpoint in checkpoints if checkpoint.run_id == run_id
+                     for product_id in checkpoint.load().get(self.adapter.id_field, [])]
+            self.dedup.resume(run_id, saved)
+
+    def _open_checkpoints(self, keywords: List[str], resume: bool) -> Dict[str, CrawlCheckpoint]:
+        """
+        Checkpoints des mots-clés, rattachés au run du scraper. En reprise, le run
+        interrompu est continué (son run_id est lu dans les checkpoints) au lieu
+        d'en ouvrir un nouveau : ses apparitions restent dans un seul run.
+        """
+        checkpoints = {keyword: CrawlCheckpoint(CHECKPOINT_DIR, self.adapter.name, keyword) for keyword in keywords}
+        pending = [c for c in checkpoints.values() if not (resume and c.state['done'])]
+        if resume:
+            interrupted = [c.run_id for c in pending if c.run_id and c.state['pages']]
+            if len(set(interrupted)) > 1:
+                logger.warning(f"⚠️ Checkpoints de runs différents ({', '.join(sorted(set(interrupted)))}) : "
+                               f"reprise du run {interrupted[0]}")
+            if interrupted and interrupted[0] != self.run_id:
+                self.resume_run(interrupted[0], checkpoints.values())
+        for checkpoint in pending:
+            if not resume:
+                checkpoint.reset(self.run_id)
+            elif checkpoint.run_id != self.run_id:
+                checkpoint.set_run_id(self.run_id)
+        return checkpoints
+
+    def _open_checkpoint(self, keyword: str, resume: bool) -> CrawlCheckpoint:
+        return self._open_checkpoints([keyword], resume)[keyword]
+
+    def scrape(self, keyword: str, max_pages: int = 1, save_json: bool = False, resume: bool = False,
+               pagination: str = 'click', max_concurrency: int = 3) -> pd.DataFrame:
+        """
+        Scrape un mot-clé. Chaque page est ajoutée au checkpoint dès son extraction :
+        un crash ne fait perdre que la page en cours, et resume=True reprend
+        après la dernière page enregistrée.
+        pagination='url' construit directement les URLs &page=N pour charger
+        les pages en parallèle, avec repli sur le clic.
+        """
+        logger.info(f"🚀 Démarrage scraping {self.adapter.source} : '{keyword}' ({max_pages} pages)")
+        return self.scrape_many([keyword], max_pages, max_concurrency, save_json, resume, pagination)[keyword]
+
+    def scrape_many(self, keywords: List[str], max_pages: int = 1, max_concurrency: int = 3,
+                    save_json: bool = False, resume: bool = False, pagination: str = 'click') -> Dict[str, pd.DataFrame]:
+        """
+        Mode concurrent (cf. CrawlScheduler) : un pool borné de workers se partage
+        une file de jobs, chaque worker réutilisant son navigateur.
+        Retourne un DataFrame par mot-clé, dans l'ordre de la liste.
+        """
+        scheduler = CrawlScheduler(max_concurrency, self.pool)
+        results = scheduler.add(self, keywords, max_pages, pagination, resume, save_json).run()
+        return {keyword: results[(self.adapter.name, keyword)] for keyword in keywords}
+
+    def replay(self, keyword: str, run_id: Optional[str] = None, save: bool = False) -> pd.DataFrame:
+        """
+        Rejoue l'extraction sur les snapshots HTML d'un mot-clé (dernier run par défaut),
+        sans réseau ni navigateur. Utile après une correction de sélecteur ou pour
+        mesurer le débit du parsing.
+        """
+        logger.info(f"⏪ Replay {self.adapter.source} : '{keyword}'")
+        products = []
+        n_pages, n_cards, parse_time = 0, 0, 0.0
+
+        for snapshot in self.snapshots.iter_pages(self.adapter.name, keyword, run_id):
+            start = time.perf_counter()
+            raw_cards = self.adapter.parse_cards(snapshot['html'])
+            for raw in raw_cards:
+                product = self._extract(raw, snapshot['date_scraping'])
+                if product:
+                    products.append(product)
+            parse_time += time.perf_counter() - start
+            n_pages += 1
+            n_cards += len(raw_cards)
+
+        if n_pages:
+            logger.info(f"   ⏱️ {n_pages} pages / {n_cards} cartes en {parse_time:.3f}s "
+                        f"({n_pages / max(parse_time, 1e-9):.1f} pages/s, {n_cards / max(parse_time, 1e-9):.0f} cartes/s)")
+
+        if save:
+            return self._save_data(pd.DataFrame(products), keyword)
+        return pd.DataFrame(products)
+
+    def _save_data(self, df: pd.DataFrame, keyword: str, save_json: bool = False) -> pd.DataFrame:
+        """Sauvegarde individuelle par mot-clé (data/raw/<site>_<mot_cle>_<horodatage>.csv)"""
+        if df.empty:
+            logger.warning(f"❌ [{keyword}] Aucun produit récupéré")
+            self._print_stats()
+            return pd.DataFrame()
+
+        if self.adapter.column_order:
+            df = df[[col for col in self.adapter.column_order if col in df.columns]]
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        safe_keyword = keyword.replace(' ', '_').replace('/', '_')
+
+        csv_path = DATA_DIR / f"{self.adapter.name}_{safe_keyword}_{timestamp}.csv"
+        df.to_csv(csv_path, index=False, encoding='utf-8')
+        logger.info(f"✅ CSV sauvegardé : {csv_path} ({len(df)} produits)")
+
+        if save_json:
+            json_data = {
+                'metadata': {'keyword': keyword, 'scraping_date': timestamp, 'total_products': len(df)},
+                'products': df.to_dict('records')
+            }
+            json_path = DATA_DIR / f"{self.adapter.name}_{safe_keyword}_{timestamp}.json"
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(json_data, f, ensure_ascii=False, indent=2)
+
+        self._print_stats()
+        return df
+
+    def save_global(self, dfs: List[pd.DataFrame]) -> Optional[Path]:
+        """
+        Fusionne les résultats de tous les mots-clés dans data/raw/<site>_global_<horodatage>.csv,
+        un enregistrement par produit avec la liste des mots-clés qui l'ont trouvé.
+        """
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            return None
+        final_df = pd.concat(dfs, ignore_index=True)
+        if self.dedup is not None:
+            final_df = self.dedup.merge(final_df, self.adapter.source, self.adapter.id_field)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = DATA_DIR / f"{self.adapter.name}_global_{timestamp}.csv"
+        final_df.to_csv(output_path, index=False, encoding='utf-8')
+        print(f"\n✅ TERMINÉ ! Total de produits {self.adapter.source} récupérés : {len(final_df)}")
+        print(f"📁 Fichier sauvegardé : {output_path}")
+        return output_path
+
+    def _print_stats(self):
+        logger.info("\n" + "="*60)
+        logger.info(f"📊 STATISTIQUES DU SCRAPING {self.adapter.source.upper()}")
+        logger.info("="*60)
+        logger.info(f"Pages scrapées       : {self.stats['pages_scraped']}")
+        logger.info(f"Produits trouvés     : {self.stats['total_products']}")
+        logger.info(f"Extractions réussies : {self.stats['successful_extractions']}")
+        logger.info(f"Extractions échouées : {self.stats['failed_extractions']}")
+        logger.info(f"Doublons ignorés     : {self.stats['duplicates_skipped']}")
+        logger.info(f"Attentes de cadence  : {self.stats['pacing_waits']} ({self.stats['pacing_wait_seconds']:.1f}s), "
+                    f"pages prêtes {self.stats['pacing_ready_pages']}, timeouts {self.stats['pacing_ready_timeouts']}, "
+                    f"replis réseau {self.stats['pacing_idle_fallbacks']}, reculs {self.stats['pacing_backoffs']}")
+        if self.block_resources:
+            logger.info(f"Requêtes bloquées    : {self.stats['requests_blocked']} "
+                        f"(~{self.stats['bytes_saved_est'] / 1024 / 1024:.1f} Mo économisés)")
+        logger.info("="*60 + "\n")
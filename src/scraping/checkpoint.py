@@ -0,0 +1,152 @@
+"""
+Checkpoints de scraping : chaque page est ajoutée (append) à un CSV dès
+qu'elle est extraite, et un fichier d'état JSON mémorise les pages terminées.
+
+- Un crash en page 4/5 ne fait perdre que la page en cours.
+- Les produits ne restent pas en mémoire pendant le crawl.
+- Un run interrompu peut reprendre à la page suivante (resume=True).
+- Les pages peuvent arriver dans le désordre (pagination par URL en
+  parallèle) : chaque ligne porte son numéro de page et load() les remet
+  dans l'ordre.
+- L'état garde le run_id du crawl : une reprise continue le même run
+  (snapshots, index de déduplication).
+
+Arborescence : <racine>/<site>/<mot_cle>.csv  +  <mot_cle>.state.json
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from snapshots import safe_name
+
+logger = logging.getLogger(__name__)
+
+# Identifiants et prix bruts relus tels quels (zéros en tête des id_produit, cf. cleaner.RAW_DTYPES)
+CHECKPOINT_DTYPES = {'asin': str, 'id_produit': str, 'prix_brut': str}
+
+
+class CrawlCheckpoint:
+    """Stockage append-only des produits d'un mot-clé + état de reprise"""
+
+    def __init__(self, root: Path, site: str, keyword: str):
+        self.keyword = keyword
+        site_dir = Path(root) / site.lower()
+        site_dir.mkdir(parents=True, exist_ok=True)
+        self.data_path = site_dir / f"{safe_name(keyword)}.csv"
+        self.state_path = site_dir / f"{safe_name(keyword)}.state.json"
+        self._lock = threading.Lock()
+        self.state = self._read_state()
+
+    def _empty_state(self, run_id: Optional[str] = None) -> Dict:
+        return {'keyword': self.keyword, 'run_id': run_id, 'pages': {}, 'columns': None, 'done': False,
+                'updated': None}
+
+    def _read_state(self) -> Dict:
+        if not self.state_path.exists():
+            return self._empty_state()
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_state(self):
+        # Écriture atomique : un crash pendant l'écriture ne corrompt pas l'état
+        self.state['updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # Lectures sous le verrou : des workers parallèles ajoutent des pages (append_page) pendant ce temps
+    @property
+    def rows(self) -> int:
+        with self._lock:
+            return self._rows()
+
+    def _rows(self) -> int:
+        return sum(p['rows'] for p in self.state['pages'].values())
+
+    def pages_done(self) -> List[int]:
+        with self._lock:
+            return self._pages_done()
+
+    def _pages_done(self) -> List[int]:
+        return sorted(int(p) for p in self.state['pages'])
+
+    @property
+    def run_id(self) -> Optional[str]:
+        return self.state.get('run_id')
+
+    def reset(self, run_id: Optional[str] = None):
+        """Repart de zéro (nouveau run complet, ou même run si run_id n'est pas donné)"""
+        with self._lock:
+            self.data_path.unlink(missing_ok=True)
+            self.state = self._empty_state(run_id or self.run_id)
+            self._write_state()
+
+    def set_run_id(self, run_id: str):
+        """Rattache le checkpoint à un run (ancien checkpoint sans run_id repris)"""
+        with self._lock:
+            self.state['run_id'] = run_id
+            self._write_state()
+
+    def prepare_resume(self) -> Tuple[int, Optional[str]]:
+        """
+        Prépare la reprise d'un run interrompu.
+        Supprime les lignes écrites sans que l'état ait été mis à jour (crash
+        entre les deux écritures), puis retourne (dernière page terminée, URL suivante).
+        """
+        with self._lock:
+            if self.state['done'] or not self.state['pages']:
+                return 0, None
+            if self.data_path.exists():
+                df = pd.read_csv(self.data_path, dtype=CHECKPOINT_DTYPES)
+                if len(df) > self._rows():
+                    logger.warning(f"   🩹 {len(df) - self._rows()} lignes orphelines retirées du checkpoint")
+                    df.head(self._rows()).to_csv(self.data_path, index=False, encoding='utf-8')
+            last_page = max(self._pages_done())
+            return last_page, self.state['pages'][str(last_page)].get('next_url')
+
+    def append_page(self, page_number: int, products: List[Dict], next_url: Optional[str] = None):
+        """Ajoute les produits d'une page au CSV puis enregistre la page comme terminée"""
+        with self._lock:
+            if products:
+                df = pd.DataFrame(products)
+                df['_page'] = page_number
+                # Colonnes figées à la première page pour garder un CSV cohérent
+                if self.state['columns'] is None:
+                    self.state['columns'] = list(df.columns)
+                df = df.reindex(columns=self.state['columns'])
+                write_header = not self.data_path.exists() or self.data_path.stat().st_size == 0
+                df.to_csv(self.data_path, mode='a', header=write_header, index=False, encoding='utf-8')
+            self.state['pages'][str(page_number)] = {'rows': len(products), 'next_url': next_url}
+            self._write_state()
+
+    def set_total_pages(self, total_pages: int):
+        """Mémorise le nombre de pages de résultats annoncé par le site"""
+        with self._lock:
+            self.state['total_pages'] = total_pages
+            self._write_state()
+
+    def missing_pages(self, last_page: int) -> List[int]:
+        """Pages de 1 à last_page pas encore enregistrées"""
+        done = set(self.pages_done())
+        return [n for n in range(1, last_page + 1) if n not in done]
+
+    def mark_done(self):
+        with self._lock:
+            self.state['done'] = True
+            self._write_state()
+
+    def load(self) -> pd.DataFrame:
+        """Relit l'ensemble des produits checkpointés"""
+        if not self.data_path.exists() or self.rows == 0:
+            return pd.DataFrame()
+        df = pd.read_csv(self.data_path, dtype=CHECKPOINT_DTYPES).head(self.rows)
+        df = df.sort_values('_page', kind='stable').drop(columns='_page')
+        return df.reset_index(drop=True)
@@ -0,0 +1,122 @@
+"""
+Index de déduplication persistant (SQLite) des produits scrapés.
+
+Les mots-clés se recouvrent ("smartphone", "samsung galaxy", "android phone") :
+un même ASIN / id_produit Jumia remonte plusieurs fois dans un run. L'index
+- signale les cartes déjà vues dans le run courant (extraction évitée),
+- mémorise chaque mot-clé sur lequel le produit est apparu,
+- garde l'historique des runs (première / dernière apparition).
+
+Le run_id est mémorisé dans le checkpoint de chaque mot-clé : un crawl repris
+(resume=True) continue le même run (resume()), ses apparitions ne sont pas
+coupées en deux runs. Les doublons d'un run repris sont les produits présents
+dans les checkpoints : une page perdue avant son écriture est re-extraite.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    source      TEXT NOT NULL,
+    product_id  TEXT NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    PRIMARY KEY (source, product_id)
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    source      TEXT NOT NULL,
+    product_id  TEXT NOT NULL,
+    run_id      TEXT NOT NULL,
+    keyword     TEXT NOT NULL,
+    PRIMARY KEY (source, product_id, run_id, keyword)
+);
+"""
+
+
+class DedupIndex:
+    """Index (source, id produit) -> mots-clés, partagé par les workers d'un run"""
+
+    def __init__(self, db_path: Path, run_id: str):
+        self.run_id = run_id
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # Cache mémoire des produits déjà vus dans CE run (évite une requête par carte)
+        self._seen_in_run = set()
+
+    def resume(self, run_id: str, saved: Iterable[Tuple[str, str]] = ()):
+        """
+        Reprend un run interrompu. Seuls les produits `saved` (source, id),
+        relus dans les checkpoints, restent des doublons : une apparition
+        enregistrée dont la page n'a pas été checkpointée (crash entre les deux
+        écritures) sera extraite à nouveau.
+        """
+        with self._lock:
+            self.run_id = run_id
+            self._seen_in_run = {(source, str(product_id)) for source, product_id in saved}
+
+    def forget(self, source: str, product_ids: Iterable):
+        """Annule les premières apparitions d'une page qui n'a pas pu être enregistrée"""
+        with self._lock:
+            self._seen_in_run.difference_update((source, str(product_id)) for product_id in product_ids)
+
+    def record_page(self, source: str, product_ids: Iterable, keyword: str) -> List[bool]:
+        """
+        Enregistre les apparitions des produits d'une page pour `keyword`, en une
+        seule transaction. Retourne, pour chaque carte, True si c'est la première
+        apparition du produit dans ce run (la carte doit être extraite), False si
+        c'est un doublon.
+        """
+        keys = [(source, str(product_id)) for product_id in product_ids]
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            is_new = []
+            for key in keys:
+                is_new.append(key not in self._seen_in_run)
+                self._seen_in_run.add(key)
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO sightings VALUES (?, ?, ?, ?)",
+                                       [(*key, self.run_id, keyword) for key in keys])
+                self._conn.executemany(
+                    "INSERT INTO products VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(source, product_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    [(*key, now, now) for key, new in zip(keys, is_new) if new])
+        return is_new
+
+    def record(self, source: str, product_id: str, keyword: str) -> bool:
+        """Enregistre une seule apparition (cf. record_page)"""
+        return self.record_page(source, [product_id], keyword)[0]
+
+    def keywords(self, source: str) -> Dict[str, List[str]]:
+        """Mots-clés du run courant, par id produit, pour une source"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT product_id, keyword FROM sightings WHERE source = ? AND run_id = ? ORDER BY rowid",
+                (source, self.run_id)).fetchall()
+        keywords: Dict[str, List[str]] = {}
+        for product_id, keyword in rows:
+            keywords.setdefault(product_id, []).append(keyword)
+        return keywords
+
+    def merge(self, df: pd.DataFrame, source: str, id_column: str) -> pd.DataFrame:
+        """
+        Fusionne les apparitions répétées en un seul enregistrement par produit,
+        avec la liste des mots-clés correspondants (colonne 'mots_cles', séparateur '|').
+        """
+        if df.empty:
+            return df
+        keywords = self.keywords(source)
+        df = df.drop_duplicates(subset=[id_column], keep='first').copy()
+        df['mots_cles'] = df[id_column].astype(str).map(lambda pid: '|'.join(keywords.get(pid, [])))
+        return df.reset_index(drop=True)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
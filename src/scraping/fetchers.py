@@ -0,0 +1,84 @@
+"""
+Backends de récupération HTML "légers" (sans navigateur).
+
+- HttpFetcher : client HTTP poolé (keep-alive, réutilisation des connexions,
+  gzip) pour les pages rendues côté serveur comme le catalogue Jumia.
+  Lève FetchError en cas d'échec ou de CAPTCHA : le scraper bascule alors
+  sur Playwright.
+"""
+
+import logging
+import random
+import threading
+from typing import Optional
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Marqueurs de pages de challenge anti-robot (Cloudflare, Amazon)
+CAPTCHA_MARKERS = ('challenge-form', 'cf-challenge', 'challenges.cloudflare.com',
+                   'validateCaptcha', 'captcha-delivery')
+
+DEFAULT_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+]
+
+
+class FetchError(Exception):
+    """Échec de récupération HTTP (statut, réseau ou CAPTCHA) : à escalader vers le navigateur"""
+
+    def __init__(self, message: str, captcha: bool = False):
+        super().__init__(message)
+        self.captcha = captcha
+
+
+class HttpFetcher:
+    """Client HTTP poolé pour les pages qui se parsent sans JavaScript"""
+
+    def __init__(self, base_url: str, pool_size: int = 8, timeout: float = 20.0, retries: int = 2,
+                 user_agent: Optional[str] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.bytes_received = 0
+        self.session = requests.Session()
+
+        # Keep-alive + pool de connexions réutilisées entre les pages
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent or random.choice(DEFAULT_USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> str:
+        """Récupère le HTML d'une URL (absolue ou relative à base_url)"""
+        url = urljoin(self.base_url, url)
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise FetchError(f"Erreur réseau sur {url} : {e}")
+
+        with self._lock:
+            self.bytes_received += len(response.content)
+        if response.status_code != 200:
+            raise FetchError(f"HTTP {response.status_code} sur {url}", captcha=response.status_code == 403)
+
+        html = response.text
+        if any(marker in html for marker in CAPTCHA_MARKERS):
+            raise FetchError(f"CAPTCHA détecté sur {url}", captcha=True)
+        return html
+
+    def close(self):
+        self.session.close()
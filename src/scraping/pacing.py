@@ -0,0 +1,139 @@
+"""
+Cadencement adaptatif des requêtes (remplace les pauses aléatoires fixes).
+
+- Token bucket PAR DOMAINE : limite le rythme de chargement des pages,
+  partagé entre tous les workers d'un même scraper.
+- Attente sur des signaux réels (nombre de cartes stable, réseau au repos
+  en repli borné) au lieu de sleeps à l'aveugle.
+- Recul exponentiel UNIQUEMENT en cas de CAPTCHA ou de timeout, qui se
+  résorbe progressivement après des pages réussies.
+- Chaque décision est comptabilisée dans le dict de stats du scraper.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptivePacer:
+    """Cadenceur token-bucket/adaptatif par domaine"""
+
+    def __init__(self, stats: Optional[Dict] = None, requests_per_minute: float = 20.0, burst: int = 2,
+                 jitter: Tuple[float, float] = (0.2, 0.8), max_backoff: float = 8.0,
+                 idle_timeout: float = 5.0, poll_interval: float = 0.25, stable_polls: int = 2):
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.stable_polls = stable_polls
+        self._buckets: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        self.bind_stats(stats if stats is not None else {})
+
+    def bind_stats(self, stats: Dict):
+        """Enregistre les décisions directement dans le dict de stats du scraper"""
+        for key in ('pacing_waits', 'pacing_wait_seconds', 'pacing_ready_pages',
+                    'pacing_ready_timeouts', 'pacing_idle_fallbacks', 'pacing_backoffs'):
+            stats.setdefault(key, 0)
+        self.stats = stats
+
+    def _record(self, key: str, value=1):
+        with self._lock:
+            self.stats[key] += value
+
+    def _bucket(self, domain: str) -> Dict:
+        if domain not in self._buckets:
+            self._buckets[domain] = {'tokens': float(self.burst), 'updated': time.monotonic(), 'backoff': 1.0}
+        return self._buckets[domain]
+
+    def acquire(self, domain: str) -> float:
+        """
+        Réserve un jeton avant un chargement de page sur `domain`.
+        Dort juste le temps nécessaire (+ une petite gigue humaine), le tout
+        multiplié par le facteur de recul courant. Retourne la durée d'attente.
+        """
+        with self._lock:
+            bucket = self._bucket(domain)
+            now = time.monotonic()
+            bucket['tokens'] = min(self.burst, bucket['tokens'] + (now - bucket['updated']) * self.rate)
+            bucket['updated'] = now
+            # Le jeton est réservé tout de suite (le solde peut devenir négatif) :
+            # les workers concurrents s'alignent ainsi sur le même débit
+            bucket['tokens'] -= 1
+            wait = max(0.0, -bucket['tokens'] / self.rate) + random.uniform(*self.jitter)
+            wait *= bucket['backoff']
+
+        self._record('pacing_waits')
+        self._record('pacing_wait_seconds', round(wait, 2))
+        time.sleep(wait)
+        return wait
+
+    def pause(self):
+        """Courte gigue entre deux actions sur une même page (scroll, clic)"""
+        time.sleep(random.uniform(*self.jitter))
+
+    def wait_until_ready(self, page, selector: str, timeout: float = 10.0) -> bool:
+        """
+        Attend que le nombre d'éléments `selector` soit non nul et stable sur
+        plusieurs relevés consécutifs. L'attente du réseau au repos n'est qu'un
+        repli, une seule fois et bornée (idle_timeout), si le comptage ne s'est
+        pas stabilisé à mi-parcours : une page déjà prête ne l'attend jamais.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        fallback_at = start + timeout / 2
+        last_count, stable, idle_waited = -1, 0, False
+        while time.monotonic() < deadline:
+            count = page.locator(selector).count()
+            if count > 0 and count == last_count:
+                stable += 1
+                if stable >= self.stable_polls:
+                    self._record('pacing_ready_pages')
+                    return True
+            else:
+                stable = 0
+            last_count = count
+
+            now = time.monotonic()
+            if not idle_waited and now >= fallback_at:
+                idle_waited = True
+                self._record('pacing_idle_fallbacks')
+                try:
+                    page.wait_for_load_state('networkidle', timeout=min(self.idle_timeout, deadline - now) * 1000)
+                except Exception:
+                    # Certaines pages gardent des connexions ouvertes : on reprend le comptage
+                    pass
+                continue
+            time.sleep(self.poll_interval)
+
+        self._record('pacing_ready_timeouts')
+        return False
+
+    def report_captcha(self, domain: str):
+        """CAPTCHA détecté : double le facteur de recul du domaine"""
+        self._backoff(domain, "CAPTCHA")
+
+    def report_timeout(self, domain: str):
+        """Timeout de chargement : double le facteur de recul du domaine"""
+        self._backoff(domain, "timeout")
+
+    def _backoff(self, domain: str, reason: str):
+        with self._lock:
+            bucket = self._bucket(domain)
+            bucket['backoff'] = min(self.max_backoff, bucket['backoff'] * 2)
+            factor = bucket['backoff']
+        self._record('pacing_backoffs')
+        logger.warning(f"🐢 Recul sur {domain} ({reason}) : facteur x{factor:.0f}")
+
+    def report_success(self, domain: str):
+        """Page chargée normalement : le recul se résorbe progressivement"""
+        with self._lock:
+            bucket = self._bucket(domain)
+            bucket['backoff'] = max(1.0, bucket['backoff'] * 0.7)
@@ -0,0 +1,101 @@
+"""
+Couche d'interception des requêtes Playwright (page.route / context.route).
+Bloque les images, médias, polices et requêtes tierces (pubs, trackers)
+pour réduire la bande passante et le temps de chargement des pages.
+
+Les attributs src des images restent présents dans le HTML : l'extraction
+de img.s-image n'est pas affectée, seul le téléchargement est évité.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Types de ressources Playwright bloqués par défaut
+DEFAULT_BLOCKED_TYPES = {'image', 'media', 'font'}
+
+# Taille moyenne estimée (octets) d'une ressource bloquée, par type.
+# Une requête annulée ne transfère rien : les octets économisés sont donc estimés.
+DEFAULT_SIZE_ESTIMATES = {
+    'image': 35_000,
+    'media': 400_000,
+    'font': 50_000,
+    'script': 40_000,
+    'stylesheet': 20_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'other': 5_000
+}
+
+# Domaines "maison" autorisés par site (tout le reste est considéré tiers)
+AMAZON_DOMAINS = ['amazon.fr', 'media-amazon.com', 'ssl-images-amazon.com']
+JUMIA_DOMAINS = ['jumia.ma', 'jumia.is']
+
+
+class ResourceBlocker:
+    """
+    Routeur de requêtes : annule les ressources inutiles au parsing et
+    comptabilise les requêtes bloquées page par page.
+    """
+
+    def __init__(self, allowed_domains: Iterable[str], blocked_types: Optional[Iterable[str]] = None,
+                 block_third_party: bool = True, size_estimates: Optional[Dict[str, int]] = None):
+        self.allowed_domains = [d.lower() for d in allowed_domains]
+        self.blocked_types = set(blocked_types) if blocked_types is not None else set(DEFAULT_BLOCKED_TYPES)
+        self.block_third_party = block_third_party
+        # Estimations partielles complétées par les valeurs par défaut (dont 'other')
+        self.size_estimates = {**DEFAULT_SIZE_ESTIMATES, **(size_estimates or {})}
+        self._page_counts = Counter()
+        self.total_blocked = 0
+        self.total_bytes_saved = 0
+
+    def _is_third_party(self, url: str) -> bool:
+        host = (urlparse(url).hostname or '').lower()
+        if not host:
+            return False
+        return not any(host == d or host.endswith('.' + d) for d in self.allowed_domains)
+
+    def _should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == 'document':
+            # Jamais la page elle-même (ni les iframes du site)
+            return self.block_third_party and self._is_third_party(url)
+        if resource_type in self.blocked_types:
+            return True
+        return self.block_third_party and self._is_third_party(url)
+
+    def _handle(self, route):
+        request = route.request
+        if self._should_block(request.resource_type, request.url):
+            self._page_counts[request.resource_type] += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def attach(self, target):
+        """Installe le routeur sur une page ou un contexte Playwright"""
+        target.route("**/*", self._handle)
+        return target
+
+    def page_report(self) -> Dict:
+        """
+        Bilan des requêtes bloquées depuis le dernier appel (une page),
+        puis remise à zéro des compteurs de page.
+        """
+        counts = dict(self._page_counts)
+        blocked = sum(counts.values())
+        bytes_saved = sum(self.size_estimates.get(t, self.size_estimates['other']) * n for t, n in counts.items())
+        self.total_blocked += blocked
+        self.total_bytes_saved += bytes_saved
+        self._page_counts.clear()
+        return {'blocked_requests': blocked, 'blocked_by_type': counts, 'bytes_saved_est': bytes_saved}
+
+    def log_page_report(self) -> Dict:
+        """Calcule et journalise le bilan de la page courante"""
+        report = self.page_report()
+        details = ", ".join(f"{t}={n}" for t, n in sorted(report['blocked_by_type'].items()))
+        logger.info(f"   🚫 {report['blocked_requests']} requêtes bloquées "
+                    f"(~{report['bytes_saved_est'] / 1024:.0f} Ko économisés) [{details}]")
+        return report
@@ -0,0 +1,37 @@
+"""
+Scraping Amazon + Jumia en un seul run : une file de jobs commune (CrawlScheduler)
+entrelace les mots-clés des deux sites, et chaque worker réutilise le même
+navigateur pour les deux marketplaces.
+"""
+
+from base_scraper import CrawlScheduler, setup_logging
+from scraper_amazon import AmazonScraper
+from scraper_jumia import JumiaScraper
+
+logger = setup_logging("scrape_all")
+
+AMAZON_KEYWORDS = ["smartphone", "iphone", "samsung galaxy", "android Smartphone", "xiaomi"]
+JUMIA_KEYWORDS = ["smartphone", "iphone", "samsung galaxy", "android phone", "xiaomi"]
+
+
+def main():
+    # Même slow_mo pour les deux sites : les navigateurs du pool sont partagés
+    amazon = AmazonScraper(headless=False, slow_mo=100)
+    jumia = JumiaScraper(headless=False, slow_mo=100)
+
+    scheduler = CrawlScheduler(max_concurrency=3)
+    scheduler.add(amazon, AMAZON_KEYWORDS, max_pages=5, pagination='url')
+    scheduler.add(jumia, JUMIA_KEYWORDS, max_pages=5, pagination='url')
+    results = scheduler.run()
+
+    for (site, keyword), df in results.items():
+        print(f"{'✅' if not df.empty else '⚠️'} {site} '{keyword}' : {len(df)} produits")
+
+    for scraper in (amazon, jumia):
+        dfs = [df for (site, _), df in results.items() if site == scraper.adapter.name]
+        if scraper.save_global(dfs) is None:
+            print(f"❌ Aucun produit {scraper.adapter.source} récupéré.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,32 @@
-import pandas as pd
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from bs4 import BeautifulSoup, SoupStrainer
+from base_scraper import BaseScraper, SiteAdapter, BrowserPool, setup_logging
+from router import AMAZON_DOMAINS
+from pacing import AdaptivePacer
 import time
-import random
-import logging
-from pathlib import Path
-import sys
-from datetime import datetime
-import json
 from typing import Optional, Dict, List
 
-# --- CONFIGURATION AUTOMATIQUE DES CHEMINS ---
-import os
-
-# 1. On cherche d'abord où on est
-current_path = Path(__file__).resolve()
-project_root = current_path.parent
-
-# 2. On remonte les dossiers jusqu'à trouver 'requirements.txt'
-found_root = False
-for _ in range(5): 
-    if (project_root / "requirements.txt").exists():
-        found_root = True
-        break
-    project_root = project_root.parent
-
-if not found_root:
-    print("⚠️ Racine du projet non détectée via le fichier, utilisation du dossier courant.")
-    PROJECT_ROOT = Path.cwd()
-else:
-    PROJECT_ROOT = project_root
-
-DATA_DIR = PROJECT_ROOT / "data" / "raw"
-LOGS_DIR = PROJECT_ROOT / "logs"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
-
-print(f"📂 Dossier du projet détecté : {PROJECT_ROOT}")
-print(f"📂 Dossier de sauvegarde des données : {DATA_DIR}")
-
-# --- CONFIGURATION LOGGING ---
-sys.stdout.reconfigure(encoding='utf-8')
-log_file = LOGS_DIR / f"scraper_amazon_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
+logger = setup_logging("scraper_amazon")
+
+DOMAIN = "amazon.fr"
+CARD_SELECTOR = 'div[data-asin]:not([data-asin=""])'
+
+class AmazonAdapter(SiteAdapter):
+    """Sélecteurs, parsing et pagination d'Amazon.fr"""
+    name = 'amazon'
+    source = 'Amazon'
+    id_field = 'asin'
+    domain = DOMAIN
+    base_url = "https://www.amazon.fr"
+    allowed_domains = AMAZON_DOMAINS
+    card_selector = CARD_SELECTOR
+    next_selector = "a.s-pagination-next"
+    wait_until = 'domcontentloaded'
+    column_order = [
+        'date_scraping', 'asin', 'titre', 'prix', 'prix_brut',
+        'note', 'note_brute', 'nb_avis', 'nb_avis_brut',
+        'vendeur', 'prime', 'disponibilite', 'lien', 'image_url', 'source'
     ]
-)
-logger = logging.getLogger(__name__)
-
-# --- CONFIGURATION ANTI-DÉTECTION ---
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15"
-]
-
-class AmazonScraper:
-    def __init__(self, headless: bool = False, slow_mo: int = 100):
-        self.headless = headless
-        self.slow_mo = slow_mo
-        self.stats = {
-            'total_products': 0,
-            'successful_extractions': 0,
-            'failed_extractions': 0,
-            'pages_scraped': 0
-        }
-    
-    def _get_random_delays(self) -> tuple:
-        scroll_delay = random.uniform(1.5, 3.0)
-        page_delay = random.uniform(2.5, 5.0)
-        action_delay = random.uniform(0.5, 1.5)
-        return scroll_delay, page_delay, action_delay
-    
+
     def _clean_price(self, price_text: str) -> Optional[float]:
         if not price_text:
             return None
@@ -85,7 +36,7 @@ class AmazonScraper:
             return float(clean)
         except ValueError:
             return None
-    
+
     def _extract_rating(self, rating_text: str) -> Optional[float]:
         if not rating_text:
             return None
@@ -95,7 +46,7 @@ class AmazonScraper:
             return float(parts)
         except (ValueError, IndexError):
             return None
-    
+
     def _extract_reviews_count(self, reviews_text: str) -> Optional[int]:
         if not reviews_text:
             return None
@@ -104,100 +55,134 @@ class AmazonScraper:
             return int(clean)
         except ValueError:
             return None
-    
-    def _extract_product_data(self, card, asin: str) -> Optional[Dict]:
-        try:
-            product_data = {
-                'asin': asin,
-                'date_scraping': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'source': 'Amazon'
-            }
-            
-            # 1. TITRE
+
+    @staticmethod
+    def _first_text(card, selector: str) -> Optional[str]:
+        """Texte du premier élément correspondant (équivalent de .first.inner_text())"""
+        el = card.select_one(selector)
+        return el.get_text() if el is not None else None
+
+    def build_page_url(self, keyword: str, page_number: int) -> str:
+        url = f"https://www.amazon.fr/s?k={keyword.replace(' ', '+')}"
+        return url if page_number == 1 else f"{url}&page={page_number}"
+
+    def parse_cards(self, html: str) -> List[Dict]:
+        """
+        Extraction EN BLOC : parse le HTML complet de la page en local (lxml)
+        et retourne les champs bruts de chaque carte sous forme de dicts.
+        Un seul aller-retour vers le navigateur (page.content()) au lieu de
+        15 à 25 appels Playwright par carte.
+        """
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('div', attrs={'data-asin': True}))
+        raw_cards = []
+
+        for card in soup.select('div[data-asin]:not([data-asin=""])'):
+            asin = card.get('data-asin')
+            if not asin or len(asin) != 10:
+                continue
+
+            # 1. TITRE (même ordre de repli que les sélecteurs Playwright)
             title = None
-            title_selectors = [
-                "h2 a span", "h2 span", "a.a-link-normal span.a-text-normal", "a.a-link-normal"
-            ]
-            for selector in title_selectors:
-                if card.locator(selector).count() > 0:
-                    title = card.locator(selector).first.inner_text().strip()
+            for selector in ["h2 a span", "h2 span", "a.a-link-normal span.a-text-normal", "a.a-link-normal"]:
+                text = self._first_text(card, selector)
+                if text is not None:
+                    title = text.strip()
                     if title and len(title) > 5:
                         break
-            
-            if not title:
-                return None
-            product_data['titre'] = title
-            
-            # 2. PRIX
-            price_raw = None
-            if card.locator(".a-price .a-offscreen").count() > 0:
-                price_raw = card.locator(".a-price .a-offscreen").first.inner_text()
-            product_data['prix_brut'] = price_raw
-            product_data['prix'] = self._clean_price(price_raw) if price_raw else None
-            
-            # 3. NOTE
-            rating_raw = None
-            if card.locator("i.a-icon-star-small span.a-icon-alt").count() > 0:
-                rating_raw = card.locator("i.a-icon-star-small span.a-icon-alt").first.inner_text()
-            elif card.locator("span.a-icon-alt").count() > 0:
-                rating_raw = card.locator("span.a-icon-alt").first.inner_text()
-            product_data['note_brute'] = rating_raw
-            product_data['note'] = self._extract_rating(rating_raw) if rating_raw else None
-            
-            # 4. NOMBRE D'AVIS
+
+            # 2. NOTE
+            rating_raw = self._first_text(card, "i.a-icon-star-small span.a-icon-alt")
+            if rating_raw is None:
+                rating_raw = self._first_text(card, "span.a-icon-alt")
+
+            # 3. NOMBRE D'AVIS
             reviews_raw = None
-            reviews_selectors = ["span.a-size-base.s-underline-text", "span[aria-label*='étoiles']", "a span.a-size-base"]
-            for selector in reviews_selectors:
-                if card.locator(selector).count() > 0:
-                    text = card.locator(selector).first.inner_text()
-                    if text and any(char.isdigit() for char in text):
-                        reviews_raw = text
-                        break
-            product_data['nb_avis_brut'] = reviews_raw
-            product_data['nb_avis'] = self._extract_reviews_count(reviews_raw) if reviews_raw else None
-            
-            # 5. VENDEUR
-            seller = None
-            if card.locator("span.a-size-base-plus.a-color-base").count() > 0:
-                seller = card.locator("span.a-size-base-plus.a-color-base").first.inner_text()
-            elif card.locator("h5 span").count() > 0:
-                seller_text = card.locator("h5 span").first.inner_text()
-                if "Visiter" in seller_text:
-                    seller = seller_text.replace("Visiter la boutique ", "").strip()
-            product_data['vendeur'] = seller
-            
-            # 6. BADGE PRIME
-            is_prime = card.locator("i.a-icon-prime").count() > 0
-            product_data['prime'] = is_prime
-            
-            # 7. DISPONIBILITÉ
-            availability = "En stock"
-            if card.locator("span.a-color-price").count() > 0:
-                avail_text = card.locator("span.a-color-price").first.inner_text()
-                if "rupture" in avail_text.lower() or "indisponible" in avail_text.lower():
-                    availability = "Rupture de stock"
-            product_data['disponibilite'] = availability
-            
-            # 8. LIEN & IMAGE
-            product_data['lien'] = f"https://www.amazon.fr/dp/{asin}"
-            image_url = None
-            if card.locator("img.s-image").count() > 0:
-                image_url = card.locator("img.s-image").first.get_attribute("src")
-            product_data['image_url'] = image_url
-            
-            # Validation finale
-            if title and (product_data['prix'] is not None or product_data['note'] is not None):
-                self.stats['successful_extractions'] += 1
-                return product_data
-            else:
-                return None
-                
-        except Exception as e:
-            logger.error(f"Erreur extraction ASIN {asin}: {str(e)}")
-            self.stats['failed_extractions'] += 1
+            for selector in ["span.a-size-base.s-underline-text", "span[aria-label*='étoiles']", "a span.a-size-base"]:
+                text = self._first_text(card, selector)
+                if text is not None and any(char.isdigit() for char in text):
+                    reviews_raw = text
+                    break
+
+            # 4. VENDEUR
+            seller_raw = self._first_text(card, "span.a-size-base-plus.a-color-base")
+            seller_shop = self._first_text(card, "h5 span") if seller_raw is None else None
+
+            # 5. IMAGE
+            image = card.select_one("img.s-image")
+
+            raw_cards.append({
+                'asin': asin,
+                'titre': title,
+                'prix_brut': self._first_text(card, ".a-price .a-offscreen"),
+                'note_brute': rating_raw,
+                'nb_avis_brut': reviews_raw,
+                'vendeur_brut': seller_raw,
+                'boutique_brute': seller_shop,
+                'prime': card.select_one("i.a-icon-prime") is not None,
+                'disponibilite_brute': self._first_text(card, "span.a-color-price"),
+                'image_url': image.get('src') if image is not None else None
+            })
+
+        return raw_cards
+
+    def extract_product(self, raw: Dict, date_scraping: str) -> Optional[Dict]:
+        """Applique les nettoyeurs Python sur les champs bruts d'une carte"""
+        asin = raw.get('asin')
+        product_data = {
+            'asin': asin,
+            'date_scraping': date_scraping,
+            'source': 'Amazon'
+        }
+
+        # 1. TITRE
+        title = raw.get('titre')
+        if not title:
             return None
-    
-    def _handle_cookies_banner(self, page):
+        product_data['titre'] = title
+
+        # 2. PRIX
+        price_raw = raw.get('prix_brut')
+        product_data['prix_brut'] = price_raw
+        product_data['prix'] = self._clean_price(price_raw) if price_raw else None
+
+        # 3. NOTE
+        rating_raw = raw.get('note_brute')
+        product_data['note_brute'] = rating_raw
+        product_data['note'] = self._extract_rating(rating_raw) if rating_raw else None
+
+        # 4. NOMBRE D'AVIS
+        reviews_raw = raw.get('nb_avis_brut')
+        product_data['nb_avis_brut'] = reviews_raw
+        product_data['nb_avis'] = self._extract_reviews_count(reviews_raw) if reviews_raw else None
+
+        # 5. VENDEUR
+        seller = raw.get('vendeur_brut')
+        if seller is None and raw.get('boutique_brute'):
+            if "Visiter" in raw['boutique_brute']:
+                seller = raw['boutique_brute'].replace("Visiter la boutique ", "").strip()
+        product_data['vendeur'] = seller
+
+        # 6. BADGE PRIME
+        product_data['prime'] = bool(raw.get('prime'))
+
+        # 7. DISPONIBILITÉ
+        availability = "En stock"
+        avail_text = raw.get('disponibilite_brute')
+        if avail_text:
+            if "rupture" in avail_text.lower() or "indisponible" in avail_text.lower():
+                availability = "Rupture de stock"
+        product_data['disponibilite'] = availability
+
+        # 8. LIEN & IMAGE
+        product_data['lien'] = f"https://www.amazon.fr/dp/{asin}"
+        product_data['image_url'] = raw.get('image_url')
+
+        # Validation finale
+        if product_data['prix'] is not None or product_data['note'] is not None:
+            return product_data
+        return None
+
+    def handle_popups(self, page):
         try:
             if page.locator("#sp-cc-accept").is_visible(timeout=3000):
                 page.click("#sp-cc-accept")
@@ -205,196 +190,49 @@ class AmazonScraper:
                 time.sleep(1)
         except:
             pass
-    
-    def _smart_scroll(self, page):
-        """
-        Scroll intelligent CORRIGÉ.
-        Vérifie que la page est bien chargée avant de scroller pour éviter le crash.
-        """
+
+    def is_captcha(self, page) -> bool:
+        """Détecte la page de vérification anti-robot d'Amazon"""
         try:
-            # Attendre que le body de la page existe
-            page.wait_for_selector("body", timeout=5000)
-            
-            scroll_delay, _, _ = self._get_random_delays()
-            
-            # Vérification supplémentaire : le body est-il accessible ?
-            body_exists = page.evaluate("() => document.body")
-            
-            if body_exists:
-                # Scroll moitié
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2);")
-                time.sleep(scroll_delay)
-                
-                # Scroll bas
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_delay)
-                
-                # Petit remontée
-                page.evaluate("window.scrollBy(0, -300);")
-                time.sleep(0.5)
-            else:
-                logger.warning("⚠️ Corps de page introuvable (probablement un CAPTCHA). Scroll ignoré.")
-                
-        except Exception as e:
-            logger.warning(f"Erreur lors du scroll : {e}")
-    
-    def scrape(self, keyword: str, max_pages: int = 1, save_json: bool = False) -> pd.DataFrame:
-        logger.info(f"🚀 Démarrage scraping Amazon : '{keyword}' ({max_pages} pages)")
-        products = []
-        
-        with sync_playwright() as p:
-            try:
-                browser = p.chromium.launch(
-                    headless=self.headless,
-                    slow_mo=self.slow_mo,
-                    args=['--disable-blink-features=AutomationControlled', '--disable-dev-shm-usage']
-                )
-                
-                context = browser.new_context(
-                    user_agent=random.choice(USER_AGENTS),
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='fr-FR',
-                    timezone_id='Europe/Paris'
-                )
-                
-                context.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
-                page = context.new_page()
-                
-                base_url = f"https://www.amazon.fr/s?k={keyword.replace(' ', '+')}"
-                logger.info(f"🌍 Connexion à {base_url}")
-                
-                page.goto(base_url, timeout=60000, wait_until='domcontentloaded')
-                self._handle_cookies_banner(page)
-                
-                for current_page in range(1, max_pages + 1):
-                    logger.info(f"📄 Page {current_page}/{max_pages}")
-                    self.stats['pages_scraped'] += 1
-                    
-                    self._smart_scroll(page)
-                    
-                    try:
-                        page.wait_for_selector('div[data-asin]:not([data-asin=""])', timeout=10000)
-                    except PlaywrightTimeout:
-                        logger.error("Timeout : Produits non chargés (ou CAPTCHA)")
-                        break
-                    
-                    cards = page.locator('div[data-asin]:not([data-asin=""])').all()
-                    logger.info(f"   📦 {len(cards)} cartes produits détectées")
-                    
-                    for idx, card in enumerate(cards, 1):
-                        try:
-                            asin = card.get_attribute("data-asin")
-                            if not asin or len(asin) != 10:
-                                continue
-                            
-                            product = self._extract_product_data(card, asin)
-                            if product:
-                                products.append(product)
-                                if idx % 10 == 0:
-                                    logger.info(f"   ✓ {idx}/{len(cards)} produits traités")
-                        
-                        except Exception as e:
-                            logger.error(f"   ⚠️ Erreur produit #{idx}: {str(e)}")
-                            continue
-                    
-                    self.stats['total_products'] = len(products)
-                    logger.info(f"   💾 Total accumulé : {len(products)} produits")
-                    
-                    if current_page < max_pages:
-                        try:
-                            _, page_delay, _ = self._get_random_delays()
-                            next_btn = page.locator("a.s-pagination-next")
-                            if next_btn.is_visible() and next_btn.is_enabled():
-                                logger.info(f"➡️  Page {current_page + 1}...")
-                                next_btn.click()
-                                time.sleep(page_delay)
-                            else:
-                                logger.warning("🛑 Bouton 'Suivant' introuvable")
-                                break
-                        except Exception as e:
-                            logger.error(f"Erreur pagination : {e}")
-                            break
-                
-                browser.close()
-                logger.info("🔒 Navigateur fermé")
-            
-            except Exception as e:
-                logger.error(f"❌ Erreur critique : {str(e)}")
-                return pd.DataFrame()
-        
-        return self._save_data(products, keyword, save_json)
-    
-    def _save_data(self, products: List[Dict], keyword: str, save_json: bool) -> pd.DataFrame:
-        if not products:
-            logger.warning("❌ Aucun produit récupéré")
-            self._print_stats()
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(products)
-        column_order = [
-            'date_scraping', 'asin', 'titre', 'prix', 'prix_brut',
-            'note', 'note_brute', 'nb_avis', 'nb_avis_brut',
-            'vendeur', 'prime', 'disponibilite', 'lien', 'image_url', 'source'
-        ]
-        df = df[[col for col in column_order if col in df.columns]]
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_keyword = keyword.replace(' ', '_').replace('/', '_')
-        
-        csv_filename = f"amazon_{safe_keyword}_{timestamp}.csv"
-        csv_path = DATA_DIR / csv_filename
-        df.to_csv(csv_path, index=False, encoding='utf-8')
-        logger.info(f"✅ CSV sauvegardé : {csv_path}")
-        
-        if save_json:
-            json_data = {
-                'metadata': {'keyword': keyword, 'scraping_date': timestamp, 'total_products': len(df)},
-                'products': products
-            }
-            json_path = DATA_DIR / f"amazon_{safe_keyword}_{timestamp}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
-        
-        self._print_stats()
-        return df
-    
-    def _print_stats(self):
-        logger.info("\n" + "="*60)
-        logger.info("📊 STATISTIQUES DU SCRAPING")
-        logger.info("="*60)
-        logger.info(f"Pages scrapées       : {self.stats['pages_scraped']}")
-        logger.info(f"Produits trouvés     : {self.stats['total_products']}")
-        logger.info(f"Extractions réussies : {self.stats['successful_extractions']}")
-        logger.info(f"Extractions échouées : {self.stats['failed_extractions']}")
-        logger.info("="*60 + "\n")
+            return page.locator("form[action*='validateCaptcha']").count() > 0
+        except Exception:
+            return False
+
+    def total_pages(self, page) -> Optional[int]:
+        try:
+            texts = page.locator(".s-pagination-item").all_inner_texts()
+            numbers = [int(t.strip()) for t in texts if t.strip().isdigit()]
+            return max(numbers) if numbers else None
+        except Exception:
+            return None
+
+class AmazonScraper(BaseScraper):
+    """Scraper Amazon.fr : le crawl est commun (cf. base_scraper.py), le spécifique est dans AmazonAdapter"""
+
+    def __init__(self, headless: bool = False, slow_mo: int = 100, save_snapshots: bool = False,
+                 block_resources: bool = True, pacer: Optional[AdaptivePacer] = None, dedup: bool = True,
+                 pool: Optional[BrowserPool] = None):
+        super().__init__(AmazonAdapter(), headless=headless, slow_mo=slow_mo, save_snapshots=save_snapshots,
+                         block_resources=block_resources, pacer=pacer, dedup=dedup, pool=pool)
 
 def main():
     # ⚠️ headless=False pour voir si un CAPTCHA apparaît
     scraper = AmazonScraper(headless=False, slow_mo=100)
-    
+
     keywords = ["smartphone", "iphone", "samsung galaxy", "android Smartphone", "xiaomi"]
-    all_dfs = []
 
-    for keyword in keywords:
-        print(f"\n🚀 Lancement du scraping pour : {keyword}")
-        # On limite à 5  pages par mot-clé pour commencer 
-        df = scraper.scrape(keyword, max_pages=5, save_json=False)
-        
+    # On limite à 5 pages par mot-clé, 3 navigateurs en parallèle (pages chargées par URL)
+    results = scraper.scrape_many(keywords, max_pages=5, max_concurrency=3, save_json=False, pagination='url')
+
+    for keyword, df in results.items():
         if not df.empty:
             print(f"✅ {len(df)} produits récupérés pour '{keyword}'")
-            all_dfs.append(df)
         else:
             print(f"⚠️ Aucun produit pour '{keyword}'")
-    
-    if all_dfs:
-        final_df = pd.concat(all_dfs, ignore_index=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_path = DATA_DIR / f"amazon_global_{timestamp}.csv"
-        final_df.to_csv(output_path, index=False, encoding='utf-8')
-        print(f"\n✅ TERMINÉ ! Total de produits récupérés : {len(final_df)}")
-        print(f"📁 Fichier sauvegardé : {output_path}")
-    else:
+
+    # Un enregistrement par ASIN, avec la liste des mots-clés qui l'ont trouvé
+    if scraper.save_global(list(results.values())) is None:
         print("❌ Aucun produit récupéré.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
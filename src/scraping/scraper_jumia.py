@@ -1,69 +1,38 @@
 import pandas as pd
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from bs4 import BeautifulSoup, SoupStrainer
+from base_scraper import BaseScraper, SiteAdapter, BrowserPool, CrawlTask, WorkerSlot, setup_logging
+from router import JUMIA_DOMAINS
+from pacing import AdaptivePacer
+from checkpoint import CrawlCheckpoint
+from fetchers import HttpFetcher, FetchError
 import time
-import random
-import logging
-from pathlib import Path
-import sys
-from datetime import datetime
-import json
-from typing import Optional, Dict, List
-import os
-
-# --- CONFIGURATION AUTOMATIQUE DES CHEMINS (VERSION BLINDÉE) ---
-current_path = Path(__file__).resolve()
-project_root = current_path.parent
-found_root = False
-for _ in range(5):
-    if (project_root / "requirements.txt").exists():
-        found_root = True
-        break
-    project_root = project_root.parent
-
-if not found_root:
-    PROJECT_ROOT = Path.cwd()
-else:
-    PROJECT_ROOT = project_root
-
-DATA_DIR = PROJECT_ROOT / "data" / "raw"
-LOGS_DIR = PROJECT_ROOT / "logs"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
-
-# --- CONFIGURATION LOGGING ---
-sys.stdout.reconfigure(encoding='utf-8')
-log_file = LOGS_DIR / f"scraper_jumia_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger(__name__)
-
-class JumiaScraper:
-    """
-    Scraper Jumia professionnel.
-    Structure identique au scraper Amazon pour faciliter la fusion des données.
-    """
-    
-    def __init__(self, headless: bool = False, slow_mo: int = 50):
-        self.headless = headless
-        self.slow_mo = slow_mo
-        self.stats = {
-            'total_products': 0,
-            'successful_extractions': 0,
-            'failed_extractions': 0,
-            'pages_scraped': 0
-        }
-    
-    def _get_random_delays(self) -> tuple:
-        """Génère des délais aléatoires"""
-        scroll_delay = random.uniform(1.5, 3.0)
-        return scroll_delay
-    
+import re
+from typing import Optional, Dict, List, Callable
+from urllib.parse import urljoin
+
+logger = setup_logging("scraper_jumia")
+
+DOMAIN = "jumia.ma"
+BASE_URL = "https://www.jumia.ma"
+CARD_SELECTOR = "article.prd"
+# Job planifié "backend HTTP" : (HTTP_JOB, n) = page n d'un mot-clé, sans navigateur
+HTTP_JOB = 'http'
+
+class JumiaAdapter(SiteAdapter):
+    """Sélecteurs, parsing et pagination de Jumia.ma"""
+    name = 'jumia'
+    source = 'Jumia'
+    id_field = 'id_produit'
+    domain = DOMAIN
+    base_url = BASE_URL
+    allowed_domains = JUMIA_DOMAINS
+    card_selector = CARD_SELECTOR
+    next_selector = "a[aria-label='Page suivante']"
+    # Jumia garde parfois des cartes en chargement : on extrait ce qui est là
+    parse_on_timeout = True
+    timezone_id = 'Africa/Casablanca'
+    column_order = ['date_scraping', 'source', 'titre', 'prix', 'prix_brut', 'note', 'nb_avis', 'lien', 'id_produit']
+
     def _clean_price(self, price_text: str) -> Optional[float]:
         """Convertit '1 500.00 Dhs' en 1500.00"""
         if not price_text:
@@ -85,7 +54,65 @@ class JumiaScraper:
         except:
             return None
 
-    def _handle_popup(self, page):
+    def build_page_path(self, keyword: str, page_number: int) -> str:
+        """Chemin d'une page de résultats (pagination par URL)"""
+        path = f"/catalog/?q={keyword.replace(' ', '+')}"
+        return path if page_number == 1 else f"{path}&page={page_number}"
+
+    def build_page_url(self, keyword: str, page_number: int) -> str:
+        return urljoin(BASE_URL, self.build_page_path(keyword, page_number))
+
+    def parse_cards(self, html: str) -> List[Dict]:
+        """
+        Parse le HTML d'une page de résultats Jumia en local (lxml) et retourne
+        les champs bruts des cartes. Utilisé en live comme en replay de snapshots.
+        """
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('article'))
+
+        # Sélecteurs Jumia
+        cards = soup.select("article.prd._fb.col.c-prd")
+        if not cards:
+            cards = soup.select("article.prd")
+
+        raw_cards = []
+        for card in cards:
+            # Lien & ID
+            link_el = card.select_one("a.core")
+            if link_el is None: continue
+
+            relative_link = link_el.get("href")
+            title_el = card.select_one("h3.name")
+            price_el = card.select_one("div.prc")
+            rating_el = card.select_one("div.stars._s")
+            raw_cards.append({
+                "id_produit": card.get("data-id") or relative_link,
+                "lien": f"https://www.jumia.ma{relative_link}",
+                "titre": title_el.get_text() if title_el is not None else "Inconnu",
+                "prix_brut": price_el.get_text() if price_el is not None else None,
+                "note_brute": rating_el.get_text() if rating_el is not None else None
+            })
+
+        return raw_cards
+
+    def extract_product(self, raw: Dict, date_scraping: str) -> Optional[Dict]:
+        price = self._clean_price(raw['prix_brut'])
+
+        # On garde le produit si on a un titre et un prix
+        if raw['titre'] == "Inconnu" or not price:
+            return None
+        return {
+            "date_scraping": date_scraping,
+            "source": "Jumia",
+            "titre": raw['titre'],
+            "prix": price,
+            "prix_brut": raw['prix_brut'],
+            "note": self._extract_rating(raw['note_brute']),
+            "nb_avis": 0, # Jumia n'affiche pas le nb d'avis sur la liste facilement
+            "lien": raw['lien'],
+            "id_produit": raw['id_produit']
+        }
+
+    def handle_popups(self, page):
         """Ferme la pop-up Newsletter de Jumia si elle apparaît"""
         try:
             popup_closers = [
@@ -93,7 +120,7 @@ class JumiaScraper:
                 "#pop button.cls",
                 ".newsletter_popup .close"
             ]
-            
+
             for selector in popup_closers:
                 if page.locator(selector).is_visible(timeout=2000):
                     logger.info("🧹 Fermeture de la pop-up Jumia...")
@@ -103,161 +130,173 @@ class JumiaScraper:
         except:
             pass
 
-    def _smart_scroll(self, page):
+    def is_captcha(self, page) -> bool:
+        """Détecte une page de challenge anti-robot (Cloudflare)"""
+        try:
+            return page.locator("#challenge-form, #cf-challenge-running, iframe[src*='challenges']").count() > 0
+        except Exception:
+            return False
+
+    def total_pages_html(self, html: str) -> Optional[int]:
+        """Nombre de pages d'après le lien 'Dernière page' du HTML brut"""
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('a', attrs={'aria-label': True}))
+        last = soup.select_one("a[aria-label='Dernière page']")
+        match = re.search(r'[?&]page=(\d+)', last.get('href', '') if last is not None else '')
+        return int(match.group(1)) if match else None
+
+    def total_pages(self, page) -> Optional[int]:
+        try:
+            href = page.locator("a[aria-label='Dernière page']").first.get_attribute("href", timeout=2000)
+            match = re.search(r'[?&]page=(\d+)', href or '')
+            return int(match.group(1)) if match else None
+        except Exception:
+            return None
+
+    def next_page_url(self, page) -> Optional[str]:
+        try:
+            next_btn = page.locator(self.next_selector)
+            if not next_btn.is_visible():
+                return None
+            href = next_btn.first.get_attribute("href")
+            return urljoin(BASE_URL, href) if href else None
+        except Exception:
+            return None
+
+class JumiaScraper(BaseScraper):
+    """
+    Scraper Jumia professionnel.
+    Crawl commun avec Amazon (cf. base_scraper.py) pour faciliter la fusion des
+    données, plus un backend HTTP sans navigateur pour le catalogue rendu côté serveur.
+    """
+    spawns_jobs = True
+
+    def __init__(self, headless: bool = False, slow_mo: int = 50, save_snapshots: bool = False,
+                 block_resources: bool = True, pacer: Optional[AdaptivePacer] = None,
+                 backend: str = 'auto', http_base_url: str = BASE_URL, dedup: bool = True,
+                 pool: Optional[BrowserPool] = None):
+        super().__init__(JumiaAdapter(), headless=headless, slow_mo=slow_mo, save_snapshots=save_snapshots,
+                         block_resources=block_resources, pacer=pacer, dedup=dedup, pool=pool)
+        # Backend de récupération : 'http' (client poolé, sans navigateur),
+        # 'browser' (Playwright) ou 'auto' (HTTP puis escalade vers Playwright)
+        self.backend = backend
+        self.http_base_url = http_base_url
+        # Un seul client HTTP pour tous les mots-clés : les connexions keep-alive
+        # sont réutilisées d'une page et d'un mot-clé à l'autre (fermé par scrape_many / close)
+        self.fetcher = HttpFetcher(http_base_url) if backend in ('http', 'auto') else None
+        self.stats.update({'http_pages': 0, 'browser_escalations': 0})
+
+    def _fetch_http(self, keyword: str, page_number: int, run_id: str, checkpoint: CrawlCheckpoint) -> bool:
         """
-        Scroll intelligent sécurisé (Identique à Amazon)
+        Backend HTTP : une page récupérée par URL avec le client poolé, sans navigateur.
+        Retourne False si la page est à escalader vers Playwright (échec, CAPTCHA, page vide).
         """
         try:
-            page.wait_for_selector("body", timeout=5000)
-            scroll_delay = self._get_random_delays()
-            
-            body_exists = page.evaluate("() => document.body")
-            if body_exists:
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2);")
-                time.sleep(scroll_delay)
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_delay)
-        except Exception as e:
-            logger.warning(f"Erreur scroll Jumia : {e}")
-
-    def scrape(self, keyword: str, max_pages: int = 1) -> pd.DataFrame:
-        logger.info(f"🚀 Démarrage scraping Jumia : '{keyword}'")
-        products = []
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless, slow_mo=self.slow_mo)
-            page = browser.new_page()
-            
-            base_url = f"https://www.jumia.ma/catalog/?q={keyword.replace(' ', '+')}"
-            logger.info(f"🌍 Connexion à {base_url}")
-            page.goto(base_url, timeout=60000)
-            
-            self._handle_popup(page)
-            
-            for current_page in range(1, max_pages + 1):
-                logger.info(f"📄 Page {current_page}/{max_pages}")
-                self.stats['pages_scraped'] += 1
-                
-                # Scroll sécurisé
-                self._smart_scroll(page)
-                time.sleep(1) # Pause supplémentaire pour Jumia qui est parfois lent à charger les images
-                
-                # Sélecteurs Jumia
-                cards = page.locator("article.prd._fb.col.c-prd").all()
-                if not cards:
-                    cards = page.locator("article.prd").all()
-                
-                logger.info(f"   📦 {len(cards)} produits détectés")
-                
-                for card in cards:
-                    try:
-                        # Lien & ID
-                        link_el = card.locator("a.core")
-                        if not link_el.count(): continue
-                        
-                        relative_link = link_el.get_attribute("href")
-                        full_link = f"https://www.jumia.ma{relative_link}"
-                        data_id = card.get_attribute("data-id") or relative_link
-                        
-                        # Titre
-                        title = "Inconnu"
-                        if card.locator("h3.name").count():
-                            title = card.locator("h3.name").first.inner_text()
-                        
-                        # Prix
-                        price_raw = None
-                        if card.locator("div.prc").count():
-                            price_raw = card.locator("div.prc").first.inner_text()
-                            
-                        # Note
-                        rating_raw = None
-                        if card.locator("div.stars._s").count():
-                            rating_raw = card.locator("div.stars._s").first.inner_text()
-                        
-                        # Nettoyage
-                        price = self._clean_price(price_raw)
-                        rating = self._extract_rating(rating_raw)
-                        
-                        # On garde le produit si on a un titre et un prix
-                        if title != "Inconnu" and price:
-                            products.append({
-                                "date_scraping": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                "source": "Jumia",
-                                "titre": title,
-                                "prix": price,
-                                "prix_brut": price_raw,
-                                "note": rating,
-                                "nb_avis": 0, # Jumia n'affiche pas le nb d'avis sur la liste facilement
-                                "lien": full_link,
-                                "id_produit": data_id
-                            })
-                            self.stats['successful_extractions'] += 1
-                            
-                    except Exception as e:
-                        self.stats['failed_extractions'] += 1
-                        continue
-                
-                # Pagination
-                if current_page < max_pages:
-                    next_btn = page.locator("a[aria-label='Page suivante']")
-                    if next_btn.is_visible():
-                        logger.info("➡️ Page suivante...")
-                        next_btn.click()
-                        time.sleep(3)
-                    else:
-                        logger.info("🛑 Fin de pagination")
-                        break
-            
-            browser.close()
-
-        # Sauvegarde individuelle par mot-clé
-        if products:
-            df = pd.DataFrame(products)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_keyword = keyword.replace(' ', '_')
-            filename = f"jumia_{safe_keyword}_{timestamp}.csv"
-            output_path = DATA_DIR / filename
-            
-            df.to_csv(output_path, index=False, encoding='utf-8')
-            logger.info(f"✅ SUCCÈS : {len(df)} produits sauvegardés dans {output_path}")
-            return df
+            self.pacer.acquire(DOMAIN)
+            html = self.fetcher.fetch(self.adapter.build_page_path(keyword, page_number))
+        except FetchError as e:
+            logger.warning(f"🌐 [{keyword}] p{page_number} : {e}")
+            if e.captcha:
+                self.pacer.report_captcha(DOMAIN)
+            return False
+        self.pacer.report_success(DOMAIN)
+        if page_number == 1:
+            total_pages = self.adapter.total_pages_html(html)
+            if total_pages:
+                checkpoint.set_total_pages(total_pages)
+        # Une page sans aucune carte est suspecte (rendu JS, page de blocage)
+        if not self._process_html(html, keyword, page_number, run_id, checkpoint, keep_empty=False):
+            return False
+        self._bump_stat('http_pages')
+        return True
+
+    def plan_jobs(self, task: CrawlTask) -> List:
+        """
+        Avec le backend 'http'/'auto', un mot-clé commence par des jobs HTTP (sans
+        navigateur) : la page 1 seule (elle annonce le nombre de pages), ou les
+        pages manquantes d'un run repris.
+        """
+        checkpoint = task.checkpoint
+        if self.backend in ('http', 'auto') and not checkpoint.state['done']:
+            checkpoint.prepare_resume()
+            missing = self._plan_url_pages(task.max_pages, checkpoint)
+            if not missing:
+                checkpoint.mark_done()
+            return [(HTTP_JOB, n) for n in ([1] if 1 in missing else missing)]
+        return super().plan_jobs(task)
+
+    def run_job(self, slot: WorkerSlot, task: CrawlTask, spec, enqueue: Callable):
+        """
+        Job HTTP (HTTP_JOB, n) : une page. Les pages 2..N sont ajoutées à la file
+        commune du scheduler : même borne de concurrence et même pacer que les
+        pages du navigateur. En 'auto', une page en échec est escaladée vers
+        Playwright (job par URL) ; si la page 1 échoue, le mot-clé repart en mode URL.
+        """
+        if not (isinstance(spec, tuple) and spec[0] == HTTP_JOB):
+            return super().run_job(slot, task, spec, enqueue)
+
+        page_number, checkpoint = spec[1], task.checkpoint
+        if self._fetch_http(task.keyword, page_number, task.run_id, checkpoint):
+            if page_number == 1:
+                for n in self._plan_url_pages(task.max_pages, checkpoint):
+                    enqueue((HTTP_JOB, n))
+            if not self._plan_url_pages(task.max_pages, checkpoint):
+                checkpoint.mark_done()
+        elif self.backend == 'auto':
+            logger.warning(f"🔁 [{task.keyword}] Escalade vers le navigateur pour la page {page_number}")
+            self._bump_stat('browser_escalations')
+            if page_number == 1:
+                checkpoint.reset()
+            enqueue(page_number)
         else:
-            logger.warning("❌ Aucun produit trouvé.")
-            return pd.DataFrame()
+            logger.error(f"❌ [{task.keyword}] Page {page_number} non récupérée en HTTP")
+
+    def scrape_many(self, keywords: List[str], max_pages: int = 1, max_concurrency: int = 3,
+                    save_json: bool = False, resume: bool = False, pagination: str = 'click') -> Dict[str, pd.DataFrame]:
+        try:
+            return super().scrape_many(keywords, max_pages, max_concurrency, save_json, resume, pagination)
+        finally:
+            self.close()
+
+    def close(self):
+        """Ferme les connexions du client HTTP (il les rouvre à la demande s'il resert)"""
+        if self.fetcher is not None:
+            self.fetcher.close()
+
+    def scrape(self, keyword: str, max_pages: int = 1, resume: bool = False,
+               pagination: str = 'click', max_concurrency: int = 3) -> pd.DataFrame:
+        """
+        Scrape un mot-clé (cf. BaseScraper.scrape).
+        Avec le backend 'http'/'auto', les pages sont d'abord récupérées sans
+        navigateur ; en 'auto', les pages en échec sont escaladées vers Playwright.
+        """
+        logger.info(f"🚀 Démarrage scraping Jumia : '{keyword}' (backend {self.backend})")
+        return self.scrape_many([keyword], max_pages, max_concurrency, resume=resume, pagination=pagination)[keyword]
+
+    def _print_stats(self):
+        super()._print_stats()
+        received = self.fetcher.bytes_received / 1024 if self.fetcher is not None else 0
+        logger.info(f"Pages HTTP : {self.stats['http_pages']} ({received:.0f} Ko reçus) | "
+                    f"Escalades navigateur : {self.stats['browser_escalations']}")
 
 def main():
     # ⚠️ headless=False pour vérifier le bon fonctionnement
     scraper = JumiaScraper(headless=False, slow_mo=100)
-    
+
     # Liste des mots-clés (cohérente avec Amazon)
     keywords = ["smartphone", "iphone", "samsung galaxy", "android phone", "xiaomi"]
-    
-    all_dfs = [] 
-
-    for keyword in keywords:
-        print(f"\n🚀 Lancement du scraping Jumia pour : {keyword}")
-        # On limite à 5 pages par mot-clé 
-        df = scraper.scrape(keyword, max_pages=5)
-        
+
+    # On limite à 5 pages par mot-clé (pages 2..5 chargées en parallèle par URL)
+    results = scraper.scrape_many(keywords, max_pages=5, pagination='url')
+
+    for keyword, df in results.items():
         if not df.empty:
             print(f"✅ {len(df)} produits récupérés pour '{keyword}'")
-            all_dfs.append(df)
         else:
             print(f"⚠️ Aucun produit pour '{keyword}'")
-    
-    # Fusionner tous les résultats
-    if all_dfs:
-        final_df = pd.concat(all_dfs, ignore_index=True)
-        
-        # Sauvegarde finale
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_path = DATA_DIR / f"jumia_global_{timestamp}.csv"
-        final_df.to_csv(output_path, index=False, encoding='utf-8')
-        
-        print(f"\n✅ TERMINÉ ! Total de produits récupérés : {len(final_df)}")
-        print(f"📁 Fichier sauvegardé : {output_path}")
-    else:
+
+    # Un enregistrement par produit, avec la liste des mots-clés qui l'ont trouvé
+    if scraper.save_global(list(results.values())) is None:
         print("❌ Aucun produit récupéré.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
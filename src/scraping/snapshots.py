@@ -0,0 +1,93 @@
+"""
+Stockage des snapshots HTML des pages de résultats.
+Chaque page scrapée peut être sauvegardée compressée (gzip) puis rejouée
+hors-ligne, sans réseau ni navigateur, par les méthodes replay() des scrapers.
+
+Arborescence : <racine>/<site>/<mot_cle>/<run>_p<page>.html.gz
+"""
+
+import gzip
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def safe_name(keyword: str) -> str:
+    """Nom de dossier/fichier sûr pour un mot-clé"""
+    return keyword.replace(' ', '_').replace('/', '_')
+
+
+class SnapshotStore:
+    """Magasin de snapshots HTML compressés, organisé par site et mot-clé"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def new_run_id(self) -> str:
+        """Identifiant de run (horodatage) partagé par les pages d'un même scraping"""
+        return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    def _keyword_dir(self, site: str, keyword: str) -> Path:
+        return self.root / site.lower() / safe_name(keyword)
+
+    def save(self, site: str, keyword: str, run_id: str, page_number: int, html: str) -> Path:
+        """Sauvegarde le HTML d'une page (compressé) et retourne son chemin"""
+        keyword_dir = self._keyword_dir(site, keyword)
+        with self._lock:
+            keyword_dir.mkdir(parents=True, exist_ok=True)
+            meta_path = keyword_dir / "meta.json"
+            if not meta_path.exists():
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump({'site': site, 'keyword': keyword}, f, ensure_ascii=False)
+
+        path = keyword_dir / f"{run_id}_p{page_number:03d}.html.gz"
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(html)
+        logger.info(f"   📸 Snapshot sauvegardé : {path.name}")
+        return path
+
+    def keywords(self, site: str) -> List[str]:
+        """Liste des mots-clés (d'origine) disponibles pour un site"""
+        keywords = []
+        site_dir = self.root / site.lower()
+        if not site_dir.exists():
+            return keywords
+        for meta_path in sorted(site_dir.glob("*/meta.json")):
+            with open(meta_path, encoding='utf-8') as f:
+                keywords.append(json.load(f)['keyword'])
+        return keywords
+
+    def runs(self, site: str, keyword: str) -> List[str]:
+        """Identifiants de runs disponibles pour un mot-clé, du plus ancien au plus récent"""
+        files = self._keyword_dir(site, keyword).glob("*_p*.html.gz")
+        return sorted({f.name.rsplit('_p', 1)[0] for f in files})
+
+    def iter_pages(self, site: str, keyword: str, run_id: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Itère sur les pages d'un run (le plus récent par défaut), dans l'ordre.
+        Chaque élément : {'keyword', 'run_id', 'page', 'date_scraping', 'html'}
+        """
+        runs = self.runs(site, keyword)
+        if not runs:
+            logger.warning(f"⚠️ Aucun snapshot pour {site} / '{keyword}'")
+            return
+        run_id = run_id or runs[-1]
+        date_scraping = datetime.strptime(run_id, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
+
+        for path in sorted(self._keyword_dir(site, keyword).glob(f"{run_id}_p*.html.gz")):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                html = f.read()
+            yield {
+                'keyword': keyword,
+                'run_id': run_id,
+                'page': int(path.name[:-len('.html.gz')].rsplit('_p', 1)[1]),
+                'date_scraping': date_scraping,
+                'html': html
+            }
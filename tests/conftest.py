@@ -0,0 +1,97 @@
+"""
+Configuration commune des tests : les modules du projet sont des scripts à
+plat (imports entre voisins), leurs dossiers sont donc ajoutés au chemin.
+"""
+
+import logging
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+for folder in ("scraping", "cleaning", "analysis"):
+    sys.path.insert(0, str(PROJECT_ROOT / "src" / folder))
+
+# Un handler sur le logger racine : setup_logging() ne crée alors pas de fichier dans logs/
+logging.getLogger().addHandler(logging.NullHandler())
+
+
+@pytest.fixture
+def snapshot_store():
+    """Snapshots HTML figés (un mot-clé 'smartphone' par site, run 20261017_120000)"""
+    from snapshots import SnapshotStore
+    return SnapshotStore(FIXTURES_DIR / "snapshots")
+
+
+class StubCatalogServer:
+    """
+    Serveur HTTP local (thread en arrière-plan, keep-alive HTTP/1.1) pour tester
+    le backend HTTP hors-ligne. `pages` associe un numéro de page (paramètre
+    ?page=N, 1 par défaut) à son HTML, ou bien `page_source(query)` calcule le
+    HTML à partir de la query string. Une page absente répond 404.
+    """
+
+    def __init__(self, pages: Optional[Dict[int, str]] = None,
+                 page_source: Optional[Callable[[Dict], Optional[str]]] = None):
+        self.pages = pages or {}
+        self.page_source = page_source
+        self.requests_served = 0
+        # Connexions TCP distinctes vues par le serveur (réutilisation du pool du client)
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                if stub.page_source is not None:
+                    html = stub.page_source(query)
+                else:
+                    html = stub.pages.get(int(query.get('page', ['1'])[0]))
+                stub.requests_served += 1
+                stub.connections.add(self.client_address)
+                body = (html or 'Not Found').encode('utf-8')
+                self.send_response(200 if html is not None else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> 'StubCatalogServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def catalog_server():
+    """catalog_server(pages) / catalog_server(page_source=...) : serveurs démarrés, arrêtés en fin de test"""
+    servers = []
+
+    def start(pages=None, page_source=None) -> StubCatalogServer:
+        servers.append(StubCatalogServer(pages, page_source).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
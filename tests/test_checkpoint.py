@@ -0,0 +1,55 @@
+"""Relecture des checkpoints de scraping (types des identifiants et prix bruts, lectures concurrentes)"""
+
+import threading
+
+from checkpoint import CrawlCheckpoint
+
+
+def _product(product_id: str, prix_brut: str) -> dict:
+    return {'source': 'Jumia', 'titre': 'Redmi 13C', 'prix': 1249.0, 'prix_brut': prix_brut,
+            'id_produit': product_id}
+
+
+def test_load_keeps_leading_zeros(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path, 'jumia', 'smartphone')
+    checkpoint.append_page(2, [_product('00123', '0099')])
+    checkpoint.append_page(1, [_product('0045', '1 249 Dhs')])
+
+    df = CrawlCheckpoint(tmp_path, 'jumia', 'smartphone').load()
+
+    assert df['id_produit'].tolist() == ['0045', '00123']
+    assert df['prix_brut'].tolist() == ['1 249 Dhs', '0099']
+
+
+def test_prepare_resume_trims_orphans_without_losing_zeros(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path, 'jumia', 'smartphone')
+    checkpoint.append_page(1, [_product('0045', '1 249 Dhs')], next_url='https://www.jumia.ma/catalog/?q=x&page=2')
+    # Ligne écrite sans mise à jour de l'état (crash entre les deux écritures)
+    with open(checkpoint.data_path, 'a', encoding='utf-8') as f:
+        f.write('Jumia,Orphelin,10.0,10 Dhs,0999,2\n')
+
+    resumed = CrawlCheckpoint(tmp_path, 'jumia', 'smartphone')
+    assert resumed.prepare_resume() == (1, 'https://www.jumia.ma/catalog/?q=x&page=2')
+    assert resumed.load()['id_produit'].tolist() == ['0045']
+
+
+def test_reads_wait_for_a_concurrent_append(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path, 'jumia', 'smartphone')
+    checkpoint.append_page(1, [_product('0045', '1 249 Dhs')])
+    results = {}
+    readers = [threading.Thread(target=lambda: results.update(rows=checkpoint.rows)),
+               threading.Thread(target=lambda: results.update(pages=checkpoint.pages_done())),
+               threading.Thread(target=lambda: results.update(missing=checkpoint.missing_pages(3)))]
+
+    # Un worker est en train d'ajouter la page 2 (verrou tenu) : les lectures attendent
+    with checkpoint._lock:
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join(timeout=0.2)
+        assert all(reader.is_alive() for reader in readers)
+        checkpoint.state['pages']['2'] = {'rows': 3, 'next_url': None}
+    for reader in readers:
+        reader.join()
+
+    assert results == {'rows': 4, 'pages': [1, 2], 'missing': [3]}
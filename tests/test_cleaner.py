@@ -0,0 +1,211 @@
+"""
+Nettoyage hors-ligne des fichiers bruts : même dataset quel que soit le
+découpage (chunks, processus), et intégration incrémentale (manifeste).
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cleaner
+from cleaner import DataCleaner, RawManifest
+
+TITLES = [
+    "Samsung Galaxy A15 Smartphone 128Go", "Xiaomi Redmi Note 13 Smartphone 256Go", "Apple iPhone 15 128 Go",
+    "Google Pixel 8 Pro 128 Go", "OnePlus Nord CE 3 Lite 5G", "Coque de protection iPhone 13",
+    "Chargeur rapide 25W Samsung USB-C", "Smartphone Android débloqué 6,5 pouces", "Nokia G21 4Go/128Go",
+    "Samsung Galaxy S21 + Coque offerte", "Realme C65 Smartphone 256Go", None,
+]
+
+
+def raw_products(source: str, n: int, seed: int) -> pd.DataFrame:
+    """Produits bruts tels qu'écrits par les scrapers (prix manquants, sous le seuil, ids à zéros de tête)"""
+    rng = np.random.default_rng(seed)
+    prix = rng.choice([np.nan, 25.0, 129.0, 899.9, 1599.0, 12999.0], size=n)
+    df = pd.DataFrame({
+        'date_scraping': [f"2026-10-{1 + i % 17:02d} 12:00:00" for i in range(n)],
+        'titre': rng.choice(np.array(TITLES, dtype=object), size=n),
+        'prix': prix,
+        'note': rng.choice([np.nan, 3.5, 4.4, 5.0], size=n),
+        'nb_avis': rng.choice([np.nan, 0, 12, 1234], size=n),
+        'lien': [f"https://example.test/{i}" for i in range(n)],
+        'source': source,
+    })
+    ids = [f"{i % (n - 20):06d}" for i in range(n)]        # quelques doublons
+    if source == 'Amazon':
+        return df.assign(asin=ids)
+    return df.assign(id_produit=ids)
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """data/raw et data/processed dans un dossier temporaire"""
+    raw_dir, processed_dir = tmp_path / 'raw', tmp_path / 'processed'
+    raw_dir.mkdir()
+    processed_dir.mkdir()
+    monkeypatch.setattr(cleaner, 'RAW_DIR', raw_dir)
+    monkeypatch.setattr(cleaner, 'PROCESSED_DIR', processed_dir)
+    return raw_dir, processed_dir
+
+
+@pytest.fixture
+def raw_files(data_dirs):
+    raw_dir, processed_dir = data_dirs
+    raw_products('Amazon', 400, seed=1).to_csv(raw_dir / 'amazon_global_20261017.csv', index=False)
+    raw_products('Jumia', 400, seed=2).to_csv(raw_dir / 'jumia_global_20261017.csv', index=False)
+    return processed_dir
+
+
+def run_cleaner(processed_dir, **options):
+    """Octets du CSV publié et dataset Parquet relu, pour un run(**options)"""
+    output_file = DataCleaner(cache_path=None, history_dir=None).run(**options)
+    return output_file.read_bytes(), pd.read_parquet(processed_dir / 'products_cleaned.parquet')
+
+
+@pytest.fixture
+def reference(raw_files):
+    return run_cleaner(raw_files)
+
+
+def test_reference_run_keeps_only_priced_smartphones(reference):
+    _, df = reference
+    assert len(df) > 0
+    assert set(df['category'].astype(str)) == {'smartphone'}
+    assert df['prix'].min() >= cleaner.PRICE_THRESHOLD
+    assert 'Unknown' not in set(df['brand'].astype(str))
+    assert df['id_produit'].str.len().eq(6).all()
+
+
+@pytest.mark.parametrize('chunksize', [37, 400, 1000])
+def test_chunked_run_matches_in_memory_run(raw_files, reference, chunksize):
+    csv_bytes, df = run_cleaner(raw_files, chunksize=chunksize)
+    assert csv_bytes == reference[0]
+    pd.testing.assert_frame_equal(df, reference[1])
+
+
+@pytest.mark.parametrize('workers, chunksize', [(2, 37), (3, 50), (2, None)])
+def test_parallel_run_matches_sequential_run(raw_files, reference, workers, chunksize):
+    # Lots nettoyés par un pool de processus, collectés dans l'ordre des lots
+    csv_bytes, df = run_cleaner(raw_files, chunksize=chunksize, workers=workers)
+    assert csv_bytes == reference[0]
+    pd.testing.assert_frame_equal(df, reference[1])
+
+
+def test_parallel_report_matches_sequential_report(raw_files):
+    sequential = DataCleaner(cache_path=None, history_dir=None)
+    sequential.run(chunksize=37)
+    parallel = DataCleaner(cache_path=None, history_dir=None)
+    parallel.run(chunksize=37, workers=2)
+
+    # Compteurs cumulés depuis les processus (les temps mis à part)
+    drop_timings = lambda report: {key: value for key, value in report.items() if key != 'timings'}
+    assert drop_timings(parallel.report) == drop_timings(sequential.report)
+
+
+# --- MODE INCRÉMENTAL (RawManifest + run_incremental) ---
+
+def jumia_file(raw_dir, name, products, mtime):
+    """Fichier brut Jumia : products = [(id_produit, titre, prix MAD)], daté de mtime (secondes)"""
+    path = raw_dir / name
+    pd.DataFrame([{'date_scraping': '2026-10-17 12:00:00', 'titre': titre, 'prix': prix, 'note': 4.0,
+                   'nb_avis': 3, 'lien': f"https://www.jumia.ma/{pid}.html", 'source': 'Jumia',
+                   'id_produit': pid} for pid, titre, prix in products]).to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def incremental(data_dirs, monkeypatch):
+    """run_incremental() sur les dossiers temporaires ; .reads : fichiers bruts relus à chaque run"""
+    raw_dir, processed_dir = data_dirs
+    reads = []
+    read_raw = DataCleaner._read_raw
+
+    def recording(self, path):
+        reads.append(path.name)
+        return read_raw(self, path)
+
+    monkeypatch.setattr(DataCleaner, '_read_raw', recording)
+
+    def run():
+        reads.clear()
+        output_file = DataCleaner(cache_path=None, history_dir=None).run_incremental(
+            output_file=processed_dir / 'products_cleaned.csv', manifest_path=processed_dir / 'raw_manifest.json')
+        return pd.read_csv(output_file, dtype={'id_produit': str})
+
+    run.reads = reads
+    run.manifest_path = processed_dir / 'raw_manifest.json'
+    return run
+
+
+def test_unchanged_file_is_skipped(data_dirs, incremental):
+    raw_dir, _ = data_dirs
+    jumia_file(raw_dir, 'jumia_20261016.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1599')], mtime=1_000)
+    jumia_file(raw_dir, 'jumia_20261017.csv', [('002', 'Xiaomi Redmi 13C Smartphone', '1249')], mtime=2_000)
+
+    assert sorted(incremental()['id_produit']) == ['001', '002']
+    # Lecture parallèle (ThreadPool) : les deux fichiers sont lus
+    assert sorted(incremental.reads) == ['jumia_20261016.csv', 'jumia_20261017.csv']
+
+    assert sorted(incremental()['id_produit']) == ['001', '002']
+    assert incremental.reads == []
+
+
+def test_touched_file_with_same_content_is_skipped(data_dirs, incremental):
+    raw_dir, _ = data_dirs
+    path = jumia_file(raw_dir, 'jumia_20261017.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1599')], mtime=1_000)
+    incremental()
+
+    os.utime(path, (5_000, 5_000))          # "touch" : date modifiée, contenu identique
+    assert incremental()['id_produit'].tolist() == ['001']
+    assert incremental.reads == []
+    # Nouvelle date mémorisée : le fichier n'est même plus haché au run suivant
+    assert RawManifest(incremental.manifest_path).entries[path.name]['mtime'] == 5_000 * 10 ** 9
+
+
+def test_modified_file_is_reingested(data_dirs, incremental):
+    raw_dir, _ = data_dirs
+    jumia_file(raw_dir, 'jumia_20261017.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1599')], mtime=1_000)
+    incremental()
+
+    jumia_file(raw_dir, 'jumia_20261017.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1599'),
+                                               ('003', 'Realme C65 Smartphone', '1699')], mtime=2_000)
+    assert sorted(incremental()['id_produit']) == ['001', '003']
+    assert incremental.reads == ['jumia_20261017.csv']
+
+
+def test_upsert_keeps_the_most_recent_row(data_dirs, incremental):
+    raw_dir, _ = data_dirs
+    jumia_file(raw_dir, 'jumia_20261016.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1100'),
+                                               ('002', 'Xiaomi Redmi 13C Smartphone', '1249')], mtime=1_000)
+    incremental()
+    # Même (id_produit, source) dans un fichier plus récent : la nouvelle ligne remplace l'ancienne
+    jumia_file(raw_dir, 'jumia_20261017.csv', [('001', 'Samsung Galaxy A15 Smartphone', '2200')], mtime=2_000)
+
+    df = incremental().set_index('id_produit')
+
+    assert sorted(df.index) == ['001', '002']
+    assert df.loc['001', 'prix_origine'] == 2200
+    assert df.loc['002', 'prix_origine'] == 1249
+
+
+def test_manifest_is_persisted_and_unreadable_files_are_retried(data_dirs, incremental):
+    raw_dir, _ = data_dirs
+    good = jumia_file(raw_dir, 'jumia_20261016.csv', [('001', 'Samsung Galaxy A15 Smartphone', '1599')],
+                      mtime=1_000)
+    bad = raw_dir / 'jumia_20261017.csv'
+    bad.write_bytes(b'\xff\xfe\x00 pas un csv \x00')
+    incremental()
+
+    entries = json.loads(incremental.manifest_path.read_text(encoding='utf-8'))
+    assert list(entries) == [good.name]
+    assert entries[good.name]['rows'] == 1
+    assert entries[good.name]['sha1'] == hashlib.sha1(good.read_bytes()).hexdigest()
+
+    # Le fichier illisible n'est pas marqué : il est retenté au run suivant
+    incremental()
+    assert incremental.reads == [bad.name]
@@ -0,0 +1,71 @@
+"""Conversion des prix en euros au taux en vigueur à la date de scraping"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from currency import RATES_FILE, load_rates, to_eur
+
+
+@pytest.fixture
+def rates_path(tmp_path):
+    path = tmp_path / 'exchange_rates.csv'
+    path.write_text("date,devise,unites_par_eur\n"
+                    "2026-01-01,MAD,10\n"
+                    "2026-06-01,MAD,12.5\n", encoding='utf-8')
+    return path
+
+
+def prices(dates, prix=1000.0, **columns) -> pd.DataFrame:
+    return pd.DataFrame({'date': dates, 'prix': prix, **columns})
+
+
+def test_shipped_table_is_readable():
+    rates = load_rates(RATES_FILE)
+    assert list(rates.columns) == ['date', 'devise', 'unites_par_eur']
+    assert (rates.loc[rates['devise'] == 'MAD', 'unites_par_eur'] > 0).all()
+
+
+def test_rate_in_force_at_scrape_date(rates_path):
+    df = to_eur(prices(['2026-03-15 12:00:00', '2026-06-01 00:00:00', '2026-10-17 09:30:00']), 'MAD',
+                rates_path=rates_path)
+    # Avant le 1er juin : 10 MAD/€ ; à partir du 1er juin : 12,5 MAD/€
+    assert df['prix'].tolist() == [100.0, 80.0, 80.0]
+    assert df['prix_origine'].tolist() == [1000.0] * 3
+    assert df['devise_origine'].tolist() == ['MAD'] * 3
+
+
+def test_rows_keep_their_order(rates_path):
+    df = to_eur(prices(['2026-10-17', '2026-02-01', '2026-07-01'], prix=[250.0, 500.0, 1000.0]), 'MAD',
+                rates_path=rates_path)
+    assert df['prix'].tolist() == [20.0, 50.0, 80.0]
+
+
+def test_date_before_first_rate_uses_first_rate(rates_path):
+    df = to_eur(prices(['2019-05-01 10:00:00']), 'MAD', rates_path=rates_path)
+    assert df['prix'].tolist() == [100.0]
+
+
+def test_missing_date_uses_latest_rate(rates_path):
+    df = to_eur(prices([None, 'pas une date']), 'MAD', rates_path=rates_path)
+    assert df['prix'].tolist() == [80.0, 80.0]
+
+
+def test_unknown_currency_left_empty_with_warning(rates_path, capsys):
+    df = to_eur(prices(['2026-03-15', '2026-03-15'], devise_origine=['USD', 'MAD']), 'MAD', rates_path=rates_path)
+    assert np.isnan(df['prix'].iloc[0])
+    assert df['prix'].iloc[1] == 100.0
+    assert "Aucun taux de change pour : USD" in capsys.readouterr().out
+
+
+def test_euro_prices_unchanged(rates_path):
+    df = to_eur(prices(['2026-03-15'], prix=799.0), 'EUR', rates_path=rates_path)
+    assert df['prix'].tolist() == [799.0]
+    assert df['devise_origine'].tolist() == ['EUR']
+
+
+def test_conversion_is_idempotent(rates_path):
+    once = to_eur(prices(['2026-03-15', '2026-07-01', None], prix=[1599.0, 1249.0, np.nan]), 'MAD',
+                  rates_path=rates_path)
+    twice = to_eur(once, 'MAD', rates_path=rates_path)
+    pd.testing.assert_frame_equal(twice, once)
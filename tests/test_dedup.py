@@ -0,0 +1,108 @@
+"""Index de déduplication : une transaction par page, run_id conservé à la reprise"""
+
+import itertools
+
+import pytest
+
+import base_scraper
+from dedup import DedupIndex
+from scraper_jumia import JumiaScraper
+from snapshots import SnapshotStore
+
+PAGE = """<html><body>{}</body></html>"""
+CARD = """<article class="prd"><a class="core" href="/{0}.html"></a><h3 class="name">Produit {0}</h3>
+<div class="prc">100 Dhs</div></article>"""
+
+
+def page(*ids) -> str:
+    return PAGE.format(''.join(CARD.format(pid) for pid in ids))
+
+
+def test_record_page_commits_once(tmp_path):
+    index = DedupIndex(tmp_path / 'dedup.sqlite', 'run1')
+    statements = []
+    index._conn.set_trace_callback(statements.append)
+
+    is_new = index.record_page('Jumia', ['A', 'B', 'A', 'C'], 'phone')
+    assert is_new == [True, True, False, True]
+    assert index.record_page('Jumia', ['C', 'D'], 'galaxy') == [False, True]
+
+    assert statements.count('COMMIT') == 2
+    assert index.keywords('Jumia') == {'A': ['phone'], 'B': ['phone'], 'C': ['phone', 'galaxy'],
+                                       'D': ['galaxy']}
+    assert index.record('Jumia', 'D', 'phone') is False
+
+
+@pytest.fixture
+def crawl_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_scraper, 'CHECKPOINT_DIR', tmp_path / 'checkpoints')
+    monkeypatch.setattr(base_scraper, 'DEDUP_DB', tmp_path / 'dedup.sqlite')
+    # Un run_id différent à chaque scraper, même dans la même seconde
+    run_ids = (f"20261017_12000{i}" for i in itertools.count())
+    monkeypatch.setattr(SnapshotStore, 'new_run_id', lambda self: next(run_ids))
+
+
+def test_resumed_crawl_continues_the_same_run(crawl_dirs):
+    first = JumiaScraper(headless=True, backend='browser')
+    checkpoints = first._open_checkpoints(['phone', 'galaxy'], resume=False)
+    first._process_html(page('P1', 'P2'), 'phone', 1, first.run_id, checkpoints['phone'])
+    # ... interruption : nouveau process, reprise
+    resumed = JumiaScraper(headless=True, backend='browser')
+    assert resumed.run_id != first.run_id
+
+    checkpoints = resumed._open_checkpoints(['phone', 'galaxy'], resume=True)
+
+    assert resumed.run_id == first.run_id
+    assert {checkpoint.run_id for checkpoint in checkpoints.values()} == {first.run_id}
+    # P2 a été vu avant l'interruption : doublon, seul le mot-clé est ajouté
+    resumed._process_html(page('P2', 'P3'), 'galaxy', 1, resumed.run_id, checkpoints['galaxy'])
+    assert checkpoints['galaxy'].load()['id_produit'].tolist() == ['/P3.html']
+    assert resumed.stats['duplicates_skipped'] == 1
+    keywords = resumed.dedup.keywords('Jumia')
+    assert keywords['/P2.html'] == ['phone', 'galaxy']
+
+
+def test_fresh_crawl_starts_a_new_run(crawl_dirs):
+    first = JumiaScraper(headless=True, backend='browser')
+    first._open_checkpoints(['phone'], resume=False)
+
+    fresh = JumiaScraper(headless=True, backend='browser')
+    checkpoint = fresh._open_checkpoints(['phone'], resume=False)['phone']
+
+    assert fresh.run_id != first.run_id
+    assert checkpoint.run_id == fresh.run_id
+
+
+def test_page_lost_before_checkpoint_is_scraped_again_on_resume(crawl_dirs, monkeypatch):
+    first = JumiaScraper(headless=True, backend='browser')
+    checkpoints = first._open_checkpoints(['phone', 'galaxy'], resume=False)
+    first._process_html(page('P1'), 'phone', 1, first.run_id, checkpoints['phone'])
+
+    # Crash entre l'index de déduplication et l'écriture du checkpoint (page 2)
+    def crash(*args, **kwargs):
+        raise OSError("disque plein")
+
+    with monkeypatch.context() as patch, pytest.raises(OSError):
+        patch.setattr(checkpoints['phone'], 'append_page', crash)
+        first._process_html(page('P2', 'P3'), 'phone', 2, first.run_id, checkpoints['phone'])
+    assert first.dedup.keywords('Jumia')['/P2.html'] == ['phone']
+
+    resumed = JumiaScraper(headless=True, backend='browser')
+    checkpoints = resumed._open_checkpoints(['phone', 'galaxy'], resume=True)
+    resumed._process_html(page('P1', 'P2', 'P3'), 'phone', 2, resumed.run_id, checkpoints['phone'])
+
+    # P1 (checkpointé) reste un doublon ; P2 et P3 (page perdue) sont extraits
+    assert checkpoints['phone'].load()['id_produit'].tolist() == ['/P1.html', '/P2.html', '/P3.html']
+    assert resumed.stats['duplicates_skipped'] == 1
+
+
+def test_failed_page_is_not_left_as_duplicates(crawl_dirs, monkeypatch):
+    scraper = JumiaScraper(headless=True, backend='browser')
+    checkpoint = scraper._open_checkpoint('phone', resume=False)
+    with monkeypatch.context() as patch, pytest.raises(ZeroDivisionError):
+        patch.setattr(scraper, '_extract', lambda raw, date: 1 / 0)
+        scraper._process_html(page('P1', 'P2'), 'phone', 1, scraper.run_id, checkpoint)
+
+    # La même page, rejouée dans le même process (ex. repli navigateur), est extraite
+    scraper._process_html(page('P1', 'P2'), 'phone', 1, scraper.run_id, checkpoint)
+    assert checkpoint.load()['id_produit'].tolist() == ['/P1.html', '/P2.html']
@@ -0,0 +1,106 @@
+"""Backend HTTP de Jumia de bout en bout, contre un catalogue local (StubCatalogServer)"""
+
+import pytest
+
+import base_scraper
+from base_scraper import BaseScraper, CrawlTask
+from pacing import AdaptivePacer
+from scraper_jumia import HTTP_JOB, JumiaScraper
+
+PAGE_TEMPLATE = """<html><body>{cards}
+<a aria-label="Dernière page" href="/catalog/?q=smartphone&amp;page=3"></a></body></html>"""
+CARD_TEMPLATE = """<article class="prd _fb col c-prd" data-id="{id}"><a class="core" href="/{id}.html">
+<h3 class="name">{title}</h3><div class="prc">{price} Dhs</div></a></article>"""
+
+
+def catalog_page(*products) -> str:
+    return PAGE_TEMPLATE.format(cards=''.join(CARD_TEMPLATE.format(id=pid, title=title, price=price)
+                                              for pid, title, price in products))
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Checkpoints et CSV bruts dans un dossier temporaire (jamais dans data/)"""
+    monkeypatch.setattr(base_scraper, 'CHECKPOINT_DIR', tmp_path / 'checkpoints')
+    monkeypatch.setattr(base_scraper, 'DATA_DIR', tmp_path / 'raw')
+    (tmp_path / 'raw').mkdir()
+
+
+@pytest.fixture
+def browser_jobs(monkeypatch):
+    """Jobs escaladés vers le navigateur (enregistrés au lieu de lancer Playwright)"""
+    jobs = []
+    monkeypatch.setattr(BaseScraper, 'run_job', lambda self, slot, task, spec, enqueue: jobs.append(spec))
+    return jobs
+
+
+def make_scraper(server, backend: str = 'http') -> JumiaScraper:
+    pacer = AdaptivePacer(requests_per_minute=6000, burst=100, jitter=(0, 0))
+    return JumiaScraper(headless=True, backend=backend, http_base_url=server.base_url, dedup=False, pacer=pacer)
+
+
+def test_http_pages_parsed_through_scheduler(catalog_server, snapshot_store):
+    # Page 1 : snapshot figé (2 produits valides, 12 pages annoncées) ; page 3 : aucune carte
+    page_1 = next(snapshot_store.iter_pages('jumia', 'smartphone'))['html']
+    server = catalog_server({1: page_1, 2: catalog_page(('P2', 'Redmi Note 13', '1 899')),
+                             3: catalog_page()})
+    scraper = make_scraper(server)
+
+    df = scraper.scrape_many(['smartphone'], max_pages=3, max_concurrency=2)['smartphone']
+
+    assert df['id_produit'].tolist() == ['SA948MW1JX2N5NAFAMZ', 'XI948MW0ABCDNAFAMZ', 'P2']
+    assert df['prix'].tolist() == [1599.0, 1249.0, 1899.0]
+    assert server.requests_served == 3
+    assert scraper.stats['http_pages'] == 2
+    # keep_empty=False : la page sans carte n'est pas checkpointée, le mot-clé reste à reprendre
+    checkpoint = scraper._open_checkpoint('smartphone', resume=True)
+    assert checkpoint.pages_done() == [1, 2]
+    assert checkpoint.state['total_pages'] == 12
+    assert not checkpoint.state['done']
+
+
+def test_one_fetcher_reuses_connections_across_keywords(catalog_server):
+    server = catalog_server(page_source=lambda query: catalog_page((query['q'][0], 'Galaxy A15', '1 599')))
+    scraper = make_scraper(server)
+
+    results = scraper.scrape_many(['galaxy', 'redmi', 'iphone'], max_pages=1, max_concurrency=1)
+
+    assert [df['id_produit'].tolist() for df in results.values()] == [['galaxy'], ['redmi'], ['iphone']]
+    assert server.requests_served == 3
+    assert len(server.connections) == 1
+
+
+def test_page_1_failure_escalates_to_browser(catalog_server, browser_jobs):
+    server = catalog_server({2: catalog_page(('P2', 'Redmi Note 13', '1 899'))})
+    scraper = make_scraper(server, backend='auto')
+
+    df = scraper.scrape_many(['smartphone'], max_pages=3)['smartphone']
+
+    assert df.empty
+    # Le mot-clé repart en mode URL (navigateur) depuis la page 1, sans autre page HTTP
+    assert browser_jobs == [1]
+    assert server.requests_served == 1
+    assert scraper.stats['browser_escalations'] == 1
+
+
+def test_empty_page_escalates_only_that_page(catalog_server, browser_jobs):
+    server = catalog_server({1: catalog_page(('P1', 'Galaxy A15', '1 599')), 2: catalog_page(),
+                             3: catalog_page(('P3', 'Redmi 13C', '1 249'))})
+    scraper = make_scraper(server, backend='auto')
+
+    df = scraper.scrape_many(['smartphone'], max_pages=3, max_concurrency=2)['smartphone']
+
+    assert df['id_produit'].tolist() == ['P1', 'P3']
+    assert browser_jobs == [2]
+    assert scraper.stats['browser_escalations'] == 1
+
+
+def test_http_only_backend_never_escalates(catalog_server, browser_jobs):
+    server = catalog_server({})
+    scraper = make_scraper(server)
+
+    checkpoint = scraper._open_checkpoint('smartphone', resume=False)
+    assert scraper.plan_jobs(CrawlTask(scraper, 'smartphone', 2, 'click', checkpoint, 1)) == [(HTTP_JOB, 1)]
+    assert scraper.scrape_many(['smartphone'], max_pages=2)['smartphone'].empty
+    assert browser_jobs == []
+
@@ -0,0 +1,56 @@
+"""Modèles sur les titres : mots vides figés dans le dépôt (aucun téléchargement nltk)"""
+
+import sys
+
+import pandas as pd
+import scipy.sparse
+import pytest
+
+from features import HashingTitleFeaturizer
+from model import PricePredictor, TitleClusterModel, stop_words
+
+TITLES = pd.Series([
+    "Samsung Galaxy A15 Smartphone pour tous avec écran AMOLED",
+    "Xiaomi Redmi 13C Smartphone avec batterie 5000mah",
+    "Apple iPhone 15 the best smartphone for you",
+    "Realme C65 Smartphone pour les jeunes",
+    "Google Pixel 8 Pro with the new camera",
+    "Samsung Galaxy S24 Ultra avec stylet",
+] * 2)
+
+
+@pytest.fixture(autouse=True)
+def without_nltk(monkeypatch):
+    """import nltk échoue : ni les données ni le paquet ne sont nécessaires"""
+    monkeypatch.setitem(sys.modules, 'nltk', None)
+
+
+def test_stop_words_are_french_and_english():
+    words = stop_words()
+    assert {'pour', 'avec', 'les', 'the', 'for', 'with'} <= set(words)
+    assert words == sorted(set(words))
+
+
+def test_models_fit_without_nltk():
+    vocabulary = set(TitleClusterModel(n_clusters=2).fit(TITLES).vectorizer.vocabulary_)
+    assert 'smartphone' in vocabulary and not vocabulary & {'pour', 'avec', 'the', 'with'}
+
+    featurizer = HashingTitleFeaturizer(n_features=2 ** 10).partial_fit(TITLES)
+    assert featurizer.hasher.stop_words == stop_words()
+
+    df = pd.DataFrame({'titre': TITLES, 'brand': TITLES.str.split().str[0], 'source': 'Amazon',
+                       'prix': [199.0, 129.0, 969.0, 149.0, 899.0, 1299.0] * 2})
+    predictor = PricePredictor(min_df=1).fit(df)
+    tfidf = predictor.pipeline[0].named_transformers_['titre']
+    assert not set(tfidf.vocabulary_) & {'pour', 'avec', 'the', 'with'}
+
+
+def test_price_features_stay_sparse():
+    # Petit vocabulaire (2 titres distincts) : la matrice empilée serait dense au-delà de 30 % de non-nuls
+    df = pd.DataFrame({'titre': ["Samsung Galaxy A15", "Xiaomi Redmi 13C"] * 4, 'brand': ['Samsung', 'Xiaomi'] * 4,
+                       'source': 'Jumia', 'prix': [199.0, 129.0] * 4})
+    predictor = PricePredictor().fit(df)
+
+    X = predictor.pipeline[0].transform(predictor._features(df))
+    assert scipy.sparse.issparse(X)
+    assert predictor.predict(df).shape == (8,)
@@ -0,0 +1,144 @@
+"""Cadenceur adaptatif : attente des cartes (page et horloge factices), token bucket et recul"""
+
+import pytest
+
+import pacing
+from pacing import AdaptivePacer
+
+
+class FakeClock:
+    """Remplace le module time de pacing : sleep() avance l'horloge au lieu de dormir"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakePage:
+    """
+    Page factice : `cards(t)` donne le nombre de cartes à l'instant t ; le
+    réseau se met au repos à l'instant `idle_at` (None : jamais).
+    """
+
+    def __init__(self, clock: FakeClock, cards, idle_at=None):
+        self.clock = clock
+        self.cards = cards
+        self.idle_at = idle_at
+        self.load_state_calls = []
+
+    def locator(self, selector: str):
+        return self
+
+    def count(self) -> int:
+        return self.cards(self.clock.now)
+
+    def wait_for_load_state(self, state: str, timeout: float):
+        self.load_state_calls.append((state, timeout))
+        limit = self.clock.now + timeout / 1000
+        if self.idle_at is None or self.idle_at > limit:
+            self.clock.now = limit
+            raise TimeoutError(f"{state} non atteint")
+        self.clock.now = max(self.clock.now, self.idle_at)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pacing, 'time', clock)
+    return clock
+
+
+def make_pacer(**kwargs) -> AdaptivePacer:
+    return AdaptivePacer(jitter=(0, 0), **kwargs)
+
+
+def test_ready_page_does_not_wait_for_network_idle(clock):
+    pacer = make_pacer()
+    # Cartes affichées dès le premier relevé, mais une connexion reste ouverte (jamais au repos)
+    page = FakePage(clock, cards=lambda t: 24)
+
+    assert pacer.wait_until_ready(page, '.card', timeout=10)
+
+    assert page.load_state_calls == []
+    assert clock.now == pytest.approx(pacer.poll_interval * pacer.stable_polls)
+    assert pacer.stats['pacing_ready_pages'] == 1
+    assert pacer.stats['pacing_idle_fallbacks'] == 0
+
+
+def test_cards_still_loading_fall_back_to_bounded_network_idle(clock):
+    pacer = make_pacer(idle_timeout=5.0)
+    # Chargement progressif jusqu'au repos du réseau (t=7) : le comptage ne se stabilise pas avant
+    page = FakePage(clock, cards=lambda t: int(t * 4) + 1 if t < 7 else 40, idle_at=7.0)
+
+    assert pacer.wait_until_ready(page, '.card', timeout=10)
+
+    assert len(page.load_state_calls) == 1
+    state, timeout_ms = page.load_state_calls[0]
+    assert state == 'networkidle' and timeout_ms <= pacer.idle_timeout * 1000
+    assert clock.now < 10
+    assert pacer.stats['pacing_idle_fallbacks'] == 1
+    assert pacer.stats['pacing_ready_pages'] == 1
+
+
+def test_timeout_is_bounded_by_the_deadline(clock):
+    pacer = make_pacer(idle_timeout=30.0)
+    page = FakePage(clock, cards=lambda t: 0)
+
+    assert not pacer.wait_until_ready(page, '.card', timeout=10)
+
+    # Un seul repli, borné par le temps restant : l'attente totale ne dépasse pas le timeout
+    assert len(page.load_state_calls) == 1
+    assert page.load_state_calls[0][1] <= 5.0 * 1000
+    assert clock.now == pytest.approx(10, abs=pacer.poll_interval)
+    assert pacer.stats['pacing_ready_timeouts'] == 1
+    assert pacer.stats['pacing_ready_pages'] == 0
+
+
+def test_acquire_spends_the_burst_then_paces(clock):
+    pacer = make_pacer(requests_per_minute=60, burst=2)
+
+    waits = [pacer.acquire('www.jumia.ma') for _ in range(4)]
+
+    # Rafale de 2 jetons, puis 1 jeton par seconde (rechargé pendant l'attente précédente)
+    assert waits == pytest.approx([0, 0, 1, 1])
+    assert clock.now == pytest.approx(2)
+    assert pacer.stats['pacing_waits'] == 4
+    assert pacer.stats['pacing_wait_seconds'] == pytest.approx(2)
+
+
+def test_buckets_are_per_domain(clock):
+    pacer = make_pacer(requests_per_minute=60, burst=1)
+
+    assert pacer.acquire('www.jumia.ma') == 0
+    assert pacer.acquire('www.amazon.fr') == 0
+    assert pacer.acquire('www.jumia.ma') == pytest.approx(1)
+
+
+def test_backoff_doubles_up_to_the_cap_and_decays_on_success(clock):
+    pacer = make_pacer(requests_per_minute=60, burst=1, max_backoff=8.0)
+    domain = 'www.amazon.fr'
+    pacer.acquire(domain)
+
+    pacer.report_captcha(domain)
+    pacer.report_timeout(domain)
+    assert pacer._bucket(domain)['backoff'] == 4.0
+    # Bucket vide : 1 s d'attente, multipliée par le recul
+    assert pacer.acquire(domain) == pytest.approx(4.0)
+
+    for _ in range(5):
+        pacer.report_captcha(domain)
+    assert pacer._bucket(domain)['backoff'] == 8.0
+    assert pacer.stats['pacing_backoffs'] == 7
+
+    pacer.report_success(domain)
+    assert pacer._bucket(domain)['backoff'] == pytest.approx(8.0 * 0.7)
+    for _ in range(20):
+        pacer.report_success(domain)
+    assert pacer._bucket(domain)['backoff'] == 1.0
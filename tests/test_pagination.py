@@ -0,0 +1,90 @@
+"""Sonde de pagination en mode URL : lue seulement une fois la page 1 prête"""
+
+from typing import Dict, List, Optional
+
+from base_scraper import BaseScraper, CrawlTask, SiteAdapter
+from checkpoint import CrawlCheckpoint
+
+
+class SlowPage:
+    """Page dont la pagination n'apparaît qu'une fois les cartes chargées"""
+
+    def __init__(self):
+        self.ready = False
+
+    def goto(self, url, **kwargs):
+        self.url = url
+
+    def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    def evaluate(self, script):
+        return True
+
+    def content(self) -> str:
+        return '<article></article>'
+
+    def close(self):
+        pass
+
+
+class SlowContext:
+    def new_page(self):
+        return SlowPage()
+
+
+class ReadyPacer:
+    """Pacer sans attente ; wait_until_ready rend la page prête"""
+
+    def bind_stats(self, stats):
+        pass
+
+    def acquire(self, domain):
+        pass
+
+    def pause(self):
+        pass
+
+    def wait_until_ready(self, page, selector, timeout=10.0) -> bool:
+        page.ready = True
+        return True
+
+    def report_success(self, domain):
+        pass
+
+
+class SlowAdapter(SiteAdapter):
+    name = 'slow'
+    source = 'Slow'
+    id_field = 'id_produit'
+    domain = 'slow.test'
+
+    def build_page_url(self, keyword: str, page_number: int) -> str:
+        return f"https://slow.test/?q={keyword}&page={page_number}"
+
+    def parse_cards(self, html: str) -> List[Dict]:
+        return [{'id_produit': 'P1'}]
+
+    def extract_product(self, raw: Dict, date_scraping: str) -> Optional[Dict]:
+        return {'id_produit': raw['id_produit'], 'titre': 'Produit', 'prix': 10.0}
+
+    def next_page_url(self, page) -> Optional[str]:
+        return self.build_page_url('x', 2) if page.ready else None
+
+    def total_pages(self, page) -> Optional[int]:
+        return 3 if page.ready else None
+
+
+def test_url_probe_waits_for_page_ready(tmp_path):
+    scraper = BaseScraper(SlowAdapter(), headless=True, pacer=ReadyPacer(), dedup=False, block_resources=False)
+    checkpoint = CrawlCheckpoint(tmp_path, 'slow', 'x')
+    task = CrawlTask(scraper, 'x', 5, 'url', checkpoint, 1)
+    enqueued = []
+
+    scraper._run_url_job(SlowContext(), None, task, 1, enqueued.append)
+
+    assert checkpoint.state['total_pages'] == 3
+    assert checkpoint.pages_done() == [1]
+    assert checkpoint.state['pages']['1']['next_url'] == 'https://slow.test/?q=x&page=2'
+    assert enqueued == [2, 3]
+    assert scraper.stats['pages_scraped'] == 1
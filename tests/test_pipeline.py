@@ -0,0 +1,74 @@
+"""Pipeline streaming scraping -> nettoyage, contre un catalogue local"""
+
+import pandas as pd
+import pytest
+
+import base_scraper
+from base_scraper import CrawlScheduler
+from cleaner import DataCleaner, ProcessedWriter
+from pacing import AdaptivePacer
+from pipeline import StreamingPipeline
+from scraper_jumia import JumiaScraper
+
+PAGE = """<html><body>{}<a aria-label="Dernière page" href="/catalog/?q=smartphone&amp;page=2"></a></body></html>"""
+CARD = """<article class="prd"><a class="core" href="/{0}.html"></a><h3 class="name">{1}</h3>
+<div class="prc">{2} Dhs</div></article>"""
+PAGE_1 = PAGE.format(CARD.format('a15', 'Samsung Galaxy A15 Smartphone 128Go', '1 599')
+                     + CARD.format('13c', 'Xiaomi Redmi 13C Smartphone 256Go', '1 249'))
+PAGE_2 = PAGE.format(CARD.format('c65', 'Realme C65 Smartphone 256Go', '1 699'))
+
+
+@pytest.fixture
+def crawl_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_scraper, 'CHECKPOINT_DIR', tmp_path / 'checkpoints')
+    monkeypatch.setattr(base_scraper, 'DATA_DIR', tmp_path / 'raw')
+    (tmp_path / 'raw').mkdir()
+    return tmp_path
+
+
+def make_scraper(server) -> JumiaScraper:
+    pacer = AdaptivePacer(requests_per_minute=6000, burst=100, jitter=(0, 0))
+    return JumiaScraper(headless=True, backend='http', http_base_url=server.base_url, dedup=False, pacer=pacer)
+
+
+def run_pipeline(scraper, tmp_path, resume: bool) -> pd.DataFrame:
+    scheduler = CrawlScheduler(max_concurrency=2).add(scraper, ['smartphone'], max_pages=2, resume=resume)
+    cleaner = DataCleaner(cache_path=None, history_dir=tmp_path / 'history')
+    writer = ProcessedWriter(tmp_path / 'products_cleaned.csv')
+    output_file = StreamingPipeline(scheduler, cleaner, writer, flush_interval=0.1).run()
+    return pd.read_csv(output_file, dtype={'id_produit': str})
+
+
+def test_resumed_run_keeps_pages_scraped_before_interruption(crawl_dirs, catalog_server):
+    # Premier run interrompu : seule la page 1 a été checkpointée
+    first = make_scraper(catalog_server({1: PAGE_1}))
+    checkpoint = first._open_checkpoint('smartphone', resume=False)
+    first._process_html(PAGE_1, 'smartphone', 1, first.run_id, checkpoint)
+
+    server = catalog_server({2: PAGE_2})
+    df = run_pipeline(make_scraper(server), crawl_dirs, resume=True)
+
+    assert server.requests_served == 1
+    assert sorted(df['id_produit']) == ['/13c.html', '/a15.html', '/c65.html']
+
+
+def test_price_history_recorded_per_flushed_batch(crawl_dirs, catalog_server, monkeypatch):
+    server = catalog_server({1: PAGE_1, 2: PAGE_2})
+    scheduler = CrawlScheduler(max_concurrency=2).add(make_scraper(server), ['smartphone'], max_pages=2)
+    cleaner = DataCleaner(cache_path=None, history_dir=crawl_dirs / 'history')
+    batches = []
+    record_history = cleaner.record_history
+
+    def recording(df, verbose=True):
+        batches.append(len(df))
+        return record_history(df, verbose)
+
+    monkeypatch.setattr(cleaner, 'record_history', recording)
+    # Un batch par page : l'historique suit les flushs, sans relire le dataset publié
+    pipeline = StreamingPipeline(scheduler, cleaner, ProcessedWriter(crawl_dirs / 'products_cleaned.csv'),
+                                 batch_size=1, flush_interval=0.1)
+    pipeline.run()
+
+    assert sorted(batches) == [1, 2]
+    assert pipeline.history_changes == 3
+    assert sorted(cleaner.history.latest()['id_produit']) == ['/13c.html', '/a15.html', '/c65.html']
@@ -0,0 +1,80 @@
+"""Historique des prix encodé par points de changement : écriture et requêtes"""
+
+import pandas as pd
+import pytest
+
+from price_history import PriceHistory
+
+
+def observations(*rows) -> pd.DataFrame:
+    """rows : (source, id_produit, date, prix, brand)"""
+    return pd.DataFrame(list(rows), columns=['source', 'id_produit', 'date', 'prix', 'brand'])
+
+
+@pytest.fixture
+def history(tmp_path) -> PriceHistory:
+    history = PriceHistory(tmp_path / 'price_history')
+    assert history.append(observations(('Jumia', '001', '2026-10-01 12:00:00', 100.0, 'Samsung'))) == 1
+    # Même prix revu : aucun nouveau point, seule la dernière observation avance
+    assert history.append(observations(('Jumia', '001', '2026-10-02 12:00:00', 100.0, 'Samsung'))) == 0
+    assert history.append(observations(('Jumia', '001', '2026-10-05 12:00:00', 120.0, 'Samsung'),
+                                       ('Amazon', 'B0A', '2026-10-03 09:00:00', 200.0, 'Samsung'),
+                                       ('Jumia', '002', '2026-10-02 08:00:00', 50.0, 'Xiaomi'))) == 3
+    assert history.append(observations(('Jumia', '001', '2026-10-07 12:00:00', 120.0, 'Samsung'))) == 0
+    return history
+
+
+def test_change_points_only(history):
+    changes = history.changes().astype({'source': str, 'brand': str}).sort_values(['id_produit', 'date'])
+    jumia_001 = changes[changes['id_produit'] == '001']
+    assert jumia_001['prix'].tolist() == [100.0, 120.0]
+    assert len(changes) == 4
+
+    latest = history.latest().set_index('id_produit')
+    assert latest.loc['001', 'prix'] == 120.0
+    assert latest.loc['001', 'first_seen'] == pd.Timestamp('2026-10-01 12:00:00')
+    assert latest.loc['001', 'last_seen'] == pd.Timestamp('2026-10-07 12:00:00')
+
+
+def test_reappending_the_same_observations_is_a_no_op(history):
+    assert history.append(observations(('Jumia', '001', '2026-10-05 12:00:00', 120.0, 'Samsung'))) == 0
+    assert len(history.changes()) == 4
+
+
+def test_repeated_price_within_one_batch(tmp_path):
+    history = PriceHistory(tmp_path / 'price_history')
+    batch = observations(('Jumia', '001', '2026-10-01 12:00:00', 100.0, 'Samsung'),
+                         ('Jumia', '001', '2026-10-02 12:00:00', 100.0, 'Samsung'),
+                         ('Jumia', '001', '2026-10-03 12:00:00', 90.0, 'Samsung'))
+    assert history.append(batch) == 2
+
+
+def test_trajectory(history):
+    points = history.trajectory('Jumia', '001')
+    # Un point par changement, plus la dernière observation au dernier prix
+    assert points['date'].tolist() == [pd.Timestamp('2026-10-01 12:00:00'), pd.Timestamp('2026-10-05 12:00:00'),
+                                       pd.Timestamp('2026-10-07 12:00:00')]
+    assert points['prix'].tolist() == [100.0, 120.0, 120.0]
+
+    single = history.trajectory('Amazon', 'B0A')
+    assert single['prix'].tolist() == [200.0]
+    assert history.trajectory('Jumia', 'inconnu').empty
+
+
+def test_brand_median_per_day(history):
+    median = history.brand_median('D')
+
+    expected = pd.DataFrame({
+        # Samsung : Jumia 001 à 100 du 1er au 4, à 120 du 5 au 7 ; Amazon B0A à 200 le 3 seulement
+        'Samsung': [100.0, 100.0, 150.0, 100.0, 120.0, 120.0, 120.0],
+        # Xiaomi : vu le 2 seulement
+        'Xiaomi': [None, 50.0, None, None, None, None, None],
+    }, index=pd.period_range('2026-10-01', '2026-10-07', freq='D', name='periode'))
+    pd.testing.assert_frame_equal(median, expected, check_dtype=False, check_names=False)
+
+
+def test_brand_median_filters(history):
+    assert history.brand_median('D', brands=['Xiaomi']).columns.tolist() == ['Xiaomi']
+    amazon = history.brand_median('D', source='Amazon')
+    assert amazon['Samsung'].tolist() == [200.0]
+    assert amazon.index.tolist() == [pd.Period('2026-10-03', freq='D')]
@@ -0,0 +1,109 @@
+"""Routeur de requêtes : ressources annulées ou laissées passer, estimation des octets économisés"""
+
+import pytest
+
+from router import AMAZON_DOMAINS, DEFAULT_SIZE_ESTIMATES, JUMIA_DOMAINS, ResourceBlocker
+
+
+class StubRequest:
+    def __init__(self, resource_type: str, url: str):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class StubRoute:
+    """Route Playwright factice : retient la décision prise (abort / continue)"""
+
+    def __init__(self, resource_type: str, url: str):
+        self.request = StubRequest(resource_type, url)
+        self.outcome = None
+
+    def abort(self):
+        self.outcome = 'abort'
+
+    def continue_(self):
+        self.outcome = 'continue'
+
+
+class StubContext:
+    def __init__(self):
+        self.routes = []
+
+    def route(self, pattern: str, handler):
+        self.routes.append((pattern, handler))
+
+
+def route_through(blocker: ResourceBlocker, resource_type: str, url: str) -> str:
+    route = StubRoute(resource_type, url)
+    blocker._handle(route)
+    return route.outcome
+
+
+@pytest.mark.parametrize('resource_type, url, outcome', [
+    ('document', 'https://www.amazon.fr/s?k=smartphone', 'continue'),
+    ('script', 'https://www.amazon.fr/js/app.js', 'continue'),
+    ('stylesheet', 'https://m.media-amazon.com/css/main.css', 'continue'),
+    ('xhr', 'https://fls-eu.amazon.fr/1/batch', 'continue'),
+    ('image', 'https://m.media-amazon.com/images/I/61abc.jpg', 'abort'),
+    ('media', 'https://www.amazon.fr/video.mp4', 'abort'),
+    ('font', 'https://images-eu.ssl-images-amazon.com/font.woff2', 'abort'),
+    ('script', 'https://www.googletagmanager.com/gtm.js', 'abort'),
+    ('document', 'https://ads.doubleclick.net/iframe', 'abort'),
+    # Un domaine qui se termine par un domaine autorisé sans en être un sous-domaine reste tiers
+    ('script', 'https://notamazon.fr/track.js', 'abort'),
+    ('other', 'data:image/png;base64,AAAA', 'continue'),
+])
+def test_blocked_types_and_third_parties(resource_type, url, outcome):
+    blocker = ResourceBlocker(AMAZON_DOMAINS)
+    assert route_through(blocker, resource_type, url) == outcome
+
+
+def test_third_parties_pass_when_not_blocked():
+    blocker = ResourceBlocker(JUMIA_DOMAINS, blocked_types={'image'}, block_third_party=False)
+
+    assert route_through(blocker, 'script', 'https://www.googletagmanager.com/gtm.js') == 'continue'
+    assert route_through(blocker, 'font', 'https://www.jumia.ma/font.woff2') == 'continue'
+    assert route_through(blocker, 'image', 'https://ma.jumia.is/product.jpg') == 'abort'
+
+
+def test_attach_routes_every_request():
+    blocker = ResourceBlocker(JUMIA_DOMAINS)
+    context = StubContext()
+
+    assert blocker.attach(context) is context
+    assert context.routes == [("**/*", blocker._handle)]
+
+
+def test_page_report_estimates_bytes_and_resets():
+    blocker = ResourceBlocker(JUMIA_DOMAINS)
+    for resource_type, url in [('image', 'https://ma.jumia.is/a.jpg'), ('image', 'https://ma.jumia.is/b.jpg'),
+                               ('font', 'https://www.jumia.ma/f.woff2'),
+                               ('script', 'https://connect.facebook.net/fbevents.js'),
+                               ('ping', 'https://www.google-analytics.com/collect'),
+                               ('script', 'https://www.jumia.ma/app.js')]:
+        route_through(blocker, resource_type, url)
+
+    report = blocker.page_report()
+
+    assert report['blocked_by_type'] == {'image': 2, 'font': 1, 'script': 1, 'ping': 1}
+    assert report['blocked_requests'] == 5
+    # Type sans estimation (ping) : taille de 'other'
+    assert report['bytes_saved_est'] == (2 * DEFAULT_SIZE_ESTIMATES['image'] + DEFAULT_SIZE_ESTIMATES['font']
+                                         + DEFAULT_SIZE_ESTIMATES['script'] + DEFAULT_SIZE_ESTIMATES['other'])
+
+    # Compteurs de page remis à zéro, totaux cumulés sur les pages
+    route_through(blocker, 'media', 'https://www.jumia.ma/v.mp4')
+    second = blocker.log_page_report()
+    assert second == {'blocked_requests': 1, 'blocked_by_type': {'media': 1},
+                      'bytes_saved_est': DEFAULT_SIZE_ESTIMATES['media']}
+    assert blocker.total_blocked == 6
+    assert blocker.total_bytes_saved == report['bytes_saved_est'] + DEFAULT_SIZE_ESTIMATES['media']
+    assert blocker.page_report() == {'blocked_requests': 0, 'blocked_by_type': {}, 'bytes_saved_est': 0}
+
+
+def test_partial_size_estimates_fall_back_to_defaults():
+    blocker = ResourceBlocker(JUMIA_DOMAINS, size_estimates={'image': 10_000})
+    route_through(blocker, 'image', 'https://ma.jumia.is/a.jpg')
+    route_through(blocker, 'font', 'https://www.jumia.ma/f.woff2')
+
+    assert blocker.page_report()['bytes_saved_est'] == 10_000 + DEFAULT_SIZE_ESTIMATES['font']
@@ -0,0 +1,116 @@
+"""Replay des snapshots HTML figés (tests/fixtures/snapshots) à travers les adaptateurs"""
+
+import pandas as pd
+import pytest
+
+from scraper_amazon import AmazonAdapter, AmazonScraper
+from scraper_jumia import JumiaAdapter, JumiaScraper
+
+RUN_ID = '20261017_120000'
+DATE_SCRAPING = '2026-10-17 12:00:00'
+
+
+def _page(store, site: str) -> dict:
+    pages = list(store.iter_pages(site, 'smartphone'))
+    assert len(pages) == 1
+    return pages[0]
+
+
+def test_snapshot_store_iterates_fixture_run(snapshot_store):
+    assert snapshot_store.keywords('amazon') == ['smartphone']
+    assert snapshot_store.runs('jumia', 'smartphone') == [RUN_ID]
+    page = _page(snapshot_store, 'jumia')
+    assert (page['run_id'], page['page'], page['date_scraping']) == (RUN_ID, 1, DATE_SCRAPING)
+
+
+# --- AMAZON ---
+
+def test_amazon_parse_cards(snapshot_store):
+    raw_cards = AmazonAdapter().parse_cards(_page(snapshot_store, 'amazon')['html'])
+
+    # L'en-tête (data-asin vide) et l'annonce (ASIN invalide) sont ignorés
+    assert [raw['asin'] for raw in raw_cards] == ['B0CHX1W1XY', 'B0CS6K2WMQ', 'B0D1234567']
+    first = raw_cards[0]
+    assert first['titre'] == 'Apple iPhone 15 (128 Go) - Noir'
+    assert first['prix_brut'] == '799,00\xa0€'
+    assert first['note_brute'] == '4,5 sur 5\xa0étoiles'
+    assert first['nb_avis_brut'] == '(1\xa0234)'
+    assert first['prime'] is True
+    assert first['image_url'].endswith('71d7rfSl0wL._AC_UY218_.jpg')
+    assert raw_cards[1]['boutique_brute'] == 'Visiter la boutique Xiaomi'
+
+
+def test_amazon_extract_product(snapshot_store):
+    adapter = AmazonAdapter()
+    raw_cards = adapter.parse_cards(_page(snapshot_store, 'amazon')['html'])
+    products = [adapter.extract_product(raw, DATE_SCRAPING) for raw in raw_cards]
+
+    iphone, redmi, sans_prix = products
+    assert iphone == {
+        'asin': 'B0CHX1W1XY', 'date_scraping': DATE_SCRAPING, 'source': 'Amazon',
+        'titre': 'Apple iPhone 15 (128 Go) - Noir', 'prix_brut': '799,00\xa0€', 'prix': 799.0,
+        'note_brute': '4,5 sur 5\xa0étoiles', 'note': 4.5, 'nb_avis_brut': '(1\xa0234)', 'nb_avis': 1234,
+        'vendeur': None, 'prime': True, 'disponibilite': 'En stock',
+        'lien': 'https://www.amazon.fr/dp/B0CHX1W1XY',
+        'image_url': 'https://m.media-amazon.com/images/I/71d7rfSl0wL._AC_UY218_.jpg'
+    }
+    assert redmi['prix'] == 1249.90
+    assert redmi['vendeur'] == 'Xiaomi'
+    assert redmi['prime'] is False
+    assert redmi['disponibilite'] == 'Rupture de stock'
+    # Ni prix ni note : carte rejetée
+    assert sans_prix is None
+
+
+# --- JUMIA ---
+
+def test_jumia_parse_cards(snapshot_store):
+    raw_cards = JumiaAdapter().parse_cards(_page(snapshot_store, 'jumia')['html'])
+
+    # La carte sans lien est ignorée
+    assert [raw['id_produit'] for raw in raw_cards] == ['SA948MW1JX2N5NAFAMZ', 'XI948MW0ABCDNAFAMZ',
+                                                        'NO948MW0PRICENAFAMZ']
+    first = raw_cards[0]
+    assert first['lien'] == 'https://www.jumia.ma/samsung-galaxy-a15-128go-noir-58312345.html'
+    assert first['titre'] == 'Samsung Galaxy A15 - 6.5" - 4Go/128Go - Noir'
+    assert first['prix_brut'] == '1 599.00 Dhs'
+    assert first['note_brute'] == '4.3 out of 5'
+    assert raw_cards[1]['note_brute'] is None
+    assert raw_cards[2]['prix_brut'] is None
+
+
+def test_jumia_extract_product(snapshot_store):
+    adapter = JumiaAdapter()
+    raw_cards = adapter.parse_cards(_page(snapshot_store, 'jumia')['html'])
+    galaxy, redmi, sans_prix = [adapter.extract_product(raw, DATE_SCRAPING) for raw in raw_cards]
+
+    assert galaxy['prix'] == 1599.0
+    assert galaxy['note'] == 4.3
+    assert galaxy['source'] == 'Jumia'
+    assert redmi['prix'] == 1249.0
+    assert redmi['note'] is None
+    assert sans_prix is None
+
+
+def test_jumia_total_pages_html(snapshot_store):
+    adapter = JumiaAdapter()
+    assert adapter.total_pages_html(_page(snapshot_store, 'jumia')['html']) == 12
+    assert adapter.total_pages_html("<html><body><article class='prd'></article></body></html>") is None
+
+
+# --- REPLAY COMPLET ---
+
+@pytest.mark.parametrize('scraper_class, id_column, expected_ids', [
+    (AmazonScraper, 'asin', ['B0CHX1W1XY', 'B0CS6K2WMQ']),
+    (JumiaScraper, 'id_produit', ['SA948MW1JX2N5NAFAMZ', 'XI948MW0ABCDNAFAMZ']),
+])
+def test_replay(snapshot_store, scraper_class, id_column, expected_ids):
+    scraper = scraper_class(headless=True, dedup=False)
+    scraper.snapshots = snapshot_store
+
+    df = scraper.replay('smartphone')
+
+    assert isinstance(df, pd.DataFrame)
+    assert df[id_column].tolist() == expected_ids
+    assert (df['date_scraping'] == DATE_SCRAPING).all()
+    assert scraper.stats['successful_extractions'] == len(expected_ids)
@@ -0,0 +1,128 @@
+"""Dataset Parquet de l'application : schéma, partitions, lecture filtrée et publication sans trou"""
+
+import importlib
+import os
+import sys
+import types
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import storage
+from cleaner import OUTPUT_COLUMNS
+from storage import ParquetDatasetWriter, published_path, write_parquet
+from conftest import PROJECT_ROOT
+
+
+def cleaned(n: int = 6) -> pd.DataFrame:
+    """Produits nettoyés (colonnes OUTPUT_COLUMNS), moitié Amazon, moitié Jumia"""
+    return pd.DataFrame({
+        'id_produit': [f"{i:05d}" for i in range(n)],
+        'titre': [f"Samsung Galaxy A{i} Smartphone" for i in range(n)],
+        'prix': [199.99 + i for i in range(n)],
+        'note': [4.5, -1.0] * (n // 2),
+        'nb_avis': [12.0, 0.0] * (n // 2),
+        'lien': [f"https://example.test/{i}" for i in range(n)],
+        'source': ['Amazon', 'Jumia'] * (n // 2),
+        'date': '2026-10-17 12:00:00',
+        'brand': ['Samsung', 'Xiaomi', 'Apple'] * (n // 3),
+        'category': ['smartphone'] * (n - 1) + ['accessoire'],
+        'prix_origine': [199.99 + i for i in range(n)],
+        'devise_origine': ['EUR', 'MAD'] * (n // 2),
+        'sentiment_score': [4.0] * n,
+        'cluster': [None] * n,
+    }, columns=OUTPUT_COLUMNS)
+
+
+def test_schema_and_source_partitions(tmp_path):
+    path = write_parquet(cleaned(), tmp_path / 'products_cleaned.parquet')
+
+    assert sorted(p.name for p in path.iterdir()) == ['source=Amazon', 'source=Jumia']
+    schema = pq.read_schema(next((path / 'source=Jumia').glob('*.parquet')))
+    assert schema.field('brand').type == pa.dictionary(pa.int32(), pa.string())
+    assert schema.field('category').type == pa.dictionary(pa.int32(), pa.string())
+    assert schema.field('devise_origine').type == pa.dictionary(pa.int32(), pa.string())
+    assert schema.field('prix').type == pa.float32()
+    assert schema.field('note').type == pa.float32()
+    assert schema.field('nb_avis').type == pa.int32()
+    assert schema.field('cluster').type == pa.int32()
+
+    df = pd.read_parquet(path)
+    assert df['id_produit'].sort_values().tolist() == [f"{i:05d}" for i in range(6)]
+    assert df['cluster'].isna().all()
+
+
+def test_single_file_without_partitions(tmp_path):
+    path = write_parquet(cleaned(), tmp_path / 'products_cleaned.parquet', partition_cols=())
+    assert path.is_file()
+    assert pq.read_schema(path).field('source').type == pa.dictionary(pa.int32(), pa.string())
+
+
+def test_previous_dataset_stays_readable_during_swap(tmp_path, monkeypatch):
+    path = write_parquet(cleaned(6), tmp_path / 'products_cleaned.parquet')
+    writer = ParquetDatasetWriter(path)
+    writer.write(cleaned(6).head(4))
+    seen = []
+    replace = os.replace
+
+    def checking_replace(src, dst):
+        # À chaque étape de l'échange, un dataset complet reste lisible
+        readable = published_path(path)
+        seen.append(len(pd.read_parquet(readable)))
+        replace(src, dst)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(storage.os, 'replace', checking_replace)
+        writer.close()
+
+    assert seen == [6, 6]
+    assert len(pd.read_parquet(published_path(path))) == 4
+    assert not path.with_name(path.name + '.old').exists()
+
+
+def test_interrupted_swap_is_restored(tmp_path):
+    path = write_parquet(cleaned(6), tmp_path / 'products_cleaned.parquet')
+    old = path.with_name(path.name + '.old')
+    os.replace(path, old)                   # crash entre les deux renommages
+
+    assert published_path(path) == old
+    ParquetDatasetWriter(path)
+    assert published_path(path) == path
+    assert len(pd.read_parquet(path)) == 6
+
+
+@pytest.fixture
+def load_data(tmp_path, monkeypatch):
+    """app/utils/load_data.py branché sur un dataset temporaire"""
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        # Seul st.cache_resource est utilisé à l'import
+        monkeypatch.setitem(sys.modules, 'streamlit', types.SimpleNamespace(cache_resource=lambda f: f))
+    monkeypatch.syspath_prepend(str(PROJECT_ROOT / 'app'))
+    module = importlib.import_module('utils.load_data')
+    parquet_path = tmp_path / 'products_cleaned.parquet'
+    monkeypatch.setattr(module, 'DATA_PATH', tmp_path / 'products_cleaned.csv')
+    monkeypatch.setattr(module, 'PARQUET_PATH', parquet_path)
+    monkeypatch.setattr(module, 'PARQUET_OLD_PATH', parquet_path.with_name(parquet_path.name + '.old'))
+    write_parquet(cleaned(), parquet_path)
+    return module
+
+
+def test_load_data_projects_columns_and_filters_partitions(load_data):
+    df = load_data._read_parquet(columns=['id_produit', 'prix', 'brand'], sources=['Jumia'])
+
+    assert list(df.columns) == ['id_produit', 'prix', 'brand']
+    # Jumia : ids impairs ; le dernier produit (accessoire) est filtré à la lecture
+    assert df['id_produit'].tolist() == ['00001', '00003']
+    assert df['prix'].dtype == 'float32'
+    assert list(df['brand'].cat.categories) == ['Samsung', 'Xiaomi']
+
+
+def test_load_processed_data_reads_smartphones_of_all_sources(load_data):
+    df = load_data.load_processed_data()
+    assert sorted(df['source'].astype(str).unique()) == ['Amazon', 'Jumia']
+    assert len(df) == 5
+    assert set(df['category'].astype(str)) == {'smartphone'}
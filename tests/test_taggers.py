@@ -0,0 +1,300 @@
+"""
+Parité des taggers vectorisés avec les règles ligne par ligne d'origine.
+
+Les fonctions de référence ci-dessous sont recopiées TELLES QUELLES du
+cleaner d'origine, listes comprises : elles ne lisent pas les tables de
+taggers.py, une entrée erronée dans ces tables apparaît donc comme un écart.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from taggers import BrandTagger, CategoryMatcher, TitleClassifier
+
+# Titres réels (Amazon.fr / Jumia.ma) et cas limites
+TITLES = [
+    "Xiaomi REDMI Note 15 Pro, Smartphone 8+256Go, écran AMOLED 6,67\"",
+    "Xiaomi Smartphone Redmi A5-3 Go+64 Go, écran HD+ 6,53\"",
+    "Samsung Galaxy A17 5G 128 Go, Smartphone Android, Noir",
+    "Samsung Galaxy S23 Ultra 512GB",
+    "Samsung Galaxy S21 + Coque offerte",
+    "Samsung Galaxy Watch6 Classic 47mm Bluetooth",
+    "Samsung Galaxy Buds2 Pro Écouteurs sans fil",
+    "Apple iPhone 15 (128 Go) - Noir",
+    "Apple iPad Air (M2) 11 pouces Wi-Fi 128 Go",
+    "Apple Watch Series 9 GPS 41 mm",
+    "Apple Batterie MagSafe",
+    "Coque de protection iPhone 13 transparente",
+    "Verre trempé pour Samsung Galaxy A15 (lot de 3)",
+    "Google Pixel 8 Pro 128 Go - Obsidienne",
+    "Google Pixel Buds Pro - Charbon",
+    "POCO X6 Pro 5G 12+512 Go",
+    "Pocophone F1 6Go/64Go",
+    "Xiaomi Mi 11 Lite 5G NE",
+    "Redmi 13C - 8Go/256Go - Bleu",
+    "Realme C65 Smartphone 256Go",
+    "OnePlus Nord CE 3 Lite 5G",
+    "OPPO Find X5 Pro 256 Go",
+    "Vivo V29 5G 12Go/256Go",
+    "Huawei P60 Pro 256 Go",
+    "HUAWEI Mate 50 Pro",
+    "Sony Xperia 10 V 128 Go",
+    "Motorola Moto G84 5G",
+    "Nokia G21 4Go/128Go",
+    "Honor Magic5 Lite 5G",
+    "Tecno Spark 20 Pro+ 8Go/256Go",
+    "Infinix Hot 40i 4Go/128Go",
+    "Wiko T10 64Go",
+    "ZTE Blade A52 2Go/64Go",
+    "Alcatel 1B 2022 32Go",
+    "Lenovo Tab M10 Plus (3e génération)",
+    "ASUS ROG Phone 8 Pro",
+    "LG Velvet 5G 128 Go",
+    "BlackBerry KEY2 64 Go",
+    "DJI Mic 2 Microphone sans fil",
+    "Chargeur rapide 25W Samsung USB-C",
+    "Câble USB-C vers Lightning 2m",
+    "Stabilisateur Cardan pour smartphone",
+    "Kit piéton Samsung",
+    "Support téléphone voiture magnétique",
+    "Smartphone Samsung Galaxy A54 5G",
+    "smartphone xiaomi redmi note 13",
+    "Android phone débloqué 6,5 pouces",
+    "Mobile Phone double SIM",
+    "Station dock de charge pour Pixel 8",
+    "Film hydrogel Galaxy S24 (pack de 2)",
+    "Gimbal DJI Osmo Mobile 6",
+    "Xiaomi Mi Band 8 noir",
+    "Apple Pencil (2e génération)",
+    "Carte mémoire microSD 128 Go",
+    "Samsung Galaxy Z Flip5 256 Go",
+    "Samsung Galaxy Note 20 Ultra",
+    "Redmi A3 64Go",
+    "Poco F6 Pro 512 Go",
+    "Vivo V30 Lite 5G",
+    "Motorola Moto Edge 40",
+    "Huawei Nova 11i 128Go",
+    "OPPO Reno 11F 5G",
+    # Casse mélangée, accents, espaces
+    "GALAXY S24 ULTRA 256GO",
+    "sAmSuNg gAlAxY a15",
+    "ÉTUI Cuir Portefeuille iPhone 15",
+    "iPHONE 14 PRO MAX reconditionné",
+    "   Redmi Note 13   ",
+    "Pixel",
+    "Galaxy",
+    "",
+    " ",
+    # Non chaînes et manquants
+    None,
+    np.nan,
+    pd.NA,
+    12345,
+    3.5,
+]
+
+
+def reference_extract_brand(text):
+    if pd.isna(text):
+        return 'Unknown'
+    
+    text_lower = str(text).lower()
+    
+    # ===== FILTRE ANTI-ACCESSOIRES =====
+    # Si c'est déjà classé comme accessoire, on met "Accessory Brand"
+    # (à appliquer APRÈS avoir extrait la catégorie)
+    
+    # --- ALIAS (Crucial) ---
+    if 'iphone' in text_lower or 'ipad' in text_lower:
+        return 'Apple'
+    if 'galaxy' in text_lower and 'watch' not in text_lower:  # ⚠️ Évite "Galaxy Watch"
+        return 'Samsung'
+    if 'redmi' in text_lower or 'pocophone' in text_lower or 'poco' in text_lower:
+        return 'Xiaomi'
+    if 'pixel' in text_lower and 'buds' not in text_lower:  # ⚠️ Évite "Pixel Buds"
+        return 'Google'
+    
+    # --- MARQUES STANDARD ---
+    brands = [
+        'samsung', 'apple', 'huawei', 'xiaomi', 'oppo', 'vivo', 'realme',
+        'oneplus', 'google', 'motorola', 'nokia', 'sony', 'lg', 'asus',
+        'lenovo', 'tecno', 'infinix', 'wiko', 'honor', 'zte', 'alcatel'
+    ]
+    
+    for brand in brands:
+        if brand in text_lower:
+            return brand.capitalize()
+    
+    return 'Unknown'
+
+
+def reference_extract_category(text):
+    """Classification ULTRA PRÉCISE - VERSION FINALE"""
+    if pd.isna(text):
+        return 'unknown'
+
+    text_lower = str(text).lower()
+
+    # ===== LISTE NOIRE ULTRA RENFORCÉE =====
+    accessory_keywords = [
+        # Protection & Coques
+        'coque', 'housse', 'étui', 'case', 'cover', 'shell', 'bumper',
+        'protection', 'silicone', 'rigid', 'transparent', 'pochette',
+        
+        # Écran & Film
+        'film', 'verre trempé', 'protecteur', 'screen protector', 
+        'tempered glass', 'hydrogel', 'pellicule',
+        
+        # Chargement & Batteries (Capture "Apple Batterie MagSafe")
+        'chargeur', 'câble', 'cable', 'adaptateur', 'adapter', 
+        'power bank', 'batterie externe', 'batterie', 'wireless charger',
+        'charging', 'fast charge', 'plug', 'magsafe', 'powerbank',
+        
+        # Audio (Capture "DJI Mic")
+        'écouteur', 'casque', 'headphone', 'earphone', 'earbud',
+        'airpod', 'galaxy buds', 'buds', 'pods', 'speakers', 'enceinte',
+        'microphone', 'mic', 'micro', 'cravate', 'sans fil',
+        
+        # Supports & Stabilisation (Capture "Stabilisateur", "Cardan")
+        'trépied', 'tripod', 'gorillapod', 'selfie stick', 'perche',
+        'support', 'holder', 'stand', 'mount', 'grip',
+        'stabilisateur', 'cardan', 'gimbal', 'steadicam',
+        
+        # Montres & Bracelets
+        'smart watch', 'smartwatch', 'montre connectée', 'watch',
+        'bracelet', 'band', 'strap', 'mi band',
+        
+        # Stockage & Cartes
+        'carte mémoire', 'microsd', 'sd card', 'usb', 'clé usb',
+        
+        # Divers
+        'stylet', 's pen', 'apple pencil', 'moniteur', 'kit', 'pack',
+        'sim card', 'outil', 'remplacement', 'pièce', 'stick', 'dock'
+    ]
+    
+    # ===== VÉRIFICATION STRICTE =====
+    # Si UN SEUL mot d'accessoire est présent -> C'est un accessoire
+    if any(acc in text_lower for acc in accessory_keywords):
+        return 'accessoire'
+    
+    # ===== DÉTECTION SMARTPHONE =====
+    smartphone_keywords = [
+        'smartphone', 'iphone', 'android phone', 'mobile phone',
+        'galaxy s', 'galaxy a', 'galaxy z', 'galaxy note',
+        'redmi note', 'redmi a', 'poco f', 'poco x',
+        'mi 1', 'mi 2', 'mi 3', 'mi 4', 'mi 5', 'mi 6', 'mi 7', 'mi 8', 'mi 9', 'mi 10', 'mi 11', 'mi 12',
+        'pixel', 'oneplus', 'oppo find', 'vivo v',
+        'huawei p', 'huawei mate',
+        'xperia', 'nokia', 'motorola moto'
+    ]
+    
+    if any(kw in text_lower for kw in smartphone_keywords):
+        return 'smartphone'
+    
+    return 'other'
+
+
+def reference_is_real_smartphone_with_bonus(text_lower):
+    """
+    Détecte si c'est un VRAI smartphone avec un bonus accessoire
+    Exemple : "Samsung Galaxy S21 + Coque offerte" → True
+    Contre-exemple : "Coque de protection iPhone 13" → False
+    """
+    # Patterns d'accessoires qui commencent le titre
+    # Si le titre COMMENCE par un accessoire, ce n'est PAS un smartphone
+    accessory_start_patterns = [
+        r'^(coque|étui|housse|film|protection|chargeur|câble|support|adaptateur)',
+        r'^(casque|écouteur|batterie|kit)',
+    ]
+    
+    for pattern in accessory_start_patterns:
+        if re.search(pattern, text_lower):
+            return False
+    
+    # Patterns de vrais smartphones (titre qui commence par une marque/modèle)
+    real_smartphone_patterns = [
+        r'^(samsung|iphone|xiaomi|google|huawei|oppo|vivo|realme|oneplus)',
+        r'^(galaxy|redmi|poco|pixel)',
+        r'^smartphone\s+(samsung|apple|xiaomi)',  # "Smartphone Samsung Galaxy..."
+    ]
+    
+    for pattern in real_smartphone_patterns:
+        if re.search(pattern, text_lower):
+            return True
+    
+    return False
+
+
+def reference_bonus(text):
+    # Titre manquant : jamais de bonus (même convention que CategoryMatcher)
+    return False if pd.isna(text) else reference_is_real_smartphone_with_bonus(str(text).lower())
+
+
+@pytest.fixture
+def titles() -> pd.Series:
+    # Doublons et index non trivial : la redistribution par titre distinct est aussi vérifiée
+    values = TITLES + TITLES[::3]
+    return pd.Series(values, index=np.arange(len(values)) * 7, dtype=object)
+
+
+def _expected(titles: pd.Series, reference) -> pd.Series:
+    return pd.Series([reference(text) for text in titles], index=titles.index, dtype=object)
+
+
+def test_brand_tagger_matches_original_rules(titles):
+    pd.testing.assert_series_equal(BrandTagger().tag(titles), _expected(titles, reference_extract_brand),
+                                   check_dtype=False)
+
+
+def test_classifier_brand_matches_original_rules(titles):
+    pd.testing.assert_series_equal(TitleClassifier().classify(titles)['brand'],
+                                   _expected(titles, reference_extract_brand), check_dtype=False, check_names=False)
+
+
+def test_category_matcher_matches_original_rules(titles):
+    tagged = CategoryMatcher().tag(titles)
+    pd.testing.assert_series_equal(tagged['category'], _expected(titles, reference_extract_category),
+                                   check_dtype=False, check_names=False)
+    pd.testing.assert_series_equal(tagged['smartphone_bonus'], _expected(titles, reference_bonus),
+                                   check_dtype=False, check_names=False)
+
+
+def test_classifier_category_matches_original_rules(titles):
+    tagged = TitleClassifier().classify(titles)
+    pd.testing.assert_series_equal(tagged['category'], _expected(titles, reference_extract_category),
+                                   check_dtype=False, check_names=False)
+    pd.testing.assert_series_equal(tagged['smartphone_bonus'], _expected(titles, reference_bonus),
+                                   check_dtype=False, check_names=False)
+
+
+@pytest.mark.parametrize('title, brand', [
+    ("Samsung Galaxy Watch6 Classic", 'Samsung'),     # exclusion "watch" : repli sur la marque standard
+    ("Galaxy Watch6 Classic", 'Unknown'),
+    ("Google Pixel Buds Pro", 'Google'),
+    ("Pixel Buds Pro", 'Unknown'),
+    ("Apple iPad Air", 'Apple'),
+    ("POCO F6", 'Xiaomi'),
+    ("BlackBerry KEY2", 'Unknown'),
+])
+def test_brand_golden_outputs(title, brand):
+    assert BrandTagger().tag(pd.Series([title])).iloc[0] == brand
+    assert reference_extract_brand(title) == brand
+
+
+@pytest.mark.parametrize('title, category, bonus', [
+    ("Samsung Galaxy S21 + Coque offerte", 'accessoire', True),
+    ("Coque de protection iPhone 13", 'accessoire', False),
+    ("Smartphone Samsung Galaxy A54 5G", 'smartphone', True),
+    ("Xiaomi Mi 11 Lite 5G NE", 'smartphone', True),
+    ("Samsung Galaxy Watch6 Classic", 'accessoire', True),
+    ("ASUS ROG Phone 8 Pro", 'other', False),
+    ("", 'other', False),
+    (None, 'unknown', False),
+])
+def test_category_golden_outputs(title, category, bonus):
+    tagged = CategoryMatcher().tag(pd.Series([title], dtype=object)).iloc[0]
+    assert (tagged['category'], bool(tagged['smartphone_bonus'])) == (category, bonus)
+    assert (reference_extract_category(title), reference_bonus(title)) == (category, bonus)
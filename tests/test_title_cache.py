@@ -0,0 +1,75 @@
+"""Cache des classifications de titres : invalidation par empreinte des règles, compteurs hits / misses"""
+
+import pandas as pd
+
+from cleaner import DataCleaner
+from taggers import BRANDS, ACCESSORY_KEYWORDS, BrandTagger, CategoryMatcher, TitleClassifier
+from title_cache import TitleCache
+
+TITLES = pd.Series(["Nokia G21 4Go/128Go Smartphone", "Samsung Galaxy A15 Smartphone", "Nokia G21 4Go/128Go Smartphone",
+                    None, "Coque iPhone 15"])
+
+
+def cached_classifier(db_path, **taggers) -> TitleClassifier:
+    classifier = TitleClassifier(**taggers)
+    classifier.cache = TitleCache(db_path, classifier.rules_hash)
+    return classifier
+
+
+def test_hits_and_misses_count_distinct_titles(tmp_path):
+    classifier = cached_classifier(tmp_path / 'titles.sqlite')
+    first = classifier.classify(TITLES)
+    assert (classifier.cache.hits, classifier.cache.misses) == (0, 3)
+
+    # Nouveau process : tout vient du cache persistant, un seul titre nouveau
+    classifier = cached_classifier(tmp_path / 'titles.sqlite')
+    again = classifier.classify(pd.concat([TITLES, pd.Series(["Realme C65 Smartphone"])], ignore_index=True))
+    assert (classifier.cache.hits, classifier.cache.misses) == (3, 1)
+    pd.testing.assert_frame_equal(again.head(len(TITLES)), first)
+    assert len(classifier.cache) == 4
+
+
+def test_rules_hash_follows_rules():
+    assert TitleClassifier().rules_hash == TitleClassifier().rules_hash
+    assert BrandTagger(brands=BRANDS[:-1]).rules != BrandTagger().rules
+    assert (TitleClassifier(brand_tagger=BrandTagger(brands=[b for b in BRANDS if b != 'nokia'])).rules_hash
+            != TitleClassifier().rules_hash)
+    assert (TitleClassifier(category_matcher=CategoryMatcher(accessory_keywords=ACCESSORY_KEYWORDS + ['nokia'])).rules_hash
+            != TitleClassifier().rules_hash)
+
+
+def test_rule_change_invalidates_cached_classifications(tmp_path, capsys):
+    db_path = tmp_path / 'titles.sqlite'
+    # Règles sans la marque Nokia : le titre est classé (et mis en cache) en marque inconnue
+    old = cached_classifier(db_path, brand_tagger=BrandTagger(brands=[b for b in BRANDS if b != 'nokia']))
+    assert old.classify(TITLES)['brand'].iloc[0] == 'Unknown'
+
+    new = cached_classifier(db_path)
+    assert "3 titres du cache invalidés" in capsys.readouterr().out
+    assert new.classify(TITLES)['brand'].iloc[0] == 'Nokia'
+    assert (new.cache.hits, new.cache.misses) == (0, 3)
+
+
+def test_cleaner_reports_cache_hits(tmp_path, capsys):
+    raw = pd.DataFrame({'date_scraping': '2026-10-17 12:00:00', 'titre': TITLES, 'prix': 1599.0, 'note': 4.0,
+                        'nb_avis': 3, 'lien': 'https://www.jumia.ma/x.html', 'source': 'Jumia',
+                        'id_produit': ['1', '2', '3', '4', '5']})
+    DataCleaner(cache_path=tmp_path / 'titles.sqlite', history_dir=None).clean_batch(raw, 'Jumia')
+
+    cleaner = DataCleaner(cache_path=tmp_path / 'titles.sqlite', history_dir=None)
+    cleaner.clean_batch(raw, 'Jumia')
+    cleaner.print_report()
+
+    assert "🗃️ Cache des titres : 3 déjà classés, 0 nouveaux (3 en cache)" in capsys.readouterr().out
+
+
+def test_worker_cache_stats_are_summed(tmp_path):
+    raw = pd.DataFrame({'date_scraping': '2026-10-17 12:00:00', 'titre': TITLES, 'prix': 1599.0, 'note': 4.0,
+                        'nb_avis': 3, 'lien': 'https://www.jumia.ma/x.html', 'source': 'Jumia',
+                        'id_produit': ['1', '2', '3', '4', '5']})
+    cleaner = DataCleaner(cache_path=tmp_path / 'titles.sqlite', history_dir=None)
+    # Deux lots identiques traités par deux processus : chaque lot classe (ou relit) 3 titres distincts
+    list(cleaner.clean_shards([(raw, 'Jumia'), (raw, 'Jumia')], workers=2))
+
+    assert cleaner.classifier.cache.hits + cleaner.classifier.cache.misses == 6
+    assert len(cleaner.classifier.cache) == 3